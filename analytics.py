@@ -0,0 +1,212 @@
+"""Per-hole statistics and course analytics for tournaments and seasons.
+
+Rounds are loaded from the hole1..hole18 columns into a matrix with one row per
+player-round, and every statistic is computed with vectorized passes over it.
+Results for finalized tournaments (and fully finalized seasons) are cached in the
+analytics_cache table, keyed by the scores_version of each tournament involved.
+"""
+import json
+from datetime import datetime
+
+import numpy as np
+
+from scoring import HOLE_COLUMNS, hole_matrix, load_course_layouts
+from transactions import write_transaction
+
+# Without a course every hole is treated as a par 4 (par 72, as the strokes-under-72
+# handicap rules assume)
+DEFAULT_PARS = np.full(18, 4.0)
+
+SCORE_TYPES = ('eagle_or_better', 'birdie', 'par', 'bogey', 'double_bogey_or_worse')
+
+HISTOGRAM_BIN_WIDTH = 5
+
+ROUNDS_SELECT = '''
+    SELECT ts.id, ts.tournament_id, ts.member_id, m.name, t.course_id,
+           ''' + ', '.join(f'ts.{column}' for column in HOLE_COLUMNS) + '''
+    FROM tournament_scores ts
+    JOIN members m ON ts.member_id = m.id
+    JOIN tournaments t ON t.id = ts.tournament_id
+'''
+
+
+def _nan_to_none(values, decimals=2):
+    return [None if np.isnan(value) else round(float(value), decimals) for value in values]
+
+
+def load_rounds(conn, where, params=()):
+    """Fetch player-rounds (one row per scorecard) matching a WHERE clause."""
+    return conn.execute(ROUNDS_SELECT + f' WHERE {where} ORDER BY ts.id', params).fetchall()
+
+
+def round_pars(conn, rows):
+    """Par layout per round from each tournament's course, or None if no round has one.
+
+    Rounds on tournaments without a complete course use DEFAULT_PARS.
+    """
+    layouts = load_course_layouts(conn, {row['course_id'] for row in rows})
+    if not layouts:
+        return None
+    return np.array([
+        layouts[row['course_id']][0] if row['course_id'] in layouts else DEFAULT_PARS
+        for row in rows
+    ])
+
+
+def classify_scores(holes, pars):
+    """Score type index per hole (see SCORE_TYPES), or -1 where the hole was not played."""
+    to_par = holes - pars
+    return np.select(
+        [to_par <= -2, to_par == -1, to_par == 0, to_par == 1, to_par >= 2],
+        [0, 1, 2, 3, 4],
+        default=-1
+    )
+
+
+def compute_statistics(rows, pars=None):
+    """Compute every statistic for a set of player-rounds.
+
+    pars is either one 18-hole layout or an (n_rounds x 18) matrix when rounds
+    were played on different courses.
+    """
+    holes = hole_matrix(rows)
+    pars = DEFAULT_PARS if pars is None else np.asarray(pars, dtype=float)
+    if pars.ndim > 1 and len(pars) and (pars == pars[0]).all():
+        # Every round was played on the same layout
+        pars = pars[0]
+    pars_by_round = np.broadcast_to(pars, holes.shape)
+    played = ~np.isnan(holes)
+
+    # Per-hole scoring averages and difficulty (hardest hole relative to par is rank 1)
+    plays = played.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        averages = np.nansum(holes, axis=0) / plays
+        to_par = np.nansum(np.where(played, holes - pars_by_round, 0), axis=0) / plays
+    difficulty_order = np.argsort(np.where(np.isnan(to_par), -np.inf, -to_par), kind='stable')
+    difficulty_rank = np.empty(18, dtype=int)
+    difficulty_rank[difficulty_order] = np.arange(1, 19)
+
+    # Score type distribution per hole and per round
+    score_types = classify_scores(holes, pars_by_round)
+    one_hot = score_types[..., None] == np.arange(len(SCORE_TYPES))
+    per_hole_distribution = one_hot.sum(axis=0)
+    per_round_counts = one_hot.sum(axis=1)
+
+    # Histogram of completed 18-hole gross totals
+    complete = played.all(axis=1)
+    totals = holes[complete].sum(axis=1)
+    histogram = []
+    if totals.size:
+        low = np.floor(totals.min() / HISTOGRAM_BIN_WIDTH) * HISTOGRAM_BIN_WIDTH
+        high = np.floor(totals.max() / HISTOGRAM_BIN_WIDTH) * HISTOGRAM_BIN_WIDTH + HISTOGRAM_BIN_WIDTH
+        counts, edges = np.histogram(totals, bins=np.arange(low, high + 1, HISTOGRAM_BIN_WIDTH))
+        histogram = [
+            {'from': int(edges[i]), 'to': int(edges[i + 1]) - 1, 'count': int(count)}
+            for i, count in enumerate(counts)
+        ]
+
+    # Per-player aggregates: scatter each round's counts onto its member
+    players = []
+    if rows:
+        member_ids = np.array([row['member_id'] for row in rows])
+        unique_members, member_index = np.unique(member_ids, return_inverse=True)
+        player_counts = np.zeros((len(unique_members), len(SCORE_TYPES)), dtype=int)
+        np.add.at(player_counts, member_index, per_round_counts)
+        rounds_played = np.bincount(member_index, minlength=len(unique_members))
+        complete_rounds = np.bincount(member_index, weights=complete, minlength=len(unique_members))
+        complete_totals = np.where(complete, np.nansum(holes, axis=1), 0)
+        total_strokes = np.bincount(member_index, weights=complete_totals, minlength=len(unique_members))
+        best_rounds = np.full(len(unique_members), np.inf)
+        np.minimum.at(best_rounds, member_index, np.where(complete, complete_totals, np.inf))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scoring_averages = total_strokes / complete_rounds
+
+        names = {row['member_id']: row['name'] for row in rows}
+        for i, member_id in enumerate(unique_members.tolist()):
+            player = {
+                'member_id': member_id,
+                'name': names[member_id],
+                'rounds': int(rounds_played[i]),
+                'scoring_average': None if np.isnan(scoring_averages[i]) else round(float(scoring_averages[i]), 2),
+                'best_round': None if np.isinf(best_rounds[i]) else int(best_rounds[i]),
+            }
+            player.update({score_type: int(player_counts[i, j]) for j, score_type in enumerate(SCORE_TYPES)})
+            players.append(player)
+        players.sort(key=lambda p: (-p['birdie'] - p['eagle_or_better'], p['name']))
+
+    return {
+        'rounds': len(rows),
+        'complete_rounds': int(complete.sum()),
+        'holes': [
+            {
+                'hole': i + 1,
+                'par': None if pars.ndim > 1 else float(pars[i]),
+                'plays': int(plays[i]),
+                'average': _nan_to_none([averages[i]])[0],
+                'to_par': _nan_to_none([to_par[i]])[0],
+                'difficulty_rank': int(difficulty_rank[i]),
+                'distribution': {score_type: int(per_hole_distribution[i, j]) for j, score_type in enumerate(SCORE_TYPES)},
+            }
+            for i in range(18)
+        ],
+        'score_distribution': histogram,
+        'players': players,
+    }
+
+
+def _cached(conn, cache_prefix, cache_key, cacheable, compute):
+    """Serve a payload from analytics_cache, computing and storing it when cacheable."""
+    if cacheable:
+        row = conn.execute('SELECT payload FROM analytics_cache WHERE cache_key = ?', (cache_key,)).fetchone()
+        if row:
+            return json.loads(row['payload'])
+    result = compute()
+    if cacheable:
+        with write_transaction(conn):
+            # Drop payloads computed from older score versions
+            conn.execute('DELETE FROM analytics_cache WHERE cache_key LIKE ?', (cache_prefix + '%',))
+            conn.execute(
+                'INSERT OR REPLACE INTO analytics_cache (cache_key, payload, created_at) VALUES (?, ?, ?)',
+                (cache_key, json.dumps(result), datetime.utcnow().isoformat())
+            )
+    return result
+
+
+def _statistics_for(conn, where, params, pars):
+    rows = load_rounds(conn, where, params)
+    return compute_statistics(rows, round_pars(conn, rows) if pars is None else pars)
+
+
+def tournament_statistics(conn, tournament, pars=None):
+    """Statistics for one tournament, cached once it is finalized.
+
+    Pars come from the tournament's course unless given explicitly.
+    """
+    prefix = f"tournament:{tournament['id']}:"
+    cache_key = f"{prefix}v{tournament['scores_version'] or 0}"
+    return _cached(
+        conn, prefix, cache_key, bool(tournament['finalized']),
+        lambda: _statistics_for(conn, 'ts.tournament_id = ?', (tournament['id'],), pars)
+    )
+
+
+def season_statistics(conn, season, pars=None):
+    """Statistics across every tournament dated in a season (calendar year).
+
+    Each round is measured against its own tournament's course. Cached only when
+    every tournament in the season is finalized; the key includes each tournament's
+    scores_version so later corrections invalidate it.
+    """
+    tournaments = conn.execute(
+        'SELECT id, scores_version, finalized FROM tournaments WHERE substr(date, 1, 4) = ? ORDER BY id',
+        (str(season),)
+    ).fetchall()
+    prefix = f'season:{season}:'
+    cache_key = prefix + ','.join(f"{t['id']}v{t['scores_version'] or 0}" for t in tournaments)
+    cacheable = bool(tournaments) and all(t['finalized'] for t in tournaments)
+    result = _cached(
+        conn, prefix, cache_key, cacheable,
+        lambda: _statistics_for(conn, 'substr(t.date, 1, 4) = ?', (str(season),), pars)
+    )
+    result['tournaments'] = len(tournaments)
+    return result
@@ -1,19 +1,120 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify, flash
+from flask import Flask, render_template, request, redirect, url_for, jsonify, flash, Response
 from datetime import datetime, timedelta
 import sqlite3
 import os
 import uuid
 import re
+import contextlib
+import csv
+import io
+import json
+
+try:
+    import fcntl
+except ImportError:  # Windows (waitress)
+    fcntl = None
+    import msvcrt
+
+import analytics
+import assets
+import awards
+import compression
+import leaderboard
+import member_stats
+import metrics
+import standings
+from rankings import LiveRanking, gross_sort_key, net_sort_key
+from side_games import SideGames
+import teams as team_games
+import transactions
+from transactions import write_transaction
+from versioned_cache import VersionedCache
+import whs
+from handicaps import (NET_ELIGIBILITY_TOURNAMENTS, MemberState, calculate_strokes_adjustment,
+                       club_adjustments, final_results, preview_finalize)
+from scoring import (HOLE_COLUMNS, countback_segments, flagged_holes, hole_matrix, load_course_layouts,
+                     order_rows, score_field)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key')
+app.jinja_env.globals['asset_url'] = assets.asset_url
+# gzip/brotli for text responses; levels and the size threshold are tunable per deployment
+app.wsgi_app = compression.CompressionMiddleware(
+    app.wsgi_app,
+    minimum_size=int(os.environ.get('COMPRESS_MIN_SIZE', compression.DEFAULT_MINIMUM_SIZE)),
+    gzip_level=int(os.environ.get('COMPRESS_GZIP_LEVEL', compression.DEFAULT_GZIP_LEVEL)),
+    brotli_quality=int(os.environ.get('COMPRESS_BROTLI_QUALITY', compression.DEFAULT_BROTLI_QUALITY)),
+)
 DATABASE = 'database.db'
+# Statements at least this slow are printed with their route and SQL
+metrics.SLOW_QUERY_SECONDS = float(os.environ.get('SLOW_QUERY_MS', 100)) / 1000
+
+# SQL expressions deriving scorecard progress from the hole columns. They are only
+# evaluated when a scorecard is written, so reads use the stored columns instead.
+HOLES_COMPLETED_SQL = ' + '.join([f'(hole{i} IS NOT NULL)' for i in range(1, 19)])
+LAST_HOLE_PLAYED_SQL = 'CASE ' + ' '.join([f'WHEN hole{i} IS NOT NULL THEN {i}' for i in range(18, 0, -1)]) + ' END'
+
+GENDERS = ('Male', 'Female')
 
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE)
+    conn = sqlite3.connect(DATABASE, factory=metrics.TimedConnection)
     conn.row_factory = sqlite3.Row
     return conn
 
+# Bump whenever init_db gains a migration: startup only runs init_db for databases
+# whose PRAGMA user_version is behind this
+SCHEMA_VERSION = 2
+
+def schema_version():
+    conn = get_db_connection()
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    conn.close()
+    return version
+
+@contextlib.contextmanager
+def migration_lock(path):
+    """Exclusive lock on a file next to the database, held across processes."""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ten seconds; keep waiting for the migrating worker
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def migrate_db():
+    """Run init_db once for this SCHEMA_VERSION, however many workers start together.
+
+    The first worker to find the database behind takes '<database>.lock', runs
+    init_db (table migrations and the token backfills), switches the database to
+    WAL so readers don't block the writer, and records the version. Workers that
+    were waiting on the lock then see the version current and skip it. Returns
+    True when this process ran the migrations.
+    """
+    if schema_version() >= SCHEMA_VERSION:
+        return False
+    with migration_lock(DATABASE + '.lock'):
+        if schema_version() >= SCHEMA_VERSION:
+            return False
+        init_db()
+        conn = get_db_connection()
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.close()
+    return True
+
 def init_db():
     conn = get_db_connection()
     
@@ -198,7 +299,30 @@ def init_db():
     except sqlite3.OperationalError:
         # Column already exists
         pass
-    
+
+    # Ensure progress columns exist in tournament_scores ("thru N" on the live leaderboard)
+    try:
+        conn.execute("ALTER TABLE tournament_scores ADD COLUMN holes_completed INTEGER DEFAULT 0")
+        conn.execute("ALTER TABLE tournament_scores ADD COLUMN last_hole_played INTEGER")
+        # Backfill existing scorecards once, when the columns are first added
+        conn.execute(f'''
+            UPDATE tournament_scores
+            SET holes_completed = {HOLES_COMPLETED_SQL},
+                last_hole_played = {LAST_HOLE_PLAYED_SQL}
+        ''')
+        print("Added holes_completed/last_hole_played columns to tournament_scores table")
+    except sqlite3.OperationalError:
+        # Columns already exist
+        pass
+
+    # Indexes for per-tournament and per-group lookups (leaderboard, pace of play dashboard)
+    try:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tournament_scores_tournament_member ON tournament_scores(tournament_id, member_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_groups_tournament ON groups(tournament_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_group_members_group ON group_members(group_id)")
+    except sqlite3.OperationalError:
+        pass
+
     # Ensure honorable_mentions table exists (for existing databases)
     conn.execute('''
         CREATE TABLE IF NOT EXISTS honorable_mentions (
@@ -255,6 +379,238 @@ def init_db():
         )
     ''')
 
+    # Create courses and course_holes tables (par and stroke index per hole)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS courses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS course_holes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_id INTEGER NOT NULL,
+            hole_number INTEGER NOT NULL,
+            par INTEGER NOT NULL,
+            stroke_index INTEGER NOT NULL,
+            FOREIGN KEY (course_id) REFERENCES courses (id),
+            UNIQUE(course_id, hole_number)
+        )
+    ''')
+    # Ensure course rating/slope columns exist in courses (used by the WHS engine)
+    try:
+        conn.execute("ALTER TABLE courses ADD COLUMN course_rating REAL")
+        conn.execute("ALTER TABLE courses ADD COLUMN slope_rating INTEGER")
+        print("Added course_rating/slope_rating columns to courses table")
+    except sqlite3.OperationalError:
+        # Columns already exist
+        pass
+    # Create handicap_adjustment_log table (written at finalize and by the season replay)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS handicap_adjustment_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tournament_id INTEGER NOT NULL,
+            member_id INTEGER NOT NULL,
+            old_handicap REAL,
+            new_handicap REAL,
+            adjustment REAL,
+            reason TEXT,
+            source TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (tournament_id) REFERENCES tournaments (id),
+            FOREIGN KEY (member_id) REFERENCES members (id)
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_handicap_adjustment_log_tournament ON handicap_adjustment_log(tournament_id)")
+    # Create tournament_results table (final standings, written once at finalize)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tournament_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tournament_id INTEGER NOT NULL,
+            member_id INTEGER NOT NULL,
+            score_id INTEGER,
+            gender TEXT,
+            total_score INTEGER,
+            net_handicap REAL,
+            net_score INTEGER,
+            gross_position INTEGER,
+            net_position INTEGER,
+            gross_eligible INTEGER NOT NULL DEFAULT 0,
+            net_eligible INTEGER NOT NULL DEFAULT 0,
+            gross_win_before INTEGER NOT NULL DEFAULT 0,
+            gross_win_after INTEGER NOT NULL DEFAULT 0,
+            awards TEXT NOT NULL DEFAULT '[]',
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (tournament_id) REFERENCES tournaments (id),
+            FOREIGN KEY (member_id) REFERENCES members (id),
+            UNIQUE(tournament_id, member_id)
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tournament_results_member ON tournament_results(member_id)")
+    # Ensure points column exists in tournament_results (season order-of-merit points)
+    try:
+        conn.execute("ALTER TABLE tournament_results ADD COLUMN points REAL NOT NULL DEFAULT 0")
+        print("Added points column to tournament_results table")
+    except sqlite3.OperationalError:
+        # Column already exists
+        pass
+    # Create points_table (order-of-merit points per finishing position and award)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS points_table (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category TEXT NOT NULL,
+            rank_key TEXT NOT NULL,
+            points REAL NOT NULL,
+            UNIQUE(category, rank_key)
+        )
+    ''')
+    standings.seed_points_table(conn)
+    # Create season_standings table (running order-of-merit totals, updated at finalize)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS season_standings (
+            season TEXT NOT NULL,
+            member_id INTEGER NOT NULL,
+            points REAL NOT NULL DEFAULT 0,
+            events INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (season, member_id),
+            FOREIGN KEY (member_id) REFERENCES members (id)
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_season_standings_points ON season_standings(season, points DESC)")
+    # Build the standings once for results stored before they existed
+    if (conn.execute('SELECT COUNT(*) FROM season_standings').fetchone()[0] == 0
+            and conn.execute('SELECT COUNT(*) FROM tournament_results').fetchone()[0] > 0):
+        standings.rebuild(conn)
+        print("Built season standings from stored tournament results")
+    # Tournaments finalized before results were stored get theirs (and their points) now
+    backfilled = backfill_tournament_results(conn)
+    if backfilled:
+        print(f"Stored results for {backfilled} tournaments finalized before tournament_results")
+    # Create handicap_history table (ledger of every handicap change, for trajectories)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS handicap_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            member_id INTEGER NOT NULL,
+            effective_date TEXT NOT NULL,
+            handicap REAL NOT NULL,
+            previous_handicap REAL,
+            source TEXT NOT NULL,
+            tournament_id INTEGER,
+            reason TEXT,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (member_id) REFERENCES members (id),
+            FOREIGN KEY (tournament_id) REFERENCES tournaments (id)
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_handicap_history_member_date ON handicap_history(member_id, effective_date)")
+    # Create member_stats table (running scoring aggregates per member, for profiles)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS member_stats (
+            member_id INTEGER PRIMARY KEY,
+            rounds INTEGER NOT NULL DEFAULT 0,
+            gross_sum INTEGER NOT NULL DEFAULT 0,
+            gross_sq_sum INTEGER NOT NULL DEFAULT 0,
+            best_gross INTEGER,
+            worst_gross INTEGER,
+            net_rounds INTEGER NOT NULL DEFAULT 0,
+            net_sum REAL NOT NULL DEFAULT 0,
+            best_net REAL,
+            form REAL,
+            last_tournament_id INTEGER,
+            last_date TEXT,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY (member_id) REFERENCES members (id)
+        )
+    ''')
+    # Build the aggregates once for rounds finalized before they existed
+    if (conn.execute('SELECT COUNT(*) FROM member_stats').fetchone()[0] == 0
+            and conn.execute('SELECT COUNT(*) FROM tournaments WHERE finalized = 1').fetchone()[0] > 0):
+        member_stats.rebuild(conn)
+        print("Built member stats from finalized rounds")
+    # Create members_fts (full-text index over member names for the member pickers), kept in
+    # step with members by triggers; only name and id changes touch the index
+    try:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'members_fts'").fetchone()
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS members_fts USING fts5(
+                name, content='members', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_insert AFTER INSERT ON members BEGIN
+                INSERT INTO members_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_delete AFTER DELETE ON members BEGIN
+                INSERT INTO members_fts (members_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_update AFTER UPDATE OF id, name ON members BEGIN
+                INSERT INTO members_fts (members_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO members_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        ''')
+        if not exists:
+            conn.execute("INSERT INTO members_fts (members_fts) VALUES ('rebuild')")
+            print("Built members_fts search index")
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5: member search falls back to LIKE
+        pass
+    # Create seasons table (per-season configuration, keyed by calendar year)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS seasons (
+            year TEXT PRIMARY KEY,
+            handicap_engine TEXT NOT NULL DEFAULT 'club'
+        )
+    ''')
+    # Create whs_records table (each member's most recent 20 score differentials)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS whs_records (
+            member_id INTEGER PRIMARY KEY,
+            differentials TEXT NOT NULL,
+            handicap_index REAL,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY (member_id) REFERENCES members (id)
+        )
+    ''')
+    # Ensure WHS columns exist in tournament_scores (set when the round is posted)
+    try:
+        conn.execute("ALTER TABLE tournament_scores ADD COLUMN score_differential REAL")
+        conn.execute("ALTER TABLE tournament_scores ADD COLUMN handicap_index REAL")
+        print("Added score_differential/handicap_index columns to tournament_scores table")
+    except sqlite3.OperationalError:
+        # Columns already exist
+        pass
+    # Ensure course_id column exists in tournaments
+    try:
+        conn.execute("ALTER TABLE tournaments ADD COLUMN course_id INTEGER REFERENCES courses (id)")
+        print("Added course_id column to tournaments table")
+    except sqlite3.OperationalError:
+        # Column already exists
+        pass
+    # Ensure per-scorecard scoring columns exist (maintained on every score write)
+    try:
+        conn.execute("ALTER TABLE tournament_scores ADD COLUMN stableford_points INTEGER")
+        conn.execute("ALTER TABLE tournament_scores ADD COLUMN birdies INTEGER")
+        conn.execute("ALTER TABLE tournament_scores ADD COLUMN eagles INTEGER")
+        print("Added stableford_points/birdies/eagles columns to tournament_scores table")
+    except sqlite3.OperationalError:
+        # Columns already exist
+        pass
+
+    # Create analytics_cache table to store computed statistics for finalized tournaments/seasons
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS analytics_cache (
+            cache_key TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    ''')
+
     # Create tournament_award_prizes table to store prizes for automatic awards
     conn.execute('''
         CREATE TABLE IF NOT EXISTS tournament_award_prizes (
@@ -290,6 +646,14 @@ def init_db():
     except sqlite3.OperationalError:
         # Column already exists
         pass
+    # Ensure scores_version column exists in tournaments (bumped on every score write so
+    # cached live rankings in each worker process can tell they are stale)
+    try:
+        conn.execute("ALTER TABLE tournaments ADD COLUMN scores_version INTEGER DEFAULT 0")
+        print("Added scores_version column to tournaments table")
+    except sqlite3.OperationalError:
+        # Column already exists
+        pass
     # Generate signup tokens for existing tournaments missing one
     try:
         tournaments_needing_tokens = conn.execute('SELECT id FROM tournaments WHERE signup_token IS NULL OR signup_token = ""').fetchall()
@@ -354,203 +718,310 @@ def save_tournament_snapshot(tournament_id):
     # Store or replace snapshot
     conn = get_db_connection()
     now = datetime.utcnow().isoformat()
-    existing = conn.execute('SELECT id FROM tournament_snapshots WHERE tournament_id = ?', (tournament_id,)).fetchone()
-    if existing:
-        conn.execute('UPDATE tournament_snapshots SET html = ?, created_at = ? WHERE tournament_id = ?', (html, now, tournament_id))
-    else:
-        conn.execute('INSERT INTO tournament_snapshots (tournament_id, html, created_at) VALUES (?, ?, ?)', (tournament_id, html, now))
-    conn.commit()
+    with write_transaction(conn):
+        existing = conn.execute('SELECT id FROM tournament_snapshots WHERE tournament_id = ?', (tournament_id,)).fetchone()
+        if existing:
+            conn.execute('UPDATE tournament_snapshots SET html = ?, created_at = ? WHERE tournament_id = ?', (html, now, tournament_id))
+        else:
+            conn.execute('INSERT INTO tournament_snapshots (tournament_id, html, created_at) VALUES (?, ?, ?)', (tournament_id, html, now))
     conn.close()
 
-def reset_members_autoincrement():
-    """Reset the auto-increment counter for members table when all members are deleted"""
-    conn = get_db_connection()
-    # Check if there are any members left
-    count = conn.execute('SELECT COUNT(*) FROM members').fetchone()[0]
-    if count == 0:
-        # Reset the auto-increment counter
-        conn.execute('DELETE FROM sqlite_sequence WHERE name="members"')
-        conn.commit()
-    conn.close()
-
-def get_handicap_range(handicap):
-    """Get the handicap range string based on current handicap"""
-    if handicap <= 9:
-        return "0-9"
-    elif handicap <= 15:
-        return "10-15"
-    elif handicap <= 21:
-        return "16-21"
-    elif handicap <= 26:
-        return "22-26"
-    elif handicap <= 32:
-        return "27-32"
-    else:
-        return "33-38"
+# Live rankings per tournament: {gender: LiveRanking}. Each is tagged with the
+# scores_version it was built from, so a write made by another worker forces a rebuild.
+_live_rankings = VersionedCache()
+
+LIVE_RANKING_SELECT = '''
+    SELECT ts.id, ts.tournament_id, ts.member_id, ts.total_score, ts.net_handicap, m.gender,
+           ''' + ', '.join(f'ts.{column}' for column in HOLE_COLUMNS) + '''
+    FROM tournament_scores ts
+    JOIN members m ON ts.member_id = m.id
+    JOIN tournaments t ON t.id = ts.tournament_id
+'''
+
+def bump_scores_version(conn, tournament_id):
+    """Mark a tournament's scores as changed. Call inside the write transaction."""
+    conn.execute(
+        'UPDATE tournaments SET scores_version = COALESCE(scores_version, 0) + 1 WHERE id = ?',
+        (tournament_id,)
+    )
+
+def _rank_score_rows(rankings, rows):
+    """Place one tournament's score rows on its rankings.
 
-def calculate_position_adjustment(current_handicap, position):
+    Countback keys for all rows are computed in one array pass.
     """
-    Calculate position-based handicap adjustment for top 3 finishers.
-    
-    Args:
-        current_handicap: Current handicap of the player
-        position: 1 for 1st place, 2 for 2nd place, 3 for 3rd place
-    
-    Returns:
-        handicap_adjustment: Negative number (decrease in handicap)
+    if not rows:
+        return
+    holes = hole_matrix(rows)
+    gross_countbacks = countback_segments(holes).tolist()
+    net_countbacks = countback_segments(holes, [row['net_handicap'] for row in rows]).tolist()
+    for row, gross_countback, net_countback in zip(rows, gross_countbacks, net_countbacks):
+        for gender, ranking in rankings.items():
+            if gender != row['gender']:
+                ranking.remove(row['member_id'])
+        rankings.setdefault(row['gender'], LiveRanking()).update(
+            row['member_id'],
+            gross_sort_key(row['id'], row['total_score'], gross_countback),
+            net_sort_key(row['id'], row['total_score'], row['net_handicap'], net_countback)
+        )
+
+def _build_live_rankings(rows):
+    rankings = {gender: LiveRanking() for gender in GENDERS}
+    _rank_score_rows(rankings, rows)
+    return rankings
+
+def _load_live_rankings(tournament_id):
+    conn = get_db_connection()
+    rows = conn.execute(LIVE_RANKING_SELECT + ' WHERE t.id = ?', (tournament_id,)).fetchall()
+    conn.close()
+    return _build_live_rankings(rows)
+
+def rebuild_live_rankings(tournament_id=None):
+    """Rebuild live rankings from the database.
+
+    With no tournament_id every active tournament is loaded (used on worker start);
+    otherwise only the given tournament is rebuilt.
     """
-    # Get handicap range
-    handicap_range = get_handicap_range(current_handicap)
-    print(f"      Position adjustment calculation: handicap={current_handicap}, range={handicap_range}, position={position}")
-    
-    # Position-based adjustments for top 3 places
-    if position == 1:  # 1st Place
-        if handicap_range == "0-9":
-            adjustment = -1
-        elif handicap_range == "10-15":
-            adjustment = -2
-        elif handicap_range == "16-21":
-            adjustment = -3
-        elif handicap_range == "22-26":
-            adjustment = -4
-        elif handicap_range == "27-32":
-            adjustment = -5
-        elif handicap_range == "33-38":
-            adjustment = -6
-    elif position == 2:  # 2nd Place
-        if handicap_range == "0-9":
-            adjustment = 0
-        elif handicap_range == "10-15":
-            adjustment = -1
-        elif handicap_range == "16-21":
-            adjustment = -2
-        elif handicap_range == "22-26":
-            adjustment = -3
-        elif handicap_range == "27-32":
-            adjustment = -4
-        elif handicap_range == "33-38":
-            adjustment = -5
-    elif position == 3:  # 3rd Place
-        if handicap_range == "0-9":
-            adjustment = 0
-        elif handicap_range == "10-15":
-            adjustment = 0
-        elif handicap_range == "16-21":
-            adjustment = -1
-        elif handicap_range == "22-26":
-            adjustment = -2
-        elif handicap_range == "27-32":
-            adjustment = -3
-        elif handicap_range == "33-38":
-            adjustment = -4
+    conn = get_db_connection()
+    # Read versions before rows: a write landing in between only causes one extra rebuild
+    if tournament_id is None:
+        tournaments = conn.execute('SELECT id, scores_version FROM tournaments WHERE finalized = 0').fetchall()
+        rows = conn.execute(LIVE_RANKING_SELECT + ' WHERE t.finalized = 0').fetchall()
     else:
-        adjustment = 0  # No adjustment for positions beyond 3rd
-    
-    print(f"      Position adjustment result: {adjustment}")
-    return adjustment
+        tournaments = conn.execute('SELECT id, scores_version FROM tournaments WHERE id = ?', (tournament_id,)).fetchall()
+        rows = conn.execute(LIVE_RANKING_SELECT + ' WHERE t.id = ?', (tournament_id,)).fetchall()
+    conn.close()
+
+    rows_by_tournament = {}
+    for row in rows:
+        rows_by_tournament.setdefault(row['tournament_id'], []).append(row)
+    for t in tournaments:
+        _live_rankings.store(t['id'], t['scores_version'] or 0, _build_live_rankings(rows_by_tournament.get(t['id'], [])))
 
-def calculate_strokes_adjustment(current_handicap, strokes_under_72):
+def get_live_ranking(tournament_id, gender, scores_version):
+    """Return the live ranking for a tournament and gender, rebuilding it if stale.
+
+    The caller gets a copy taken under the lock: update_live_ranking repositions
+    players in place, and reading the shared ranking meanwhile could see a key
+    without its member.
     """
-    Calculate strokes-under-72 based handicap adjustment.
-    
-    Args:
-        current_handicap: Current handicap of the player
-        strokes_under_72: Number of strokes under 72 (negative for over 72)
-    
-    Returns:
-        handicap_adjustment: Negative number (decrease in handicap)
+    return _live_rankings.read(
+        tournament_id, scores_version or 0, lambda: _load_live_rankings(tournament_id),
+        lambda rankings: rankings[gender].copy() if gender in rankings else LiveRanking()
+    )
+
+def _written_score_rows(conn, tournament_id, member_ids):
+    """(scores_version, member ids, their score rows) after a committed score write,
+    or None if the tournament is gone."""
+    version_row = conn.execute('SELECT scores_version FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if version_row is None:
+        return None
+    member_ids = [int(member_id) for member_id in member_ids]
+    placeholders = ', '.join('?' for _ in member_ids)
+    rows = conn.execute(
+        LIVE_RANKING_SELECT + f' WHERE ts.tournament_id = ? AND ts.member_id IN ({placeholders})',
+        [tournament_id] + member_ids
+    ).fetchall() if member_ids else []
+    return version_row['scores_version'] or 0, member_ids, rows
+
+def update_live_ranking(conn, tournament_id, member_ids):
+    """Reposition the given players after a committed score write.
+
+    If this write is the only one since the cached ranking was built, each player is
+    moved with a binary search; otherwise the cache is dropped and rebuilt on next read.
     """
-    print(f"      Strokes adjustment calculation: handicap={current_handicap}, strokes_under_72={strokes_under_72}")
-    
-    # Define handicap adjustment rules for strokes under 72
-    handicap_adjustments = {
-        "0-9": {
-            1: 0, 2: 1, 3: 1, 4: 1, 5: 1, 6: 2,
-            7: 2, 8: 2, 9: 2, 10: 3, 11: 3, 12: 3
-        },
-        "10-15": {
-            1: 0, 2: 1, 3: 1, 4: 1, 5: 2, 6: 2,
-            7: 2, 8: 3, 9: 3, 10: 3, 11: 4, 12: 4
-        },
-        "16-21": {
-            1: 1, 2: 1, 3: 2, 4: 2, 5: 3, 6: 3,
-            7: 4, 8: 4, 9: 5, 10: 5, 11: 6, 12: 6
-        },
-        "22-26": {
-            1: 1, 2: 2, 3: 2, 4: 3, 5: 4, 6: 4,
-            7: 5, 8: 6, 9: 6, 10: 7, 11: 8, 12: 8
-        },
-        "27-32": {
-            1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6,
-            7: 7, 8: 8, 9: 9, 10: 10, 11: 11, 12: 12
-        }
-    }
-    
-    # Get handicap range
-    handicap_range = get_handicap_range(current_handicap)
-    print(f"      Handicap range: {handicap_range}")
-    
-    # If handicap is 33-38, no strokes-based adjustment
-    if handicap_range == "33-38":
-        print(f"      Handicap 33-38 - no strokes adjustment")
-        return 0
-    
-    # For other ranges, use strokes under 72
-    if strokes_under_72 <= 0:
-        print(f"      Strokes under 72 <= 0 - no adjustment")
-        return 0  # No adjustment for scores of 72 or higher
-    
-    # Cap strokes under at 12 for the lookup
-    strokes_under = min(strokes_under_72, 12)
-    print(f"      Strokes under (capped at 12): {strokes_under}")
-    
-    # Get adjustment from the rules
-    adjustment = handicap_adjustments[handicap_range].get(strokes_under, 0)
-    print(f"      Raw adjustment from rules: {adjustment}")
-    
-    final_adjustment = -adjustment  # Return negative for handicap decrease
-    print(f"      Final strokes adjustment: {final_adjustment}")
-    return final_adjustment
+    written = _written_score_rows(conn, tournament_id, member_ids)
+    if written is None:
+        return
+    version, member_ids, rows = written
+
+    def reposition(rankings):
+        _rank_score_rows(rankings, rows)
+        ranked = {row['member_id'] for row in rows}
+        # Players whose score row is gone (deleted or moved to another member)
+        for member_id in set(member_ids) - ranked:
+            for ranking in rankings.values():
+                ranking.remove(member_id)
+
+    _live_rankings.apply(tournament_id, version, reposition)
+
+_side_games = VersionedCache()
+
+def _load_side_games(conn, tournament):
+    """Build side games for a tournament from its scorecards (groups are set on read)."""
+    layout = get_course_layout(conn, tournament['course_id'])
+    games = SideGames(stroke_index=layout[1] if layout else None, final=bool(tournament['finalized']))
+    rows = conn.execute(LIVE_RANKING_SELECT + ' WHERE t.id = ?', (tournament['id'],)).fetchall()
+    for row in rows:
+        games.update(row['member_id'], [row[column] for column in HOLE_COLUMNS], row['net_handicap'])
+    return games
 
-def calculate_total_handicap_adjustment(current_handicap, strokes_under_72, position):
+def read_side_games(conn, tournament, reader):
+    """reader(games) for a tournament's side games, rebuilt first if scores changed.
+
+    reader runs under the cache lock, since update_side_games replaces cards in place.
     """
-    Calculate total handicap adjustment combining position and strokes under 72.
-    
-    Args:
-        current_handicap: Current handicap of the player
-        strokes_under_72: Number of strokes under 72 (negative for over 72)
-        position: 1 for 1st place, 2 for 2nd place, 3 for 3rd place
-    
-    Returns:
-        total_adjustment: Combined adjustment from both position and strokes
+    # Group membership changes do not bump scores_version, so it is re-read every time
+    groups = {}
+    for row in conn.execute('''
+        SELECT gm.group_id, gm.member_id FROM group_members gm
+        JOIN groups g ON g.id = gm.group_id
+        WHERE g.tournament_id = ?
+        ORDER BY gm.group_id, gm.member_id
+    ''', (tournament['id'],)).fetchall():
+        groups.setdefault(row['group_id'], []).append(row['member_id'])
+
+    def read(games):
+        games.set_groups(groups)
+        return reader(games)
+
+    return _side_games.read(tournament['id'], tournament['scores_version'] or 0,
+                            lambda: _load_side_games(conn, tournament), read)
+
+def update_side_games(conn, tournament_id, member_ids):
+    """Replace the given players' cards after a committed score write.
+
+    Like update_live_ranking, this only applies when the cache is exactly one write
+    behind; otherwise it is dropped and rebuilt on next read.
     """
-    # Calculate position-based adjustment
-    position_adjustment = calculate_position_adjustment(current_handicap, position)
-    
-    # Calculate strokes-based adjustment
-    strokes_adjustment = calculate_strokes_adjustment(current_handicap, strokes_under_72)
-    
-    # Combine both adjustments
-    total_adjustment = position_adjustment + strokes_adjustment
-    
-    return total_adjustment
+    written = _written_score_rows(conn, tournament_id, member_ids)
+    if written is None:
+        return
+    version, member_ids, rows = written
+
+    def replace_cards(games):
+        for member_id in member_ids:
+            games.remove(member_id)
+        for row in rows:
+            games.update(row['member_id'], [row[column] for column in HOLE_COLUMNS], row['net_handicap'])
+
+    _side_games.apply(tournament_id, version, replace_cards)
+
+def side_games_summary(conn, tournament):
+    """Skins and group matches with member and group names, for templates and JSON."""
+    names = {row['id']: row['name'] for row in conn.execute('''
+        SELECT m.id, m.name FROM members m
+        JOIN tournament_scores ts ON ts.member_id = m.id
+        WHERE ts.tournament_id = ?
+    ''', (tournament['id'],)).fetchall()}
+    groups = conn.execute(
+        'SELECT id, name FROM groups WHERE tournament_id = ? ORDER BY name', (tournament['id'],)
+    ).fetchall()
+
+    skins_results, group_matches = read_side_games(conn, tournament, lambda games: (
+        games.skins(), [(group, games.matches(group['id'])) for group in groups]
+    ))
+
+    skins = {}
+    for board, result in skins_results.items():
+        skins[board] = {
+            'skins': [dict(skin, name=names.get(skin['member_id'])) for skin in result['skins']],
+            'settled_through': result['settled_through'],
+            'carryover': result['carryover'],
+            'totals': sorted(
+                ({'member_id': member_id, 'name': names.get(member_id), 'skins': total}
+                 for member_id, total in result['totals'].items()),
+                key=lambda entry: (-entry['skins'], entry['name'] or '')
+            ),
+        }
+    matches = []
+    for group, group_pairs in group_matches:
+        pairs = [
+            dict(pair, name=names.get(pair['member_id']), opponent=names.get(pair['opponent_id']))
+            for pair in group_pairs
+        ]
+        if pairs:
+            matches.append({'group_id': group['id'], 'group_name': group['name'], 'matches': pairs})
+    return {'skins': skins, 'matches': matches}
+
+_team_leaderboards = {}
+
+def get_team_leaderboards(conn, tournament, best_n):
+    """Team leaderboards for a tournament, cached per scores_version and team rosters."""
+    cache_key = (tournament['scores_version'] or 0, best_n, team_games.team_membership(conn, tournament['id']))
+    cached = _team_leaderboards.get(tournament['id'])
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    result = team_games.team_leaderboards(conn, tournament['id'], best_n)
+    _team_leaderboards[tournament['id']] = (cache_key, result)
+    return result
+
+def get_course_layout(conn, course_id):
+    """(pars, stroke_index) arrays for a course, or None if it is unset or incomplete."""
+    if not course_id:
+        return None
+    return load_course_layouts(conn, [course_id]).get(course_id)
+
+def update_scorecard_points(conn, tournament_id, member_ids=None):
+    """Recompute Stableford points and birdie/eagle counts for a tournament's scorecards.
+
+    A score write rescores only the given members' cards; with member_ids=None the
+    whole field is rescored in one pass (used when the course changes). Cards are
+    cleared when the tournament has no complete course. Call inside the write transaction.
+    """
+    query = 'SELECT * FROM tournament_scores WHERE tournament_id = ?'
+    params = [tournament_id]
+    if member_ids is not None:
+        member_ids = [int(member_id) for member_id in member_ids]
+        if not member_ids:
+            return
+        query += f" AND member_id IN ({', '.join('?' for _ in member_ids)})"
+        params += member_ids
+    rows = conn.execute(query, params).fetchall()
+    if not rows:
+        return
+
+    tournament = conn.execute('SELECT course_id FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    layout = get_course_layout(conn, tournament['course_id']) if tournament else None
+    if layout is None:
+        conn.executemany(
+            'UPDATE tournament_scores SET stableford_points = NULL, birdies = NULL, eagles = NULL WHERE id = ?',
+            [(row['id'],) for row in rows]
+        )
+        return
+
+    pars, stroke_index = layout
+    result = score_field(hole_matrix(rows), [row['net_handicap'] for row in rows], pars, stroke_index)
+    conn.executemany(
+        'UPDATE tournament_scores SET stableford_points = ?, birdies = ?, eagles = ? WHERE id = ?',
+        zip(result['stableford_points'].tolist(), result['birdie_count'].tolist(),
+            result['eagle_count'].tolist(), [row['id'] for row in rows])
+    )
+
+def reset_members_autoincrement():
+    """Reset the auto-increment counter for members table when all members are deleted"""
+    conn = get_db_connection()
+    # Check if there are any members left
+    with write_transaction(conn):
+        count = conn.execute('SELECT COUNT(*) FROM members').fetchone()[0]
+        if count == 0:
+            # Reset the auto-increment counter
+            conn.execute('DELETE FROM sqlite_sequence WHERE name="members"')
+    conn.close()
 
 def apply_handicap_adjustments(tournament_id):
     """
     Apply handicap adjustments for a finalized tournament.
     This function should be called when a tournament is finalized.
+    The rules themselves are in handicaps.club_adjustments.
     """
-    print(f"\n=== STARTING HANDICAP ADJUSTMENTS FOR TOURNAMENT {tournament_id} ===")
     conn = get_db_connection()
-    adjustments_log = []
+    with write_transaction(conn):
+        adjustments_log = write_handicap_adjustments(conn, tournament_id)
+    conn.close()
+    return adjustments_log
+
+def write_handicap_adjustments(conn, tournament_id):
+    """apply_handicap_adjustments on the caller's connection. Call inside the write transaction."""
+    print(f"\n=== STARTING HANDICAP ADJUSTMENTS FOR TOURNAMENT {tournament_id} ===")
     
-    # Get all scores for this tournament with member details - ORDER BY total_score for tie-breaking
+    # Get all scores for this tournament with member details (ties are broken by countback)
     scores = conn.execute('''
         SELECT ts.*, m.name, m.gender, m.id as member_id, m.gross_win, m.handicap, ts.total_score, ts.net_handicap, m.tournaments_played
         FROM tournament_scores ts
         JOIN members m ON ts.member_id = m.id
         WHERE ts.tournament_id = ?
-        ORDER BY ts.total_score
+        ORDER BY ts.total_score, ts.id
     ''', (tournament_id,)).fetchall()
     
     print(f"Found {len(scores)} total scores for tournament")
@@ -559,226 +1030,317 @@ def apply_handicap_adjustments(tournament_id):
     
     if not scores:
         print("No scores found - exiting")
-        conn.close()
         return
     
-    # Gross leaderboard - includes all players (the website logic determines who appears in gross vs net)
-    gross_scores = scores  # Include all scores for gross leaderboard
-    print(f"\n--- GROSS LEADERBOARD SETUP ---")
-    print(f"All scores for gross leaderboard: {len(gross_scores)}")
-    for score in gross_scores:
-        print(f"  - {score['name']}: Gross={score['total_score']}, Gross Win Flag={score['gross_win']}")
-    
-    # Separate by gender for gross scores
-    gross_male_scores = [score for score in gross_scores if score['gender'] == 'Male']
-    gross_female_scores = [score for score in gross_scores if score['gender'] == 'Female']
-    print(f"Gross male scores: {len(gross_male_scores)}")
-    print(f"Gross female scores: {len(gross_female_scores)}")
-    
-    # Sort gross scores by total_score (gross score) to get actual winners
-    gross_male_scores.sort(key=lambda x: x['total_score'] if x['total_score'] is not None else float('inf'))
-    gross_female_scores.sort(key=lambda x: x['total_score'] if x['total_score'] is not None else float('inf'))
-    
-    # Get the winners of gross leaderboards (1st place in each gender)
-    # These are the #1 players on the gross leaderboard display
-    gross_male_winners = gross_male_scores[:1] if gross_male_scores else []
-    gross_female_winners = gross_female_scores[:1] if gross_female_scores else []
-    print(f"Gross male winners (#1 on gross leaderboard): {[w['name'] for w in gross_male_winners]}")
-    print(f"Gross female winners (#1 on gross leaderboard): {[w['name'] for w in gross_female_winners]}")
-    
-    # Create list of winner member IDs to exclude from net leaderboards
-    # These are the gross champions of THIS tournament who should not get net position adjustments
-    this_tournament_gross_winners = [score['member_id'] for score in gross_male_winners + gross_female_winners]
-    print(f"Gross winner IDs of THIS tournament to exclude from net position adjustments: {this_tournament_gross_winners}")
-    
-    # Net leaderboard excludes gross winners of THIS tournament and members with 3 or fewer tournaments played
-    net_scores = [score for score in scores if score['member_id'] not in this_tournament_gross_winners and (score['tournaments_played'] if score['tournaments_played'] is not None else 0) > 3]
-    print(f"\n--- NET LEADERBOARD SETUP ---")
-    print(f"Net scores (excluding THIS tournament's gross winners and <=3 tournaments): {len(net_scores)}")
-    for score in net_scores:
-        print(f"  - {score['name']}: Gross={score['total_score']}, Handicap={score['handicap']}, Net={score['total_score'] - score['handicap'] if score['total_score'] and score['handicap'] else 'N/A'}")
-    
-    # Net leaderboard INCLUDING gross winners (for strokes-under-72 adjustment) - excludes only members with 3 or fewer tournaments played
-    # Note: Gross winners of THIS tournament ARE included for strokes adjustments
-    net_scores_including_gross = [score for score in scores if (score['tournaments_played'] if score['tournaments_played'] is not None else 0) > 3]
-    print(f"Net scores including gross winners (for strokes adjustment): {len(net_scores_including_gross)}")
+    new_handicaps, adjustments_log, net_handicaps = club_adjustments(scores)
     
-    # Separate net scores by gender (excluding gross winners for position adjustments)
-    net_male_scores = [score for score in net_scores if score['gender'] == 'Male']
-    net_female_scores = [score for score in net_scores if score['gender'] == 'Female']
-    print(f"Net male scores (position adjustments): {len(net_male_scores)}")
-    print(f"Net female scores (position adjustments): {len(net_female_scores)}")
+    # Update members' handicaps and save the handicap each top-3 score was played off
+    conn.executemany(
+        'UPDATE members SET handicap = ? WHERE id = ?',
+        [(handicap, member_id) for member_id, handicap in new_handicaps.items()]
+    )
+    conn.executemany(
+        'UPDATE tournament_scores SET net_handicap = ? WHERE id = ?',
+        [(handicap, score_id) for score_id, handicap in net_handicaps.items()]
+    )
+    record_handicap_adjustments(conn, tournament_id, adjustments_log, 'finalize')
+    # net_handicap may have been rewritten above
+    bump_scores_version(conn, tournament_id)
     
-    # Separate net scores INCLUDING gross winners by gender (for strokes-under-72 adjustments)
-    net_male_scores_including_gross = [score for score in net_scores_including_gross if score['gender'] == 'Male']
-    net_female_scores_including_gross = [score for score in net_scores_including_gross if score['gender'] == 'Female']
-    print(f"Net male scores (strokes adjustments): {len(net_male_scores_including_gross)}")
-    print(f"Net female scores (strokes adjustments): {len(net_female_scores_including_gross)}")
+    print(f"\n--- FINAL RESULTS ---")
+    print(f"Total adjustments made: {len(adjustments_log)}")
+    for adjustment in adjustments_log:
+        print(f"  - {adjustment['name']}: {adjustment['old']} → {adjustment['new']} (adjustment: {adjustment['adjustment']}, reason: {adjustment['reason']})")
+    print(f"=== HANDICAP ADJUSTMENTS COMPLETE ===\n")
+    return adjustments_log
 
-    # Process position-based adjustments for net leaderboard (excluding gross winners)
-    print(f"\n--- POSITION-BASED ADJUSTMENTS ---")
-    for gender_scores in [net_male_scores, net_female_scores]:
-        gender = "Male" if gender_scores == net_male_scores else "Female"
-        if not gender_scores:
-            print(f"No {gender} scores for position adjustments")
-            continue
-        
-        print(f"\nProcessing {gender} position adjustments:")
-        
-        # Create tuples exactly like the template does: (score, net_score)
-        calculated_net_scores = []
-        for score in gender_scores:
-            if score['total_score'] is not None and score['handicap'] is not None:
-                net_score = int(score['total_score'] - score['handicap'])  # Use int() like template
-                calculated_net_scores.append((score, net_score))
-                print(f"  - {score['name']}: Gross={score['total_score']}, Handicap={score['handicap']}, Net={net_score}")
-        
-        # Sort by net score (attribute 1 of the tuple) - exactly like template
-        # The stable sort preserves the original gross score order for tie-breaking
-        calculated_net_scores.sort(key=lambda x: x[1])
-        print(f"Sorted by net score: {[(s['name'], n) for s, n in calculated_net_scores]}")
-        
-        top_3 = calculated_net_scores[:3]
-        print(f"Top 3 for position adjustments: {[(s['name'], n) for s, n in top_3]}")
-        
-        # Calculate adjustments for each position
-        for i, (score, net_score) in enumerate(top_3, 1):
-            original_handicap = score['handicap']  # This is the handicap at tournament start
-            total_score = score['total_score']
-            net_score = total_score - original_handicap
-            print(f"\n  Position {i}: {score['name']}")
-            print(f"    Original handicap (tournament start): {original_handicap}")
-            print(f"    Total score: {total_score}")
-            print(f"    Net score: {net_score}")
-            
-            # Only position-based adjustment for the traditional net leaderboard
-            position_adjustment = calculate_position_adjustment(original_handicap, i)
-            print(f"    Position adjustment: {position_adjustment}")
-            
-            # Apply adjustment (ensure handicap doesn't go below 0)
-            new_handicap = max(0, original_handicap + position_adjustment)
-            print(f"    New handicap: {new_handicap} (was {original_handicap})")
-            
-            # Update member's handicap
-            conn.execute(
-                'UPDATE members SET handicap = ? WHERE id = ?',
-                (new_handicap, score['member_id'])
-            )
-            print(f"    Updated member {score['member_id']} handicap to {new_handicap}")
-            
-            # Also save the net_handicap used for this tournament score
-            conn.execute(
-                'UPDATE tournament_scores SET net_handicap = ? WHERE id = ?',
-                (original_handicap, score['id'])
-            )
-            print(f"    Saved net_handicap {original_handicap} to tournament score {score['id']}")
-            
-            adjustments_log.append({
-                "name": score['name'],
-                "old": original_handicap,
-                "new": new_handicap,
-                "adjustment": new_handicap - original_handicap,  # Total adjustment is the difference
-                "reason": f"Net {i}{'st' if i == 1 else 'nd' if i == 2 else 'rd'} place"
-            })
-    
-    # Process strokes-under-72 adjustments for net leaderboard INCLUDING gross winners
-    print(f"\n--- STROKES-UNDER-72 ADJUSTMENTS ---")
-    for gender_scores in [net_male_scores_including_gross, net_female_scores_including_gross]:
-        gender = "Male" if gender_scores == net_male_scores_including_gross else "Female"
-        if not gender_scores:
-            print(f"No {gender} scores for strokes adjustments")
-            continue
-        
-        print(f"\nProcessing {gender} strokes-under-72 adjustments:")
-        
-        # Create tuples for all eligible players: (score, net_score)
-        all_calculated_net_scores = []
-        for score in gender_scores:
-            if score['total_score'] is not None and score['handicap'] is not None:
-                net_score = int(score['total_score'] - score['handicap'])
-                all_calculated_net_scores.append((score, net_score))
-                print(f"  - {score['name']}: Gross={score['total_score']}, Handicap={score['handicap']}, Net={net_score}")
-        
-        # Apply strokes-under-72 adjustment to ALL players with net scores under 72
-        for score, net_score in all_calculated_net_scores:
-            strokes_under_72 = 72 - net_score
-            print(f"\n  Checking {score['name']}: Net={net_score}, Strokes under 72={strokes_under_72}")
-            
-            if strokes_under_72 > 0:  # Only apply if net score is under 72
-                print(f"    Net score under 72 - checking for adjustment")
-                
-                # Use the original handicap from tournament start (stored in score['handicap'])
-                original_handicap = score['handicap']
-                print(f"    Original handicap (tournament start): {original_handicap}")
-                
-                strokes_adjustment = calculate_strokes_adjustment(original_handicap, strokes_under_72)
-                print(f"    Strokes adjustment: {strokes_adjustment}")
-                
-                if strokes_adjustment != 0:  # Only update if there's an actual adjustment
-                    # Get current handicap to see what it was after position adjustment
-                    current_handicap = conn.execute(
-                        'SELECT handicap FROM members WHERE id = ?',
-                        (score['member_id'],)
-                    ).fetchone()['handicap']
-                    print(f"    Current handicap (after position adjustment): {current_handicap}")
-                    
-                    # Apply strokes adjustment on top of current handicap
-                    new_handicap = max(0, current_handicap + strokes_adjustment)
-                    print(f"    New handicap: {new_handicap} (was {current_handicap})")
-                    
-                    conn.execute(
-                        'UPDATE members SET handicap = ? WHERE id = ?',
-                        (new_handicap, score['member_id'])
-                    )
-                    print(f"    Updated member {score['member_id']} handicap to {new_handicap}")
-                    
-                    # Check if this player already has a log entry (from position adjustment)
-                    existing_log = next((log for log in adjustments_log if log['name'] == score['name']), None)
-                    if existing_log:
-                        # Update existing log entry to include strokes adjustment
-                        existing_log['new'] = new_handicap
-                        existing_log['adjustment'] = new_handicap - original_handicap  # Total adjustment is the difference
-                        existing_log['reason'] = existing_log['reason'] + f" + {strokes_under_72} strokes under 72"
-                        print(f"    Updated existing log entry - total adjustment: {existing_log['adjustment']}")
-                    else:
-                        # Add new log entry for strokes-only adjustment
-                        adjustments_log.append({
-                            "name": score['name'],
-                            "old": original_handicap,  # Original handicap at tournament start
-                            "new": new_handicap,
-                            "adjustment": new_handicap - original_handicap,  # Total adjustment is the difference
-                            "reason": f"{strokes_under_72} strokes under 72"
-                        })
-                        print(f"    Added new log entry for strokes-only adjustment")
-                else:
-                    print(f"    No strokes adjustment needed")
-            else:
-                print(f"    Net score 72 or higher - no adjustment")
-    
-    print(f"\n--- FINAL RESULTS ---")
-    print(f"Total adjustments made: {len(adjustments_log)}")
-    for adjustment in adjustments_log:
-        print(f"  - {adjustment['name']}: {adjustment['old']} → {adjustment['new']} (adjustment: {adjustment['adjustment']}, reason: {adjustment['reason']})")
-    
-    conn.commit()
+def record_handicap_adjustments(conn, tournament_id, adjustments_log, source):
+    """Store a tournament's adjustment log entries and add the changes to the handicap
+    history, effective on the tournament date. Call inside the write transaction."""
+    created_at = datetime.now().isoformat()
+    conn.executemany(
+        '''INSERT INTO handicap_adjustment_log
+           (tournament_id, member_id, old_handicap, new_handicap, adjustment, reason, source, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+        [(tournament_id, entry['member_id'], entry['old'], entry['new'], entry['adjustment'], entry['reason'], source, created_at)
+         for entry in adjustments_log]
+    )
+    tournament = conn.execute('SELECT date FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    record_handicap_history(conn, adjustments_log, tournament['date'] if tournament else created_at[:10], source, tournament_id)
+
+def record_handicap_history(conn, entries, effective_date, source, tournament_id=None):
+    """Append handicap changes to the handicap_history ledger. Call inside the write transaction.
+
+    entries are dicts with member_id, old, new and (optionally) reason; entries that
+    leave the handicap unchanged are skipped.
+    """
+    created_at = datetime.now().isoformat()
+    conn.executemany(
+        '''INSERT INTO handicap_history
+           (member_id, effective_date, handicap, previous_handicap, source, tournament_id, reason, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+        [(entry['member_id'], effective_date, entry['new'], entry['old'], source, tournament_id, entry.get('reason'), created_at)
+         for entry in entries if entry['new'] is not None and entry['new'] != entry['old']]
+    )
+
+# Member-keyed tables that move with a member when their ID is edited
+MEMBER_HISTORY_TABLES = ('handicap_history', 'handicap_adjustment_log', 'tournament_results', 'season_standings', 'whs_records',
+                         'member_stats')
+
+RESULT_COLUMNS = [
+    'member_id', 'score_id', 'gender', 'total_score', 'net_handicap', 'net_score', 'gross_position', 'net_position',
+    'gross_eligible', 'net_eligible', 'gross_win_before', 'gross_win_after', 'awards', 'points',
+]
+
+def save_tournament_results(tournament_id, gross_win_before, update_stats=True):
+    """Write the final standings of a tournament being finalized, and add its points
+    to the season standings in the same transaction.
+
+    Call after the handicap adjustments, so net scores use the handicaps finalize
+    recorded. gross_win_before maps member_id to the flag as it was before finalize.
+    update_stats recomputes the players' member_stats from all their rounds, so
+    re-finalizing picks up edited scores and a late-finalized older event keeps
+    the form in date order; pass False to rebuild them all afterwards instead.
+    """
+    conn = get_db_connection()
+    with write_transaction(conn):
+        results = write_tournament_results(conn, tournament_id, gross_win_before, update_stats)
     conn.close()
-    print(f"=== HANDICAP ADJUSTMENTS COMPLETE ===\n")
+    return results
+
+def write_tournament_results(conn, tournament_id, gross_win_before, update_stats=True):
+    """save_tournament_results on the caller's connection. Call inside the write transaction."""
+    tournament = conn.execute('SELECT date FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    rows = conn.execute('''
+        SELECT ts.*, ts.net_handicap AS handicap, m.gender, m.tournaments_played
+        FROM tournament_scores ts
+        JOIN members m ON ts.member_id = m.id
+        WHERE ts.tournament_id = ?
+        ORDER BY ts.total_score, ts.id
+    ''', (tournament_id,)).fetchall()
+    results = final_results(rows, {row['member_id']: gross_win_before.get(row['member_id'], 0) for row in rows})
+    points_table = standings.load_points_table(conn)
+    for result in results.values():
+        result['points'] = standings.result_points(result, points_table)
+
+    # Results already stored for this tournament are taken back out of the standings
+    previous = conn.execute(
+        'SELECT member_id, points, awards FROM tournament_results WHERE tournament_id = ?', (tournament_id,)
+    ).fetchall()
+    created_at = datetime.now().isoformat()
+    conn.execute('DELETE FROM tournament_results WHERE tournament_id = ?', (tournament_id,))
+    conn.executemany(
+        f'''INSERT INTO tournament_results (tournament_id, {', '.join(RESULT_COLUMNS)}, created_at)
+            VALUES ({', '.join('?' for _ in range(len(RESULT_COLUMNS) + 2))})''',
+        [(tournament_id, *[json.dumps(result['awards']) if column == 'awards' else result[column] for column in RESULT_COLUMNS], created_at)
+         for result in results.values()]
+    )
+    standings.apply_results(conn, str(tournament['date'])[:4], results.values(), previous)
+    if update_stats:
+        member_stats.rebuild(conn, [row['member_id'] for row in rows])
+    return results
+
+def backfill_tournament_results(conn):
+    """Store results for tournaments finalized before tournament_results existed.
+
+    Who held gross_win going into those tournaments was never recorded: each gender's
+    best gross card is taken as this tournament's winner (unless they already won an
+    earlier one), and everyone else keeps their current flag. Returns how many
+    tournaments were filled in.
+    """
+    tournaments = conn.execute('''
+        SELECT id, date FROM tournaments t
+        WHERE finalized = 1
+          AND NOT EXISTS (SELECT 1 FROM tournament_results r WHERE r.tournament_id = t.id)
+        ORDER BY date, id
+    ''').fetchall()
+    for tournament in tournaments:
+        rows = conn.execute('''
+            SELECT ts.*, m.gender, m.gross_win
+            FROM tournament_scores ts
+            JOIN members m ON ts.member_id = m.id
+            WHERE ts.tournament_id = ?
+            ORDER BY ts.total_score, ts.id
+        ''', (tournament['id'],)).fetchall()
+        earlier_winners = {row['member_id'] for row in conn.execute('''
+            SELECT r.member_id FROM tournament_results r
+            JOIN tournaments t ON t.id = r.tournament_id
+            WHERE t.date < ? AND r.gross_win_before = 0 AND r.gross_win_after = 1
+        ''', (tournament['date'],))}
+        gross_win_before = {row['member_id']: row['gross_win'] or 0 for row in rows}
+        for gender in GENDERS:
+            ordered = order_rows([row for row in rows if row['gender'] == gender and row['total_score'] is not None])
+            if ordered and ordered[0]['member_id'] not in earlier_winners:
+                gross_win_before[ordered[0]['member_id']] = 0
+        write_tournament_results(conn, tournament['id'], gross_win_before, update_stats=False)
+    return len(tournaments)
+
+def get_tournament_results(conn, tournament_id):
+    """Stored final standings ({member_id: row dict with awards as a list}), or None before finalize."""
+    rows = conn.execute('''
+        SELECT r.*, m.name
+        FROM tournament_results r
+        LEFT JOIN members m ON m.id = r.member_id
+        WHERE r.tournament_id = ?
+    ''', (tournament_id,)).fetchall()
+    if not rows:
+        return None
+    return {row['member_id']: dict(row, awards=json.loads(row['awards'])) for row in rows}
+
+def get_handicap_engine(conn, date):
+    """Handicap engine configured for the season (calendar year) of a date."""
+    row = conn.execute('SELECT handicap_engine FROM seasons WHERE year = ?', (str(date)[:4],)).fetchone()
+    if row and row['handicap_engine'] in whs.ENGINES:
+        return row['handicap_engine']
+    return whs.DEFAULT_ENGINE
+
+def post_whs_rounds(tournament_id, apply_handicaps=False):
+    """Post a finalized tournament's complete rounds to each member's WHS record.
+
+    Only the participants' records are read and written, and each update is a
+    bounded 20-differential record, so this is cheap even for a large field. Rounds
+    already posted are skipped. When apply_handicaps is set (the season uses the
+    WHS engine) members.handicap becomes the course handicap from the new index.
+    """
+    conn = get_db_connection()
+    with write_transaction(conn):
+        log = write_whs_rounds(conn, tournament_id, apply_handicaps)
+    conn.close()
+    return log
+
+def write_whs_rounds(conn, tournament_id, apply_handicaps=False):
+    """post_whs_rounds on the caller's connection. Call inside the write transaction."""
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None:
+        return []
+    rows = conn.execute('''
+        SELECT ts.*, COALESCE(ts.net_handicap, m.handicap) AS playing_handicap,
+               m.name, m.handicap AS member_handicap, w.differentials
+        FROM tournament_scores ts
+        JOIN members m ON m.id = ts.member_id
+        LEFT JOIN whs_records w ON w.member_id = ts.member_id
+        WHERE ts.tournament_id = ? AND ts.score_differential IS NULL
+          AND ts.total_score IS NOT NULL AND ts.holes_completed = 18
+    ''', (tournament_id,)).fetchall()
+    if not rows:
+        return []
+
+    course = conn.execute('SELECT * FROM courses WHERE id = ?', (tournament['course_id'],)).fetchone() if tournament['course_id'] else None
+    course_rating = course['course_rating'] if course else None
+    slope_rating = course['slope_rating'] if course else None
+    layout = get_course_layout(conn, tournament['course_id'])
+    if layout is not None:
+        pars, stroke_index = layout
+        par = int(pars.sum())
+        adjusted = whs.adjusted_gross_scores(hole_matrix(rows), [row['playing_handicap'] for row in rows], pars, stroke_index).tolist()
+    else:
+        # Without hole pars there is nothing to cap against
+        par = 72
+        adjusted = [row['total_score'] for row in rows]
+
+    now = datetime.now().isoformat()
+    record_updates, score_updates, handicap_updates, log = [], [], [], []
+    for row, adjusted_gross in zip(rows, adjusted):
+        record = whs.HandicapRecord.from_json(row['differentials'])
+        differential = whs.score_differential(adjusted_gross, course_rating, slope_rating)
+        record.post(differential)
+        index = record.handicap_index()
+        record_updates.append((row['member_id'], record.to_json(), index, now))
+        score_updates.append((differential, index, row['id']))
+        new_handicap = whs.course_handicap(index, course_rating, slope_rating, par) if index is not None else None
+        if apply_handicaps and new_handicap is not None:
+            handicap_updates.append((new_handicap, row['member_id']))
+        log.append({'member_id': row['member_id'], 'name': row['name'], 'differential': differential,
+                    'index': index, 'handicap': new_handicap, 'old': row['member_handicap']})
+
+    conn.executemany('''
+        INSERT INTO whs_records (member_id, differentials, handicap_index, updated_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT(member_id) DO UPDATE SET
+            differentials = excluded.differentials,
+            handicap_index = excluded.handicap_index,
+            updated_at = excluded.updated_at
+    ''', record_updates)
+    conn.executemany('UPDATE tournament_scores SET score_differential = ?, handicap_index = ? WHERE id = ?', score_updates)
+    if handicap_updates:
+        conn.executemany('UPDATE members SET handicap = ? WHERE id = ?', handicap_updates)
+        record_handicap_adjustments(conn, tournament_id, [
+            {'member_id': entry['member_id'], 'old': entry['old'], 'new': entry['handicap'],
+             'adjustment': entry['handicap'] - entry['old'] if entry['old'] is not None else None,
+             'reason': f"WHS index {entry['index']} (differential {entry['differential']})"}
+            for entry in log if entry['handicap'] is not None and entry['handicap'] != entry['old']
+        ], 'finalize')
+    print(f"Posted {len(log)} rounds to WHS records ({'handicaps applied' if apply_handicaps else 'index only'})")
+    return log
+
+def get_whs_adjustments_for_tournament(conn, tournament):
+    """Handicap changes for a tournament finalized under the WHS engine, from posted rounds."""
+    course = conn.execute('SELECT * FROM courses WHERE id = ?', (tournament['course_id'],)).fetchone() if tournament['course_id'] else None
+    layout = get_course_layout(conn, tournament['course_id'])
+    par = int(layout[0].sum()) if layout is not None else 72
+    rows = conn.execute('''
+        SELECT m.name, ts.net_handicap, ts.score_differential, ts.handicap_index
+        FROM tournament_scores ts
+        JOIN members m ON m.id = ts.member_id
+        WHERE ts.tournament_id = ? AND ts.handicap_index IS NOT NULL
+        ORDER BY m.name
+    ''', (tournament['id'],)).fetchall()
+    adjustments_log = []
+    for row in rows:
+        new_handicap = whs.course_handicap(
+            row['handicap_index'], course['course_rating'] if course else None, course['slope_rating'] if course else None, par
+        )
+        old_handicap = row['net_handicap'] if row['net_handicap'] is not None else new_handicap
+        if new_handicap == old_handicap:
+            continue
+        adjustments_log.append({
+            "name": row['name'],
+            "old": old_handicap,
+            "new": new_handicap,
+            "adjustment": new_handicap - old_handicap,
+            "reason": f"WHS index {row['handicap_index']} (differential {row['score_differential']})"
+        })
     return adjustments_log
 
 # --- REMOVE: Handicap adjustment log for tournament ---
 
 # --- NEW: Handicap adjustment log for tournament ---
 def get_handicap_adjustments_for_tournament(tournament_id):
+    """The handicap changes a finalized tournament made, as stored in handicap_adjustment_log
+    by its finalize (or the latest season replay). Tournaments finalized before the log
+    existed fall back to re-deriving them from the scores."""
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT m.name, l.old_handicap, l.new_handicap, l.adjustment, l.reason
+        FROM handicap_adjustment_log l
+        JOIN members m ON m.id = l.member_id
+        WHERE l.tournament_id = ?
+          AND l.created_at = (SELECT MAX(created_at) FROM handicap_adjustment_log WHERE tournament_id = ?)
+        ORDER BY l.id
+    ''', (tournament_id, tournament_id)).fetchall()
+    conn.close()
+    if not rows:
+        return derive_handicap_adjustments_for_tournament(tournament_id)
+    return [{"name": row['name'], "old": row['old_handicap'], "new": row['new_handicap'],
+             "adjustment": row['adjustment'], "reason": row['reason']} for row in rows]
+
+def derive_handicap_adjustments_for_tournament(tournament_id):
     conn = get_db_connection()
     adjustments_log = []
 
-    # Get all scores for this tournament with member details - ORDER BY total_score for tie-breaking
+    # Seasons on the WHS engine log index changes instead of the club rules
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is not None and get_handicap_engine(conn, tournament['date']) == 'whs':
+        adjustments_log = get_whs_adjustments_for_tournament(conn, tournament)
+        conn.close()
+        return adjustments_log
+
+    # Get all scores for this tournament with member details (ties are broken by countback below)
     scores = conn.execute('''
         SELECT ts.*, m.name, m.gender, m.id as member_id, m.gross_win, m.handicap, ts.total_score, ts.net_handicap, m.tournaments_played
         FROM tournament_scores ts
         JOIN members m ON ts.member_id = m.id
         WHERE ts.tournament_id = ?
-        ORDER BY ts.total_score
+        ORDER BY ts.total_score, ts.id
     ''', (tournament_id,)).fetchall()
 
     if not scores:
@@ -793,9 +1355,9 @@ def get_handicap_adjustments_for_tournament(tournament_id):
     gross_male_scores = [score for score in gross_scores if score['gender'] == 'Male']
     gross_female_scores = [score for score in gross_scores if score['gender'] == 'Female']
     
-    # Sort gross scores by total_score (gross score) to get actual winners
-    gross_male_scores.sort(key=lambda x: x['total_score'] if x['total_score'] is not None else float('inf'))
-    gross_female_scores.sort(key=lambda x: x['total_score'] if x['total_score'] is not None else float('inf'))
+    # Order gross scores by total_score (gross score) to get actual winners, ties broken by countback
+    gross_male_scores = order_rows(gross_male_scores)
+    gross_female_scores = order_rows(gross_female_scores)
     
     # Get the winners of gross leaderboards (1st place in each gender)
     # These are the #1 players on the gross leaderboard display
@@ -826,16 +1388,13 @@ def get_handicap_adjustments_for_tournament(tournament_id):
         if not gender_scores:
             continue
         
-        # Create tuples exactly like the template does: (score, net_score)
+        # Create tuples exactly like the leaderboard does: (score, net_score), in net order
+        # with ties broken by handicap-prorated countback (back 9, 6, 3, last hole)
         calculated_net_scores = []
-        for score in gender_scores:
-            if score['total_score'] is not None and score['net_handicap'] is not None:
-                net_score = int(score['total_score'] - score['net_handicap'])  # Use int() like template
-                calculated_net_scores.append((score, net_score))
-        
-        # Sort by net score (attribute 1 of the tuple) - exactly like template
-        # The stable sort preserves the original gross score order for tie-breaking
-        calculated_net_scores.sort(key=lambda x: x[1])
+        scored = [score for score in gender_scores if score['total_score'] is not None and score['net_handicap'] is not None]
+        for score in order_rows(scored, 'net_handicap'):
+            net_score = int(score['total_score'] - score['net_handicap'])  # Use int() like the leaderboard
+            calculated_net_scores.append((score, net_score))
         top_3 = calculated_net_scores[:3]
         
         for i, (score, net_score) in enumerate(top_3, 1):
@@ -905,6 +1464,11 @@ def get_handicap_adjustments_for_tournament(tournament_id):
     return adjustments_log
 # --- NEW: Handicap adjustment log for tournament ---
 
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Fingerprinted CSS/JS from build_assets.py; see assets.py."""
+    return assets.send_asset(filename)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -920,11 +1484,13 @@ def members():
         points = int(request.form.get('points', 0))
         
         conn = get_db_connection()
-        conn.execute(
-            'INSERT INTO members (name, handicap, gender, gross_win, points) VALUES (?, ?, ?, ?, ?)',
-            (name, handicap, gender, gross_win, points)
-        )
-        conn.commit()
+        with write_transaction(conn):
+            cursor = conn.execute(
+                'INSERT INTO members (name, handicap, gender, gross_win, points) VALUES (?, ?, ?, ?, ?)',
+                (name, handicap, gender, gross_win, points)
+            )
+            record_handicap_history(conn, [{'member_id': cursor.lastrowid, 'old': None, 'new': handicap, 'reason': 'Starting handicap'}],
+                                    datetime.now().isoformat(), 'initial')
         conn.close()
         flash('Member added successfully.', 'success')
         return redirect(url_for('members'))
@@ -935,6 +1501,55 @@ def members():
     conn.close()
     return render_template('members.html', members=members)
 
+# Matches returned to the member pickers per request
+MEMBER_SEARCH_LIMIT = 20
+MEMBER_SEARCH_MAX = 50
+
+def member_search_query(text):
+    """FTS5 query for typeahead text: every word typed must start a word of the name."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+def search_members(conn, text, gender=None, group_id=None, limit=MEMBER_SEARCH_LIMIT):
+    """Members matching typeahead text, best matches first; the roster in name order when text is empty."""
+    filters, params = [], []
+    if gender in GENDERS:
+        filters.append("COALESCE(m.gender, 'Male') = ?")
+        params.append(gender)
+    if group_id:
+        filters.append('m.id IN (SELECT member_id FROM group_members WHERE group_id = ?)')
+        params.append(group_id)
+    columns = 'm.id, m.name, m.gender, m.handicap'
+    query = member_search_query(text)
+    if not query:
+        where = f"WHERE {' AND '.join(filters)}" if filters else ''
+        return conn.execute(f'SELECT {columns} FROM members m {where} ORDER BY m.name LIMIT ?', params + [limit]).fetchall()
+    try:
+        return conn.execute(f'''
+            SELECT {columns}
+            FROM members_fts
+            JOIN members m ON m.id = members_fts.rowid
+            WHERE members_fts MATCH ? {''.join(' AND ' + f for f in filters)}
+            ORDER BY members_fts.rank, m.name
+            LIMIT ?
+        ''', [query] + params + [limit]).fetchall()
+    except sqlite3.OperationalError:
+        # No FTS5 index: substring match on each word
+        words = re.findall(r'\w+', text)
+        filters += ['m.name LIKE ?'] * len(words)
+        params += [f'%{word}%' for word in words]
+        return conn.execute(f'''SELECT {columns} FROM members m WHERE {' AND '.join(filters)}
+                                ORDER BY m.name LIMIT ?''', params + [limit]).fetchall()
+
+@app.route('/members/search.json')
+def members_search():
+    """Typeahead for the member pickers: ?q= text, optional gender, group_id and limit."""
+    limit = min(max(request.args.get('limit', MEMBER_SEARCH_LIMIT, type=int), 1), MEMBER_SEARCH_MAX)
+    conn = get_db_connection()
+    rows = search_members(conn, request.args.get('q', ''), request.args.get('gender'),
+                          request.args.get('group_id', type=int), limit)
+    conn.close()
+    return jsonify({'members': [dict(row) for row in rows]})
+
 @app.route('/tournaments', methods=['GET', 'POST'])
 def tournaments():
     if request.method == 'POST':
@@ -945,19 +1560,19 @@ def tournaments():
         signup_token = str(uuid.uuid4())
 
         conn = get_db_connection()
-        try:
-            # Try inserting with signup_token column
-            conn.execute(
-                'INSERT INTO tournaments (name, date, description, signup_token) VALUES (?, ?, ?, ?)',
-                (name, date, description, signup_token)
-            )
-        except sqlite3.OperationalError:
-            # Fallback for older DBs where column didn't migrate for some reason
-            conn.execute(
-                'INSERT INTO tournaments (name, date, description) VALUES (?, ?, ?)',
-                (name, date, description)
-            )
-        conn.commit()
+        with write_transaction(conn):
+            try:
+                # Try inserting with signup_token column
+                conn.execute(
+                    'INSERT INTO tournaments (name, date, description, signup_token) VALUES (?, ?, ?, ?)',
+                    (name, date, description, signup_token)
+                )
+            except sqlite3.OperationalError:
+                # Fallback for older DBs where column didn't migrate for some reason
+                conn.execute(
+                    'INSERT INTO tournaments (name, date, description) VALUES (?, ?, ?)',
+                    (name, date, description)
+                )
         conn.close()
         flash('Tournament created successfully.', 'success')
         return redirect(url_for('tournaments'))
@@ -1008,11 +1623,11 @@ def tournament_signup_token(token):
             return redirect(url_for('tournament_signup_token', token=token))
 
         created_at = datetime.utcnow().isoformat()
-        conn.execute(
-            'INSERT INTO tournament_signups (tournament_id, name, need_powercart, notes, created_at) VALUES (?, ?, ?, ?, ?)',
-            (tournament['id'], name, need_powercart, notes, created_at)
-        )
-        conn.commit()
+        with write_transaction(conn):
+            conn.execute(
+                'INSERT INTO tournament_signups (tournament_id, name, need_powercart, notes, created_at) VALUES (?, ?, ?, ?, ?)',
+                (tournament['id'], name, need_powercart, notes, created_at)
+            )
         conn.close()
         flash('Thanks! Your signup was submitted.', 'success')
         return redirect(url_for('tournament_signup_token', token=token))
@@ -1024,6 +1639,158 @@ def tournament_signup_token(token):
     conn.close()
     return render_template('tournament_signup.html', tournament=tournament, signups=signups, hide_nav=True)
 
+def tournament_field_scores(conn, tournament_id, group_id=None):
+    """Scorecards with member details for the tournament page, optionally one group's."""
+    if group_id:
+        return conn.execute('''
+            SELECT ts.*, m.name, m.handicap AS old_handicap, ts.net_handicap AS handicap, m.gross_win, m.gender, m.tournaments_played
+            FROM tournament_scores ts
+            JOIN members m ON ts.member_id = m.id
+            JOIN group_members gm ON m.id = gm.member_id
+            WHERE ts.tournament_id = ? AND gm.group_id = ?
+        ''', (tournament_id, group_id)).fetchall()
+    return conn.execute('''
+        SELECT ts.*, m.name, m.handicap AS old_handicap, ts.net_handicap AS handicap, m.gross_win, m.gender, m.tournaments_played
+        FROM tournament_scores ts
+        JOIN members m ON ts.member_id = m.id
+        WHERE ts.tournament_id = ?
+    ''', (tournament_id,)).fetchall()
+
+def tournament_leaderboards(conn, tournament, all_scores):
+    """The leaderboard view-model (four boards and the award cards) for the tournament page."""
+    tournament_id = tournament['id']
+    # Finalized tournaments read the standings stored at finalize (one indexed read)
+    results = get_tournament_results(conn, tournament_id) if tournament['finalized'] else None
+    if results is not None:
+        def stored_board(gender, position):
+            return sorted(
+                [score for score in all_scores if score['gender'] == gender and results.get(score['member_id'], {}).get(position)],
+                key=lambda score: results[score['member_id']][position]
+            )
+        gross_male_scores = stored_board('Male', 'gross_position')
+        gross_female_scores = stored_board('Female', 'gross_position')
+        net_male_scores = stored_board('Male', 'net_position')
+        net_female_scores = stored_board('Female', 'net_position')
+    else:
+        # Before finalize, order the field from the live rankings instead of sorting on every render.
+        # A group filter only drops rows, so the remaining order is still correct.
+        scores_by_member = {score['member_id']: score for score in all_scores}
+        gross_ordered = {}
+        net_ordered = {}
+        for gender in GENDERS:
+            ranking = get_live_ranking(tournament_id, gender, tournament['scores_version'])
+            gross_ordered[gender] = [scores_by_member[m] for m in ranking.ordered('gross') if m in scores_by_member]
+            net_ordered[gender] = [scores_by_member[m] for m in ranking.ordered('net') if m in scores_by_member]
+    
+        # Members who already won gross are left off the gross leaderboard
+        gross_male_scores = [score for score in gross_ordered['Male'] if not score['gross_win']]
+        gross_female_scores = [score for score in gross_ordered['Female'] if not score['gross_win']]
+    
+        # Get the winners of gross leaderboards (1st place in each gender)
+        gross_male_winners = gross_male_scores[:1] if gross_male_scores else []
+        gross_female_winners = gross_female_scores[:1] if gross_female_scores else []
+    
+        # Create list of winner member IDs to exclude from net leaderboards
+        gross_winners = [score['member_id'] for score in gross_male_winners + gross_female_winners]
+    
+        # Net leaderboard excludes gross winners and members with 3 or fewer tournaments played
+        # (also drops rows without a net score, which cannot be placed)
+        def is_net_eligible(score):
+            return (score['member_id'] not in gross_winners
+                    and (score['tournaments_played'] if score['tournaments_played'] is not None else 0) > 3
+                    and score['total_score'] is not None and score['handicap'] is not None)
+    
+        # Separate net scores by gender, already in net order
+        net_male_scores = [score for score in net_ordered['Male'] if is_net_eligible(score)]
+        net_female_scores = [score for score in net_ordered['Female'] if is_net_eligible(score)]
+
+    # Calculate automatic awards from leaderboards (stored at finalize when available)
+    if results is not None:
+        automatic_awards = {award: result['name'] for result in results.values() for award in result['awards']}
+    else:
+        automatic_awards = {
+            award: score['name'] for award, score in awards.automatic_awards(
+                {'Male': gross_male_scores, 'Female': gross_female_scores},
+                {'Male': net_male_scores, 'Female': net_female_scores}
+            ).items()
+        }
+
+    prize_rows = conn.execute(
+        'SELECT award_key, prize FROM tournament_award_prizes WHERE tournament_id = ?',
+        (tournament_id,)
+    ).fetchall()
+    award_prizes = {row['award_key']: row['prize'] for row in prize_rows}
+
+    # Rows, net scores and award cards are computed here; the template only iterates
+    return leaderboard.build(
+        {'Male': gross_male_scores, 'Female': gross_female_scores},
+        {'Male': net_male_scores, 'Female': net_female_scores},
+        automatic_awards, award_prizes
+    )
+
+def tournament_honors(conn, tournament, all_scores, layout):
+    """Honor types, their winners and balls, and eagles detected from the course pars."""
+    tournament_id = tournament['id']
+    # Define default honor types and ensure they exist for the tournament
+    default_honor_types = ['Long Drive', 'KP 1', 'KP 2', 'KP 3', 'KP 4', 'KP 5', 'KP 6', 'Eagle']
+    existing = {row['original_honor_type'] for row in conn.execute(
+        'SELECT original_honor_type FROM tournament_honor_types WHERE tournament_id = ?', (tournament_id,)
+    )}
+    if not existing.issuperset(default_honor_types):
+        # Only a tournament's first view writes; NOT EXISTS repeats the check under
+        # the lock in case another request added them meanwhile
+        with write_transaction(conn, 'tournament_honor_types'):
+            conn.executemany('''
+                INSERT INTO tournament_honor_types (tournament_id, original_honor_type, custom_name, display_order)
+                SELECT ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM tournament_honor_types WHERE tournament_id = ? AND original_honor_type = ?
+                )
+            ''', [(tournament_id, key, key, i, tournament_id, key) for i, key in enumerate(default_honor_types)])
+
+    # Get all customizable honor types for this tournament
+    honor_types = conn.execute(
+        'SELECT * FROM tournament_honor_types WHERE tournament_id = ? ORDER BY display_order', (tournament_id,)
+    ).fetchall()
+
+    # Get awarded honorable mentions
+    honorable_mentions = conn.execute('''
+        SELECT hm.honor_type, m.name as member_name, hm.balls_awarded
+        FROM honorable_mentions hm
+        JOIN members m ON hm.member_id = m.id
+        WHERE hm.tournament_id = ?
+    ''', (tournament_id,)).fetchall()
+    winners = {mention['honor_type']: mention['member_name'] for mention in honorable_mentions}
+    balls = {mention['honor_type']: (mention['balls_awarded'] if mention['balls_awarded'] is not None else 0) for mention in honorable_mentions}
+
+    # Detect eagles for the whole field from the course pars (manual Eagle honors still apply)
+    detected_eagles = {gender: [] for gender in GENDERS}
+    if layout is not None and all_scores:
+        pars, stroke_index = layout
+        field = score_field(hole_matrix(all_scores), [score['handicap'] for score in all_scores], pars, stroke_index)
+        for row_index, hole_number in flagged_holes(field['eagles']):
+            score = all_scores[row_index]
+            if score['gender'] in detected_eagles:
+                detected_eagles[score['gender']].append({'name': score['name'], 'hole': hole_number})
+
+    return {
+        'types': honor_types,
+        'winners': winners,
+        'balls': balls,
+        'total_balls': sum(balls.values()),
+        'male_balls': sum(v for k, v in balls.items() if k.endswith(' Male')),
+        'female_balls': sum(v for k, v in balls.items() if k.endswith(' Female')),
+        'detected_eagles': detected_eagles,
+    }
+
+def tournament_course(conn, tournament):
+    """The tournament's course row and (pars, stroke_index) layout, or (None, None) without one."""
+    layout = get_course_layout(conn, tournament['course_id'])
+    if layout is None:
+        return None, None
+    course = conn.execute('SELECT * FROM courses WHERE id = ?', (tournament['course_id'],)).fetchone()
+    return course, layout
+
 @app.route('/tournament/<int:tournament_id>')
 def view_tournament(tournament_id):
     conn = get_db_connection()
@@ -1065,192 +1832,265 @@ def view_tournament(tournament_id):
         groups.append(group)
     
     # Get tournament scores with member details and all hole scores
-    if selected_group_id:
-        all_scores = conn.execute('''
-            SELECT ts.*, m.name, m.handicap AS old_handicap, ts.net_handicap AS handicap, m.gross_win, m.gender, m.tournaments_played
-            FROM tournament_scores ts
-            JOIN members m ON ts.member_id = m.id
-            JOIN group_members gm ON m.id = gm.member_id
-            WHERE ts.tournament_id = ? AND gm.group_id = ?
-            ORDER BY ts.total_score
-        ''', (tournament_id, selected_group_id)).fetchall()
-        
-        # Get members in the selected group for adding new scores
-        members = conn.execute('''
-            SELECT m.*
-            FROM members m
-            JOIN group_members gm ON m.id = gm.member_id
-            WHERE gm.group_id = ?
-            ORDER BY m.name
-        ''', (selected_group_id,)).fetchall()
-    else:
-        all_scores = conn.execute('''
-            SELECT ts.*, m.name, m.handicap AS old_handicap, ts.net_handicap AS handicap, m.gross_win, m.gender, m.tournaments_played
-            FROM tournament_scores ts
-            JOIN members m ON ts.member_id = m.id
-            WHERE ts.tournament_id = ?
-            ORDER BY ts.total_score
-        ''', (tournament_id,)).fetchall()
-        
-        # Get all members for adding new scores
-        members = conn.execute('SELECT * FROM members ORDER BY name').fetchall()
-    
-    # Separate scores for different leaderboards
-    # For finalized tournaments, show gross leaderboard as it was during tournament
-    # For non-finalized tournaments, exclude members with existing gross_win = 1
-    if tournament['finalized']:
-        # For finalized tournaments, we need to reconstruct the gross leaderboard as it was
-        # during the tournament by excluding members who had gross_win=1 BEFORE this tournament
-        # We'll identify the winners from this tournament and include them in the gross leaderboard
-        
-        # Get all scores for this tournament first
-        all_scores_for_gross = list(all_scores)
-        
-        # Identify who won gross in THIS tournament by finding top performers who now have gross_win=1
-        # but should still appear in the gross leaderboard for this tournament
-        gross_male_candidates = [score for score in all_scores_for_gross if score['gender'] == 'Male']
-        gross_female_candidates = [score for score in all_scores_for_gross if score['gender'] == 'Female']
-        
-        # Sort by total score to find the winners
-        gross_male_candidates.sort(key=lambda x: x['total_score'] if x['total_score'] is not None else float('inf'))
-        gross_female_candidates.sort(key=lambda x: x['total_score'] if x['total_score'] is not None else float('inf'))
-        
-        # The winner of each gender in this tournament should be included in gross leaderboard
-        # even if they now have gross_win=1 (because they won it in THIS tournament)
-        current_tournament_gross_winners = set()
-        if gross_male_candidates:
-            current_tournament_gross_winners.add(gross_male_candidates[0]['member_id'])
-        if gross_female_candidates:
-            current_tournament_gross_winners.add(gross_female_candidates[0]['member_id'])
-        
-        # For finalized tournaments, exclude members with gross_win=1 UNLESS they won it in this tournament
-        gross_scores = [score for score in all_scores if (not score['gross_win'] or score['member_id'] in current_tournament_gross_winners)]
-    else:
-        # For non-finalized tournaments, exclude members with existing gross_win = 1
-        gross_scores = [score for score in all_scores if not score['gross_win']]
-    
-    # Separate by gender for gross scores
-    gross_male_scores = [score for score in gross_scores if score['gender'] == 'Male']
-    gross_female_scores = [score for score in gross_scores if score['gender'] == 'Female']
-    
-    # Get the winners of gross leaderboards (1st place in each gender)
-    gross_male_winners = gross_male_scores[:1] if gross_male_scores else []
-    gross_female_winners = gross_female_scores[:1] if gross_female_scores else []
-    
-    # Create list of winner member IDs to exclude from net leaderboards
-    gross_winners = [score['member_id'] for score in gross_male_winners + gross_female_winners]
-    
-    # Net leaderboard excludes gross winners and members with 3 or fewer tournaments played
-    net_scores = [score for score in all_scores if score['member_id'] not in gross_winners and (score['tournaments_played'] if score['tournaments_played'] is not None else 0) > 3]
-    
-    # Separate net scores by gender
-    net_male_scores = [score for score in net_scores if score['gender'] == 'Male']
-    net_female_scores = [score for score in net_scores if score['gender'] == 'Female']
-    
+    all_scores = tournament_field_scores(conn, tournament_id, selected_group_id)
+
+    # The member pickers fetch matches from /members/search.json instead of embedding the roster
+    has_members = conn.execute('SELECT EXISTS (SELECT 1 FROM members)').fetchone()[0]
+
     # --- NEW: Handicap adjustments log ---
     adjustments_log = []
     if tournament['finalized']:
         adjustments_log = get_handicap_adjustments_for_tournament(tournament_id)
-    
-    # Define default honor types and ensure they exist for the tournament
-    default_honor_types = ['Long Drive', 'KP 1', 'KP 2', 'KP 3', 'KP 4', 'KP 5', 'KP 6', 'Eagle']
-    for i, honor_type_key in enumerate(default_honor_types):
-        exists = conn.execute(
-            'SELECT id FROM tournament_honor_types WHERE tournament_id = ? AND original_honor_type = ?',
-            (tournament_id, honor_type_key)
-        ).fetchone()
-        if not exists:
-            conn.execute(
-                'INSERT INTO tournament_honor_types (tournament_id, original_honor_type, custom_name, display_order) VALUES (?, ?, ?, ?)',
-                (tournament_id, honor_type_key, honor_type_key, i)
-            )
-    conn.commit()
 
-    # Get all customizable honor types for this tournament
-    honor_types = conn.execute(
-        'SELECT * FROM tournament_honor_types WHERE tournament_id = ? ORDER BY display_order', (tournament_id,)
-    ).fetchall()
+    course, layout = tournament_course(conn, tournament)
+    boards = tournament_leaderboards(conn, tournament, all_scores)
+    honors = tournament_honors(conn, tournament, all_scores, layout)
 
-    # Get awarded honorable mentions
-    honorable_mentions = conn.execute('''
-        SELECT hm.honor_type, m.name as member_name, hm.balls_awarded
-        FROM honorable_mentions hm
-        JOIN members m ON hm.member_id = m.id
-        WHERE hm.tournament_id = ?
-    ''', (tournament_id,)).fetchall()
-    
-    # Create a dictionary for easy template access
-    honors_dict = {mention['honor_type']: mention['member_name'] for mention in honorable_mentions}
-    honors_balls = {mention['honor_type']: (mention['balls_awarded'] if mention['balls_awarded'] is not None else 0) for mention in honorable_mentions}
-    total_balls_awarded = sum(honors_balls.values()) if honors_balls else 0
-    male_balls_awarded = sum(v for k, v in honors_balls.items() if k.endswith(' Male')) if honors_balls else 0
-    female_balls_awarded = sum(v for k, v in honors_balls.items() if k.endswith(' Female')) if honors_balls else 0
-    
-    # Calculate automatic awards from leaderboards
-    automatic_awards = {}
-    
-    # Gross 1st place awards (Male and Female)
-    if gross_male_scores:
-        automatic_awards['Gross 1st Male'] = gross_male_scores[0]['name']
-    if gross_female_scores:
-        automatic_awards['Gross 1st Female'] = gross_female_scores[0]['name']
-    
-    # Net leaderboard awards (combined male and female, sorted by net score)
-    all_net_scores = net_male_scores + net_female_scores
-    if all_net_scores:
-        # Calculate net scores and sort
-        calculated_net_scores = []
-        for score in all_net_scores:
-            if score['total_score'] is not None and score['handicap'] is not None:
-                net_score = int(score['total_score'] - score['handicap'])
-                calculated_net_scores.append((score, net_score))
-        
-        # Sort by net score
-        calculated_net_scores.sort(key=lambda x: x[1])
-        
-        # Award positions
-        positions = ['1st', '2nd', '3rd', '4th', '5th']
-        for i, position in enumerate(positions):
-            if i < len(calculated_net_scores):
-                automatic_awards[f'Net {position}'] = calculated_net_scores[i][0]['name']
-        
-        # Lucky 7 (7th place)
-        if len(calculated_net_scores) >= 7:
-            automatic_awards['Lucky 7'] = calculated_net_scores[6][0]['name']
-        
-        # BB (second last place)
-        if len(calculated_net_scores) >= 2:
-            automatic_awards['BB'] = calculated_net_scores[-2][0]['name']
-    
-    # Load award prizes for this tournament before closing the connection
-    prize_rows = conn.execute(
-        'SELECT award_key, prize FROM tournament_award_prizes WHERE tournament_id = ?',
-        (tournament_id,)
-    ).fetchall()
-    award_prizes = {row['award_key']: row['prize'] for row in prize_rows}
+    # Skins and group match play, kept current by every score write
+    side_games = side_games_summary(conn, tournament)
     conn.close()
 
     return render_template(
         'view_tournament.html',
         tournament=tournament,
-        gross_male_scores=gross_male_scores,
-        gross_female_scores=gross_female_scores,
-        net_male_scores=net_male_scores,
-        net_female_scores=net_female_scores,
-        members=members,
+        boards=boards,
+        has_members=has_members,
         groups=groups,
         selected_group_id=selected_group_id,
         adjustments_log=adjustments_log,
-        honors_dict=honors_dict,
-        honor_types=honor_types,
-        automatic_awards=automatic_awards,
-        honors_balls=honors_balls,
-        total_balls_awarded=total_balls_awarded,
-        male_balls_awarded=male_balls_awarded,
-        female_balls_awarded=female_balls_awarded,
-        award_prizes=award_prizes
+        honors=honors,
+        course=course,
+        side_games=side_games
     )
 
+# Regions of the tournament page that can be rendered on their own, so the page's
+# scripts replace only the part an interaction changed instead of re-fetching the page
+TOURNAMENT_FRAGMENTS = ('leaderboards', 'honors')
+
+def tournament_page_redirect(tournament_id, group_id=None):
+    """Redirect back to the tournament page after a write, keeping the group filter.
+
+    Requests sent by the page's scripts name the region they are about to replace in
+    an X-Fragment header; those are sent to that region's fragment instead, so the
+    redirect they follow renders only that region (and the flashed message).
+    """
+    group_id = group_id or request.args.get('group_id', type=int)
+    region = request.headers.get('X-Fragment')
+    if region in TOURNAMENT_FRAGMENTS:
+        return redirect(url_for('tournament_fragment', tournament_id=tournament_id, region=region, group_id=group_id))
+    return redirect(url_for('view_tournament', tournament_id=tournament_id, group_id=group_id))
+
+@app.route('/tournament/<int:tournament_id>/fragments/<region>')
+def tournament_fragment(tournament_id, region):
+    """One region of the tournament page (the leaderboards or the honors table) with
+    pending flash messages, rendered from the same macros as the full page."""
+    if region not in TOURNAMENT_FRAGMENTS:
+        return ('', 404)
+    conn = get_db_connection()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None:
+        conn.close()
+        return ('', 404)
+    selected_group_id = request.args.get('group_id', type=int)
+    all_scores = tournament_field_scores(conn, tournament_id, selected_group_id)
+    course, layout = tournament_course(conn, tournament)
+    context = {}
+    if region == 'leaderboards':
+        context['boards'] = tournament_leaderboards(conn, tournament, all_scores)
+        context['has_members'] = conn.execute('SELECT EXISTS (SELECT 1 FROM members)').fetchone()[0]
+    else:
+        context['honors'] = tournament_honors(conn, tournament, all_scores, layout)
+    conn.close()
+    return render_template(
+        'tournament_fragment.html', region=region, tournament=tournament, course=course,
+        selected_group_id=selected_group_id, **context
+    )
+
+@app.route('/tournament/<int:tournament_id>/fragments/score/<int:score_id>')
+def tournament_score_fragment(tournament_id, score_id):
+    """A single leaderboard row (<tr>) for a scorecard at its current position.
+
+    Query args: board ('net' or 'gross') and the page's group_id. 404 when the card is
+    not on that board (not eligible, or outside the group).
+    """
+    board = request.args.get('board', 'net')
+    if board not in LiveRanking.BOARDS:
+        board = 'net'
+    conn = get_db_connection()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None:
+        conn.close()
+        return ('', 404)
+    selected_group_id = request.args.get('group_id', type=int)
+    all_scores = tournament_field_scores(conn, tournament_id, selected_group_id)
+    course, _ = tournament_course(conn, tournament)
+    boards = tournament_leaderboards(conn, tournament, all_scores)
+    conn.close()
+    row = next((row for rows in boards[board].values() for row in rows if row['score_id'] == score_id), None)
+    if row is None:
+        return ('', 404)
+    return render_template(
+        'tournament_fragment.html', region='score', tournament=tournament, course=course, row=row, board=board
+    )
+
+@app.route('/tournament/<int:tournament_id>/side_games.json')
+def side_games_json(tournament_id):
+    """Gross/net skins with carryovers and pairwise match play within each group."""
+    conn = get_db_connection()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None:
+        conn.close()
+        return jsonify({'error': 'Tournament not found'}), 404
+    summary = side_games_summary(conn, tournament)
+    conn.close()
+    return jsonify({
+        'tournament_id': tournament_id,
+        'scores_version': tournament['scores_version'] or 0,
+        'skins': summary['skins'],
+        'matches': summary['matches'],
+    })
+
+@app.route('/tournament/<int:tournament_id>/leaderboard.json')
+def leaderboard_json(tournament_id):
+    """Live leaderboard per gender read straight from the rankings.
+
+    Query args: board ('net' or 'gross') and an optional limit for top-k. This is the
+    raw field order; eligibility flags are included so clients can filter.
+    """
+    board = request.args.get('board', 'net')
+    if board not in LiveRanking.BOARDS:
+        board = 'net'
+    limit = request.args.get('limit', type=int)
+
+    conn = get_db_connection()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None:
+        conn.close()
+        return jsonify({'error': 'Tournament not found'}), 404
+
+    leaderboards = {}
+    for gender in GENDERS:
+        ranking = get_live_ranking(tournament_id, gender, tournament['scores_version'])
+        member_ids = ranking.top(limit, board) if limit else ranking.ordered(board)
+        rows_by_member = {}
+        if member_ids:
+            placeholders = ', '.join('?' for _ in member_ids)
+            rows = conn.execute(f'''
+                SELECT ts.member_id, m.name, ts.total_score, ts.net_handicap, ts.holes_completed,
+                       m.gross_win, m.tournaments_played
+                FROM tournament_scores ts
+                JOIN members m ON ts.member_id = m.id
+                WHERE ts.tournament_id = ? AND ts.member_id IN ({placeholders})
+            ''', [tournament_id] + member_ids).fetchall()
+            rows_by_member = {row['member_id']: row for row in rows}
+        entries = []
+        for position, member_id in enumerate(member_ids, 1):
+            row = rows_by_member.get(member_id)
+            if row is None:
+                continue
+            net_score = None
+            if row['total_score'] is not None and row['net_handicap'] is not None:
+                net_score = int(row['total_score'] - row['net_handicap'])
+            entries.append({
+                'position': position,
+                'member_id': member_id,
+                'name': row['name'],
+                'total_score': row['total_score'],
+                'net_handicap': row['net_handicap'],
+                'net_score': net_score,
+                'holes_completed': row['holes_completed'],
+                'gross_win': bool(row['gross_win']),
+                'tournaments_played': row['tournaments_played']
+            })
+        leaderboards[gender] = entries
+    conn.close()
+
+    return jsonify({
+        'tournament_id': tournament_id,
+        'board': board,
+        'finalized': bool(tournament['finalized']),
+        'leaderboards': leaderboards
+    })
+
+RESULTS_EXPORT_COLUMNS = ['name'] + RESULT_COLUMNS
+
+@app.route('/tournament/<int:tournament_id>/results.json')
+@app.route('/tournament/<int:tournament_id>/results.csv')
+def tournament_results_export(tournament_id):
+    """Final standings of a finalized tournament, as stored at finalize."""
+    conn = get_db_connection()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    rows = conn.execute('''
+        SELECT r.*, m.name
+        FROM tournament_results r
+        LEFT JOIN members m ON m.id = r.member_id
+        WHERE r.tournament_id = ?
+        ORDER BY r.gender, r.gross_position IS NULL, r.gross_position, r.net_position IS NULL, r.net_position, m.name
+    ''', (tournament_id,)).fetchall()
+    conn.close()
+    if tournament is None or not rows:
+        message = 'Tournament not found' if tournament is None else 'No final standings stored for this tournament'
+        if request.path.endswith('.json'):
+            return jsonify({'error': message}), 404
+        return Response(message, status=404, mimetype='text/plain')
+
+    results = [dict(row, awards=json.loads(row['awards'])) for row in rows]
+    if request.path.endswith('.json'):
+        return jsonify({'tournament_id': tournament_id, 'name': tournament['name'], 'date': tournament['date'], 'results': results})
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(RESULTS_EXPORT_COLUMNS)
+    for result in results:
+        writer.writerow([', '.join(result['awards']) if column == 'awards' else result[column] for column in RESULTS_EXPORT_COLUMNS])
+    return Response(output.getvalue(), mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename=tournament_{tournament_id}_results.csv'})
+
+@app.route('/member/<int:member_id>/results.json')
+def member_results(member_id):
+    """A member's final standings across every finalized tournament, newest first."""
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT r.*, t.name AS tournament_name, t.date
+        FROM tournament_results r
+        JOIN tournaments t ON t.id = r.tournament_id
+        WHERE r.member_id = ?
+        ORDER BY t.date DESC, t.id DESC
+    ''', (member_id,)).fetchall()
+    conn.close()
+    return jsonify({'member_id': member_id, 'results': [dict(row, awards=json.loads(row['awards'])) for row in rows]})
+
+@app.route('/tournament/<int:tournament_id>/analytics')
+@app.route('/tournament/<int:tournament_id>/analytics.json')
+def tournament_analytics(tournament_id):
+    """Per-hole averages, difficulty, score distribution and player counts for a tournament."""
+    conn = get_db_connection()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None:
+        conn.close()
+        if request.path.endswith('.json'):
+            return jsonify({'error': 'Tournament not found'}), 404
+        return redirect(url_for('tournaments'))
+
+    stats = analytics.tournament_statistics(conn, tournament)
+    conn.close()
+
+    if request.path.endswith('.json'):
+        return jsonify(stats)
+    return render_template('analytics.html', title=tournament['name'], tournament=tournament, season=None, stats=stats)
+
+@app.route('/analytics/season/<season>')
+@app.route('/analytics/season/<season>.json')
+def season_analytics(season):
+    """The same statistics across every tournament in a season (calendar year)."""
+    conn = get_db_connection()
+    stats = analytics.season_statistics(conn, season)
+    conn.close()
+
+    if request.path.endswith('.json'):
+        return jsonify(stats)
+    return render_template('analytics.html', title=f'{season} Season', tournament=None, season=season, stats=stats)
+
 @app.route('/tournament/<int:tournament_id>/add_score', methods=['POST'])
 def add_tournament_score(tournament_id):
     member_id = int(request.form['member_id'])
@@ -1267,24 +2107,26 @@ def add_tournament_score(tournament_id):
     total_score = sum(hole_scores)
     
     conn = get_db_connection()
-    member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
-
-    conn.execute('''
-        INSERT INTO tournament_scores (
-            tournament_id, member_id, 
-            hole1, hole2, hole3, hole4, hole5, hole6, hole7, hole8, hole9,
-            hole10, hole11, hole12, hole13, hole14, hole15, hole16, hole17, hole18,
-            total_score, net_handicap
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', [tournament_id, member_id] + hole_scores + [total_score, member_handicap])
+    with write_transaction(conn):
+        member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
 
-    conn.commit()
+        conn.execute('''
+            INSERT INTO tournament_scores (
+                tournament_id, member_id, 
+                hole1, hole2, hole3, hole4, hole5, hole6, hole7, hole8, hole9,
+                hole10, hole11, hole12, hole13, hole14, hole15, hole16, hole17, hole18,
+                total_score, net_handicap, holes_completed, last_hole_played
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [tournament_id, member_id] + hole_scores + [total_score, member_handicap, 18, 18])
+        update_scorecard_points(conn, tournament_id, [member_id])
+        bump_scores_version(conn, tournament_id)
+
+    update_live_ranking(conn, tournament_id, [member_id])
+    update_side_games(conn, tournament_id, [member_id])
     conn.close()
     
     flash('Score added successfully.', 'success')
-    if selected_group_id:
-        return redirect(url_for('view_tournament', tournament_id=tournament_id, group_id=selected_group_id))
-    return redirect(url_for('view_tournament', tournament_id=tournament_id))
+    return tournament_page_redirect(tournament_id, selected_group_id)
 
 @app.route('/tournament/<int:tournament_id>/set_award_prize', methods=['POST'])
 def set_award_prize(tournament_id):
@@ -1295,13 +2137,13 @@ def set_award_prize(tournament_id):
         return redirect(url_for('view_tournament', tournament_id=tournament_id))
 
     conn = get_db_connection()
-    # Upsert prize for this tournament + award
-    conn.execute(
-        'INSERT INTO tournament_award_prizes (tournament_id, award_key, prize) VALUES (?, ?, ?)\n'
-        'ON CONFLICT(tournament_id, award_key) DO UPDATE SET prize=excluded.prize',
-        (tournament_id, award_key, prize)
-    )
-    conn.commit()
+    with write_transaction(conn):
+        # Upsert prize for this tournament + award
+        conn.execute(
+            'INSERT INTO tournament_award_prizes (tournament_id, award_key, prize) VALUES (?, ?, ?)\n'
+            'ON CONFLICT(tournament_id, award_key) DO UPDATE SET prize=excluded.prize',
+            (tournament_id, award_key, prize)
+        )
     conn.close()
 
     flash('Prize updated.', 'success')
@@ -1314,8 +2156,8 @@ def clear_award_prize(tournament_id):
         flash('Missing award key.', 'danger')
         return redirect(url_for('view_tournament', tournament_id=tournament_id))
     conn = get_db_connection()
-    conn.execute('DELETE FROM tournament_award_prizes WHERE tournament_id = ? AND award_key = ?', (tournament_id, award_key))
-    conn.commit()
+    with write_transaction(conn):
+        conn.execute('DELETE FROM tournament_award_prizes WHERE tournament_id = ? AND award_key = ?', (tournament_id, award_key))
     conn.close()
     flash('Prize cleared.', 'success')
     return redirect(url_for('view_tournament', tournament_id=tournament_id))
@@ -1340,25 +2182,39 @@ def edit_member(member_id):
                 conn.close()
                 flash('Error: Member ID already exists', 'error')
                 return redirect(url_for('members'))
-        # Update member with new ID
-        conn.execute(
-            'UPDATE members SET id = ?, name = ?, handicap = ?, gender = ?, gross_win = ?, tournaments_played = ?, points = ? WHERE id = ?',
-            (new_id, name, handicap, gender, gross_win, tournaments_played, points, member_id)
-        )
+        with write_transaction(conn):
+            previous = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()
+            # Scores for this member may move to a new id or gender board - refresh their tournaments' rankings
+            conn.execute(
+                'UPDATE tournaments SET scores_version = COALESCE(scores_version, 0) + 1 WHERE id IN (SELECT tournament_id FROM tournament_scores WHERE member_id = ?)',
+                (member_id,)
+            )
+            # Update member with new ID
+            conn.execute(
+                'UPDATE members SET id = ?, name = ?, handicap = ?, gender = ?, gross_win = ?, tournaments_played = ?, points = ? WHERE id = ?',
+                (new_id, name, handicap, gender, gross_win, tournaments_played, points, member_id)
+            )
         
-        # Update all tournament scores that reference this member
-        conn.execute(
-            'UPDATE tournament_scores SET member_id = ? WHERE member_id = ?',
-            (new_id, member_id)
-        )
+            # Update all tournament scores that reference this member
+            conn.execute(
+                'UPDATE tournament_scores SET member_id = ? WHERE member_id = ?',
+                (new_id, member_id)
+            )
         
-        # Update all group_members that reference this member
-        conn.execute(
-            'UPDATE group_members SET member_id = ? WHERE member_id = ?',
-            (new_id, member_id)
-        )
+            # Update all group_members that reference this member
+            conn.execute(
+                'UPDATE group_members SET member_id = ? WHERE member_id = ?',
+                (new_id, member_id)
+            )
+        
+            # Records kept per member follow the new ID too
+            if new_id != member_id:
+                for table in MEMBER_HISTORY_TABLES:
+                    conn.execute(f'UPDATE {table} SET member_id = ? WHERE member_id = ?', (new_id, member_id))
+            if previous is not None:
+                record_handicap_history(conn, [{'member_id': new_id, 'old': previous['handicap'], 'new': handicap, 'reason': 'Edited'}],
+                                        datetime.now().isoformat(), 'edit')
         
-        conn.commit()
         conn.close()
         flash('Member updated successfully.', 'success')
         return redirect(url_for('members'))
@@ -1372,14 +2228,116 @@ def edit_member(member_id):
     
     return render_template('edit_member.html', member=member)
 
+# Finalized results listed on a member profile
+PROFILE_RECENT_RESULTS = 5
+
+HANDICAP_HISTORY_SQL = '''
+    SELECT h.effective_date, h.handicap, h.previous_handicap, h.source, h.tournament_id, t.name AS tournament_name, h.reason
+    FROM handicap_history h
+    LEFT JOIN tournaments t ON t.id = h.tournament_id
+    WHERE h.member_id = ? AND h.effective_date >= ? AND h.effective_date < ?
+    ORDER BY h.effective_date, h.id
+'''
+
+def history_date_range(args):
+    """[start, end) effective_date bounds from ?season=YYYY or ?from=/?to= dates (to is inclusive)."""
+    season = args.get('season', '').strip()
+    if len(season) == 4 and season.isdigit():
+        return f'{season}-01-01', f'{int(season) + 1}-01-01'
+    start = args.get('from', '').strip()
+    end = '9999'
+    to_date = args.get('to', '').strip()
+    if to_date:
+        try:
+            end = (datetime.strptime(to_date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    return start, end
+
+@app.route('/member/<int:member_id>/handicap_history')
+@app.route('/member/<int:member_id>/handicap_history.json')
+def member_handicap_history(member_id):
+    """A member's handicap trajectory from the ledger, with one indexed range query."""
+    conn = get_db_connection()
+    member = conn.execute('SELECT * FROM members WHERE id = ?', (member_id,)).fetchone()
+    if member is None:
+        conn.close()
+        if request.path.endswith('.json'):
+            return jsonify({'error': 'Member not found'}), 404
+        return redirect(url_for('members'))
+    start, end = history_date_range(request.args)
+    history = [dict(row) for row in conn.execute(HANDICAP_HISTORY_SQL, (member_id, start, end))]
+    conn.close()
+
+    if request.path.endswith('.json'):
+        return jsonify({'member_id': member_id, 'name': member['name'], 'handicap': member['handicap'], 'history': history})
+
+    # Step chart of the trajectory: one point per change, evenly spaced
+    chart = None
+    if history:
+        values = [entry['handicap'] for entry in history]
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        width, height, pad = 600, 160, 20
+        step = (width - 2 * pad) / max(len(values) - 1, 1)
+        points = []
+        previous_y = None
+        for i, value in enumerate(values):
+            x = pad + i * step
+            y = pad + (high - value) / span * (height - 2 * pad)
+            if previous_y is not None:
+                points.append(f'{x:.1f},{previous_y:.1f}')
+            points.append(f'{x:.1f},{y:.1f}')
+            previous_y = y
+        chart = {'width': width, 'height': height, 'points': ' '.join(points), 'low': low, 'high': high}
+    return render_template('member_history.html', member=member, history=history, chart=chart,
+                           season=request.args.get('season', ''))
+
+@app.route('/member/<int:member_id>')
+@app.route('/member/<int:member_id>.json')
+def member_profile(member_id):
+    """A member's scoring profile, read from the member_stats aggregates and recent results."""
+    conn = get_db_connection()
+    member = conn.execute('SELECT * FROM members WHERE id = ?', (member_id,)).fetchone()
+    if member is None:
+        conn.close()
+        if request.path.endswith('.json'):
+            return jsonify({'error': 'Member not found'}), 404
+        return redirect(url_for('members'))
+    stats = member_stats.profile(conn, member_id)
+    recent = conn.execute('''
+        SELECT r.tournament_id, t.name AS tournament_name, t.date, r.total_score, r.net_score,
+               r.gross_position, r.net_position, r.awards, r.points
+        FROM tournament_results r
+        JOIN tournaments t ON t.id = r.tournament_id
+        WHERE r.member_id = ?
+        ORDER BY t.date DESC, t.id DESC
+        LIMIT ?
+    ''', (member_id, PROFILE_RECENT_RESULTS)).fetchall()
+    conn.close()
+    recent = [dict(row, awards=json.loads(row['awards'])) for row in recent]
+
+    if request.path.endswith('.json'):
+        return jsonify({'member_id': member_id, 'name': member['name'], 'handicap': member['handicap'],
+                        'stats': stats, 'recent_results': recent})
+    return render_template('member_profile.html', member=member, stats=stats, recent=recent)
+
 @app.route('/delete_member/<int:member_id>', methods=['GET'])
 def delete_member(member_id):
     conn = get_db_connection()
-    # Delete associated tournament scores first
-    conn.execute('DELETE FROM tournament_scores WHERE member_id = ?', (member_id,))
-    # Delete the member
-    conn.execute('DELETE FROM members WHERE id = ?', (member_id,))
-    conn.commit()
+    with write_transaction(conn):
+        conn.execute(
+            'UPDATE tournaments SET scores_version = COALESCE(scores_version, 0) + 1 WHERE id IN (SELECT tournament_id FROM tournament_scores WHERE member_id = ?)',
+            (member_id,)
+        )
+        # Delete associated tournament scores and final standings first
+        conn.execute('DELETE FROM tournament_scores WHERE member_id = ?', (member_id,))
+        conn.execute('DELETE FROM tournament_results WHERE member_id = ?', (member_id,))
+        conn.execute('DELETE FROM season_standings WHERE member_id = ?', (member_id,))
+        conn.execute('DELETE FROM handicap_history WHERE member_id = ?', (member_id,))
+        conn.execute('DELETE FROM member_stats WHERE member_id = ?', (member_id,))
+        # Delete the member
+        conn.execute('DELETE FROM members WHERE id = ?', (member_id,))
     conn.close()
     
     # Reset auto-increment if this was the last member
@@ -1397,43 +2355,327 @@ def set_member_points(member_id):
     except (TypeError, ValueError):
         points = 0
 
-    conn = get_db_connection()
-    conn.execute('UPDATE members SET points = ? WHERE id = ?', (points, member_id))
-    conn.commit()
+    conn = get_db_connection()
+    with write_transaction(conn):
+        conn.execute('UPDATE members SET points = ? WHERE id = ?', (points, member_id))
+    conn.close()
+    flash('Points updated.', 'success')
+    return redirect(url_for('members'))
+
+@app.route('/edit_tournament/<int:tournament_id>', methods=['GET', 'POST'])
+def edit_tournament(tournament_id):
+    conn = get_db_connection()
+    
+    if request.method == 'POST':
+        # Update tournament
+        name = request.form['name']
+        date = request.form['date']
+        description = request.form.get('description', '')
+        course_id = request.form.get('course_id', type=int) or None
+        
+        with write_transaction(conn):
+            previous = conn.execute('SELECT course_id FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+            conn.execute(
+                'UPDATE tournaments SET name = ?, date = ?, description = ?, course_id = ? WHERE id = ?',
+                (name, date, description, course_id, tournament_id)
+            )
+            if previous is not None and previous['course_id'] != course_id:
+                # Pars and stroke indexes changed: rescore the whole field
+                update_scorecard_points(conn, tournament_id)
+                bump_scores_version(conn, tournament_id)
+        conn.close()
+        flash('Tournament updated successfully.', 'success')
+        return redirect(url_for('tournaments'))
+    
+    # Get tournament data for the form
+    tournament = conn.execute(
+        'SELECT * FROM tournaments WHERE id = ?', 
+        (tournament_id,)
+    ).fetchone()
+    courses = conn.execute('SELECT * FROM courses ORDER BY name').fetchall()
+    conn.close()
+    
+    if tournament is None:
+        return redirect(url_for('tournaments'))
+    
+    return render_template('edit_tournament.html', tournament=tournament, courses=courses)
+
+def parse_course_holes(form):
+    """Read par and stroke index for all 18 holes from a course form.
+
+    Returns (holes, error) where holes is a list of (hole_number, par, stroke_index).
+    """
+    holes = []
+    for hole_number in range(1, 19):
+        try:
+            par = int(form[f'par{hole_number}'])
+            stroke_index = int(form[f'si{hole_number}'])
+        except (KeyError, ValueError):
+            return None, f'Par and stroke index are required for hole {hole_number}.'
+        if not 3 <= par <= 6:
+            return None, f'Par for hole {hole_number} must be between 3 and 6.'
+        holes.append((hole_number, par, stroke_index))
+    if sorted(stroke_index for _, _, stroke_index in holes) != list(range(1, 19)):
+        return None, 'Stroke indexes must use each number from 1 to 18 exactly once.'
+    return holes, None
+
+def parse_course_ratings(form):
+    """Read the optional course rating and slope rating. Returns (course_rating, slope_rating, error)."""
+    course_rating = form.get('course_rating', '').strip()
+    slope_rating = form.get('slope_rating', '').strip()
+    try:
+        course_rating = float(course_rating) if course_rating else None
+        slope_rating = int(slope_rating) if slope_rating else None
+    except ValueError:
+        return None, None, 'Course rating and slope rating must be numbers.'
+    if slope_rating is not None and not 55 <= slope_rating <= 155:
+        return None, None, 'Slope rating must be between 55 and 155.'
+    return course_rating, slope_rating, None
+
+def save_course_holes(conn, course_id, holes):
+    conn.execute('DELETE FROM course_holes WHERE course_id = ?', (course_id,))
+    conn.executemany(
+        'INSERT INTO course_holes (course_id, hole_number, par, stroke_index) VALUES (?, ?, ?, ?)',
+        [(course_id, hole_number, par, stroke_index) for hole_number, par, stroke_index in holes]
+    )
+
+@app.route('/courses', methods=['GET', 'POST'])
+def courses():
+    conn = get_db_connection()
+
+    if request.method == 'POST':
+        name = request.form.get('name', '').strip()
+        holes, error = parse_course_holes(request.form)
+        course_rating, slope_rating, rating_error = parse_course_ratings(request.form)
+        if not name:
+            flash('Course name is required.', 'error')
+        elif error or rating_error:
+            flash(error or rating_error, 'error')
+        else:
+            with write_transaction(conn):
+                cursor = conn.execute(
+                    'INSERT INTO courses (name, course_rating, slope_rating) VALUES (?, ?, ?)',
+                    (name, course_rating, slope_rating)
+                )
+                save_course_holes(conn, cursor.lastrowid, holes)
+            flash(f'Course "{name}" added successfully.', 'success')
+        conn.close()
+        return redirect(url_for('courses'))
+
+    course_list = conn.execute('''
+        SELECT c.id, c.name, c.course_rating, c.slope_rating, COUNT(ch.id) AS holes, SUM(ch.par) AS par,
+               (SELECT COUNT(*) FROM tournaments t WHERE t.course_id = c.id) AS tournaments
+        FROM courses c
+        LEFT JOIN course_holes ch ON ch.course_id = c.id
+        GROUP BY c.id
+        ORDER BY c.name
+    ''').fetchall()
+    conn.close()
+    return render_template('courses.html', courses=course_list, holes=None)
+
+@app.route('/seasons', methods=['GET', 'POST'])
+def seasons():
+    """Per-season settings; currently which handicap engine finalizing a tournament uses."""
+    conn = get_db_connection()
+
+    if request.method == 'POST':
+        year = request.form.get('year', '').strip()
+        engine = request.form.get('handicap_engine', whs.DEFAULT_ENGINE)
+        if not (len(year) == 4 and year.isdigit()) or engine not in whs.ENGINES:
+            flash('Invalid season or handicap engine.', 'error')
+        else:
+            with write_transaction(conn):
+                conn.execute(
+                    'INSERT INTO seasons (year, handicap_engine) VALUES (?, ?) '
+                    'ON CONFLICT(year) DO UPDATE SET handicap_engine = excluded.handicap_engine',
+                    (year, engine)
+                )
+            flash(f'{year} season now uses the {"WHS" if engine == "whs" else "club"} handicap engine.', 'success')
+        conn.close()
+        return redirect(url_for('seasons'))
+
+    season_rows = conn.execute('''
+        SELECT y.year, COALESCE(s.handicap_engine, ?) AS handicap_engine,
+               (SELECT COUNT(*) FROM tournaments t WHERE substr(t.date, 1, 4) = y.year) AS tournaments,
+               (SELECT COUNT(*) FROM tournaments t WHERE substr(t.date, 1, 4) = y.year AND t.finalized = 1) AS finalized
+        FROM (
+            SELECT substr(date, 1, 4) AS year FROM tournaments WHERE date IS NOT NULL
+            UNION
+            SELECT year FROM seasons
+            UNION
+            SELECT ?
+        ) y
+        LEFT JOIN seasons s ON s.year = y.year
+        ORDER BY y.year DESC
+    ''', (whs.DEFAULT_ENGINE, str(datetime.now().year))).fetchall()
+    conn.close()
+    return render_template('seasons.html', seasons=season_rows)
+
+@app.route('/standings')
+def standings_index():
+    """Order of merit for the latest season with results (or the current year)."""
+    conn = get_db_connection()
+    row = conn.execute('SELECT MAX(season) AS season FROM season_standings').fetchone()
+    conn.close()
+    return redirect(url_for('season_standings', season=row['season'] or str(datetime.now().year)))
+
+@app.route('/standings/points', methods=['GET', 'POST'])
+def points_table():
+    """Edit the order-of-merit points table; saving re-scores every stored result."""
+    conn = get_db_connection()
+    if request.method == 'POST':
+        entries = []
+        try:
+            for key, value in request.form.items():
+                category, _, rank_key = key.partition(':')
+                if category in standings.CATEGORIES and rank_key:
+                    entries.append((category, rank_key, float(value or 0)))
+        except ValueError:
+            conn.close()
+            flash('Points must be numbers.', 'error')
+            return redirect(url_for('points_table'))
+        with write_transaction(conn):
+            conn.execute('DELETE FROM points_table')
+            conn.executemany('INSERT INTO points_table (category, rank_key, points) VALUES (?, ?, ?)', entries)
+            rescored = standings.rebuild(conn)
+        conn.close()
+        flash(f'Points table saved; {rescored} results re-scored.', 'success')
+        return redirect(url_for('points_table'))
+
+    table = standings.load_points_table(conn)
+    conn.close()
+    rows = (
+        [('net', str(position), f'Net position {position}') for position in range(1, standings.NET_POSITIONS_SCORED + 1)]
+        + [('gross', str(position), f'Gross position {position}') for position in range(1, standings.GROSS_POSITIONS_SCORED + 1)]
+        + [('award', award, award) for award in awards.AWARD_NAMES]
+    )
+    return render_template('points_table.html', rows=[
+        {'field': f'{category}:{rank_key}', 'label': label, 'points': table.get((category, rank_key), 0)}
+        for category, rank_key, label in rows
+    ])
+
+@app.route('/standings/<season>')
+@app.route('/standings/<season>.json')
+def season_standings(season):
+    """Season order of merit, read from the precomputed season_standings table."""
+    conn = get_db_connection()
+    rows = standings.season_standings(conn, season)
+    season_list = [row['season'] for row in conn.execute('SELECT DISTINCT season FROM season_standings ORDER BY season DESC')]
+    conn.close()
+
+    if request.path.endswith('.json'):
+        return jsonify({'season': season, 'standings': rows})
+    return render_template('standings.html', season=season, standings=rows, seasons=season_list)
+
+@app.route('/course/<int:course_id>/edit', methods=['GET', 'POST'])
+def edit_course(course_id):
+    conn = get_db_connection()
+    course = conn.execute('SELECT * FROM courses WHERE id = ?', (course_id,)).fetchone()
+    if course is None:
+        conn.close()
+        flash('Course not found.', 'error')
+        return redirect(url_for('courses'))
+
+    if request.method == 'POST':
+        name = request.form.get('name', '').strip()
+        holes, error = parse_course_holes(request.form)
+        course_rating, slope_rating, rating_error = parse_course_ratings(request.form)
+        if not name:
+            flash('Course name is required.', 'error')
+        elif error or rating_error:
+            flash(error or rating_error, 'error')
+        else:
+            with write_transaction(conn):
+                conn.execute(
+                    'UPDATE courses SET name = ?, course_rating = ?, slope_rating = ? WHERE id = ?',
+                    (name, course_rating, slope_rating, course_id)
+                )
+                save_course_holes(conn, course_id, holes)
+                # Rescore every tournament played on this course
+                tournament_ids = [row['id'] for row in conn.execute(
+                    'SELECT id FROM tournaments WHERE course_id = ?', (course_id,)
+                ).fetchall()]
+                for tournament_id in tournament_ids:
+                    update_scorecard_points(conn, tournament_id)
+                    bump_scores_version(conn, tournament_id)
+            flash(f'Course "{name}" updated successfully.', 'success')
+            conn.close()
+            return redirect(url_for('courses'))
+        conn.close()
+        return redirect(url_for('edit_course', course_id=course_id))
+
+    holes = {
+        row['hole_number']: row
+        for row in conn.execute('SELECT * FROM course_holes WHERE course_id = ?', (course_id,)).fetchall()
+    }
     conn.close()
-    flash('Points updated.', 'success')
-    return redirect(url_for('members'))
-
-@app.route('/edit_tournament/<int:tournament_id>', methods=['GET', 'POST'])
-def edit_tournament(tournament_id):
+    return render_template('edit_course.html', course=course, holes=holes)
+
+@app.route('/tournament/<int:tournament_id>/finalize_preview')
+@app.route('/tournament/<int:tournament_id>/finalize_preview.json')
+def finalize_preview(tournament_id):
+    """What finalizing would do right now: gross winners, eligibility, handicap changes
+    and awards. The pipeline runs in memory on one read of the field; nothing is written.
+    check_finalize_preview.py compares it with what a real finalize writes."""
     conn = get_db_connection()
-    
-    if request.method == 'POST':
-        # Update tournament
-        name = request.form['name']
-        date = request.form['date']
-        description = request.form.get('description', '')
-        
-        conn.execute(
-            'UPDATE tournaments SET name = ?, date = ?, description = ? WHERE id = ?',
-            (name, date, description, tournament_id)
-        )
-        conn.commit()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None or tournament['finalized']:
         conn.close()
-        flash('Tournament updated successfully.', 'success')
+        if request.path.endswith('.json'):
+            return jsonify({'error': 'Tournament not found' if tournament is None else 'Tournament already finalized'}), 404
+        if tournament is not None:
+            flash('Tournament is already finalized.', 'info')
+            return redirect(url_for('view_tournament', tournament_id=tournament_id))
         return redirect(url_for('tournaments'))
-    
-    # Get tournament data for the form
-    tournament = conn.execute(
-        'SELECT * FROM tournaments WHERE id = ?', 
-        (tournament_id,)
-    ).fetchone()
+
+    rows = conn.execute('''
+        SELECT ts.*, m.name, m.gender, m.handicap AS member_handicap, m.gross_win, m.tournaments_played, w.differentials
+        FROM tournament_scores ts
+        JOIN members m ON ts.member_id = m.id
+        LEFT JOIN whs_records w ON w.member_id = ts.member_id
+        WHERE ts.tournament_id = ?
+        ORDER BY ts.total_score, ts.id
+    ''', (tournament_id,)).fetchall()
+    engine = get_handicap_engine(conn, tournament['date'])
+    course = conn.execute('SELECT * FROM courses WHERE id = ?', (tournament['course_id'],)).fetchone() if tournament['course_id'] else None
+    layout = get_course_layout(conn, tournament['course_id'])
     conn.close()
-    
-    if tournament is None:
-        return redirect(url_for('tournaments'))
-    
-    return render_template('edit_tournament.html', tournament=tournament)
+
+    states = {}
+    for row in rows:
+        state = MemberState(row['member_id'], row['name'], row['gender'], row['member_handicap'],
+                            row['tournaments_played'] or 0, bool(row['gross_win']))
+        state.whs_record = whs.HandicapRecord.from_json(row['differentials'])
+        states[row['member_id']] = state
+    played_before = {member_id: state.tournaments_played for member_id, state in states.items()}
+    preview = preview_finalize(rows, states, engine, course, layout)
+    result = preview['result']
+
+    gross_winners = {gender: states[member_id].name for gender, member_id in result.gross_winners.items()}
+    # Members whose count passes the net eligibility threshold with this tournament
+    newly_eligible = sorted(
+        state.name for member_id, state in states.items()
+        if played_before[member_id] <= NET_ELIGIBILITY_TOURNAMENTS < state.tournaments_played
+    )
+    adjustments_log = sorted(result.adjustments, key=lambda entry: entry['name'])
+    automatic_awards = {award: row['name'] for award, row in preview['awards'].items()}
+
+    if request.path.endswith('.json'):
+        return jsonify({
+            'tournament_id': tournament_id,
+            'scores_version': tournament['scores_version'] or 0,
+            'handicap_engine': engine,
+            'participants': len(states),
+            'gross_winners': gross_winners,
+            'newly_eligible': newly_eligible,
+            'adjustments': adjustments_log,
+            'awards': automatic_awards,
+            'whs_rounds_posted': len(result.posted),
+        })
+    return render_template('finalize_preview.html', tournament=tournament, engine=engine,
+                           participants=len(states), gross_winners=gross_winners, newly_eligible=newly_eligible,
+                           adjustments_log=adjustments_log, automatic_awards=automatic_awards,
+                           whs_rounds_posted=len(result.posted))
 
 @app.route('/finalize_tournament/<int:tournament_id>', methods=['GET'])
 def finalize_tournament(tournament_id):
@@ -1451,62 +2693,71 @@ def finalize_tournament(tournament_id):
     
     print(f"Finalizing tournament: {tournament['name']}")
     
-    # Get all tournament scores to identify gross winners
-    all_scores = conn.execute('''
-        SELECT ts.*, m.name, m.handicap AS old_handicap, ts.net_handicap AS handicap, m.gross_win, m.gender, m.tournaments_played
-        FROM tournament_scores ts
-        JOIN members m ON ts.member_id = m.id
-        WHERE ts.tournament_id = ?
-        ORDER BY ts.total_score
-    ''', (tournament_id,)).fetchall()
+    # Everything finalize writes (winners, counters, handicaps, WHS records, results and
+    # standings) is one transaction: if any step fails, or the lock wait times out, the
+    # tournament is left as it was and finalizing again does not count it twice
+    with write_transaction(conn):
+        # Get all tournament scores to identify gross winners
+        all_scores = conn.execute('''
+            SELECT ts.*, m.name, m.handicap AS old_handicap, ts.net_handicap AS handicap, m.gross_win, m.gender, m.tournaments_played
+            FROM tournament_scores ts
+            JOIN members m ON ts.member_id = m.id
+            WHERE ts.tournament_id = ?
+            ORDER BY ts.total_score, ts.id
+        ''', (tournament_id,)).fetchall()
     
-    print(f"Found {len(all_scores)} scores for tournament")
+        print(f"Found {len(all_scores)} scores for tournament")
     
-    # Get gross leaderboard (excludes members with existing gross_win = 1)
-    gross_scores = [score for score in all_scores if not score['gross_win']]
-    print(f"Gross scores (excluding existing gross_win=1): {len(gross_scores)}")
+        # Get gross leaderboard (excludes members with existing gross_win = 1)
+        gross_scores = [score for score in all_scores if not score['gross_win']]
+        print(f"Gross scores (excluding existing gross_win=1): {len(gross_scores)}")
     
-    # Separate by gender for gross scores
-    gross_male_scores = [score for score in gross_scores if score['gender'] == 'Male']
-    gross_female_scores = [score for score in gross_scores if score['gender'] == 'Female']
+        # Separate by gender for gross scores, ordered with countback so ties have one winner
+        gross_male_scores = order_rows([score for score in gross_scores if score['gender'] == 'Male'])
+        gross_female_scores = order_rows([score for score in gross_scores if score['gender'] == 'Female'])
     
-    # Get the winners of gross leaderboards (1st place in each gender)
-    gross_male_winners = gross_male_scores[:1] if gross_male_scores else []
-    gross_female_winners = gross_female_scores[:1] if gross_female_scores else []
+        # Get the winners of gross leaderboards (1st place in each gender)
+        gross_male_winners = gross_male_scores[:1] if gross_male_scores else []
+        gross_female_winners = gross_female_scores[:1] if gross_female_scores else []
     
-    print(f"Gross male winners: {[w['name'] for w in gross_male_winners]}")
-    print(f"Gross female winners: {[w['name'] for w in gross_female_winners]}")
+        print(f"Gross male winners: {[w['name'] for w in gross_male_winners]}")
+        print(f"Gross female winners: {[w['name'] for w in gross_female_winners]}")
+    
+        # Mark the gross winners with gross_win = 1
+        for winner in gross_male_winners + gross_female_winners:
+            print(f"Marking {winner['name']} as gross winner")
+            conn.execute(
+                'UPDATE members SET gross_win = 1 WHERE id = ?',
+                (winner['member_id'],)
+            )
     
-    # Mark the gross winners with gross_win = 1
-    for winner in gross_male_winners + gross_female_winners:
-        print(f"Marking {winner['name']} as gross winner")
+        # Mark tournament as finalized
         conn.execute(
-            'UPDATE members SET gross_win = 1 WHERE id = ?',
-            (winner['member_id'],)
+            'UPDATE tournaments SET finalized = 1, scores_version = COALESCE(scores_version, 0) + 1 WHERE id = ?',
+            (tournament_id,)
         )
-    
-    # Mark tournament as finalized
-    conn.execute(
-        'UPDATE tournaments SET finalized = 1 WHERE id = ?',
-        (tournament_id,)
-    )
-
-    # Increment tournaments_played for all members who have a score in this tournament
-    participant_rows = conn.execute(
-        'SELECT DISTINCT member_id FROM tournament_scores WHERE tournament_id = ?',
-        (tournament_id,)
-    ).fetchall()
-    participant_ids = [row['member_id'] for row in participant_rows]
-    for pid in participant_ids:
-        conn.execute('UPDATE members SET tournaments_played = tournaments_played + 1 WHERE id = ?', (pid,))
 
-    conn.commit()
+        # Increment tournaments_played for all members who have a score in this tournament
+        participant_rows = conn.execute(
+            'SELECT DISTINCT member_id FROM tournament_scores WHERE tournament_id = ?',
+            (tournament_id,)
+        ).fetchall()
+        participant_ids = [row['member_id'] for row in participant_rows]
+        for pid in participant_ids:
+            conn.execute('UPDATE members SET tournaments_played = tournaments_played + 1 WHERE id = ?', (pid,))
+
+        print("Tournament finalized, applying handicap adjustments...")
+        # Apply handicap adjustments with the season's engine; WHS records are kept either way
+        if get_handicap_engine(conn, tournament['date']) == 'whs':
+            write_whs_rounds(conn, tournament_id, apply_handicaps=True)
+        else:
+            write_handicap_adjustments(conn, tournament_id)
+            write_whs_rounds(conn, tournament_id)
+        print("Handicap adjustments completed")
+
+        # Store the final standings; the tournament page, exports and JSON read these rows
+        write_tournament_results(conn, tournament_id, {score['member_id']: score['gross_win'] for score in all_scores})
     conn.close()
-    
-    print("Tournament finalized, applying handicap adjustments...")
-    # Apply handicap adjustments
-    apply_handicap_adjustments(tournament_id)
-    print("Handicap adjustments completed")
 
     # After adjustments, render and save a snapshot of the tournament page
     try:
@@ -1522,30 +2773,85 @@ def finalize_tournament(tournament_id):
 @app.route('/delete_tournament/<int:tournament_id>', methods=['GET'])
 def delete_tournament(tournament_id):
     conn = get_db_connection()
-    # Delete all scores for this tournament first
-    conn.execute('DELETE FROM tournament_scores WHERE tournament_id = ?', (tournament_id,))
-    # Delete the tournament
-    conn.execute('DELETE FROM tournaments WHERE id = ?', (tournament_id,))
-    conn.commit()
+    # Delete all scores and final standings for this tournament first
+    with write_transaction(conn):
+        player_ids = [row['member_id'] for row in conn.execute(
+            'SELECT member_id FROM tournament_scores WHERE tournament_id = ?', (tournament_id,))]
+        conn.execute('DELETE FROM tournament_scores WHERE tournament_id = ?', (tournament_id,))
+        tournament = conn.execute('SELECT date, finalized FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+        if tournament is not None:
+            previous = conn.execute(
+                'SELECT member_id, points, awards FROM tournament_results WHERE tournament_id = ?', (tournament_id,)
+            ).fetchall()
+            standings.apply_results(conn, str(tournament['date'])[:4], [], previous)
+        conn.execute('DELETE FROM tournament_results WHERE tournament_id = ?', (tournament_id,))
+        # Delete the tournament, then recount its players' aggregates without it
+        conn.execute('DELETE FROM tournaments WHERE id = ?', (tournament_id,))
+        if tournament is not None and tournament['finalized']:
+            member_stats.rebuild(conn, player_ids)
     conn.close()
     flash('Tournament deleted.', 'success')
     return redirect(url_for('tournaments'))
 
+@app.errorhandler(transactions.WriteBusyError)
+def write_busy(error):
+    """A write that waited transactions.MAX_WAIT for the lock: ask the client to retry."""
+    print(f"Write lock timeout: {error}")
+    return Response('The server is busy saving other changes. Please try again.', status=503,
+                    headers={'Retry-After': '1'}, mimetype='text/plain')
+
+@app.route('/admin/write_metrics.json')
+def write_metrics():
+    """Per-route write transaction counts, lock retries and wait times since the worker started."""
+    return jsonify(transactions.metrics.snapshot())
+
+@app.before_request
+def start_request_metrics():
+    metrics.registry.begin_request(request.endpoint, request.method)
+
+@app.after_request
+def record_request_metrics(response):
+    metrics.registry.end_request(response.status_code)
+    return response
+
+@app.teardown_request
+def close_request_metrics(error=None):
+    # Only still open when the request ended without a response (after_request did not run)
+    metrics.registry.end_request(500)
+
+@app.route('/admin/metrics')
+def prometheus_metrics():
+    """Request latency, SQL statement counts and write lock contention in Prometheus text format."""
+    write_routes = sorted(transactions.metrics.snapshot().items())
+    extra = [
+        (f'tournament_write_{field}_total', 'counter', help_text,
+         [({'route': route}, counters[field]) for route, counters in write_routes])
+        for field, help_text in (
+            ('transactions', 'Write transactions, by route.'),
+            ('contended', 'Write transactions that had to wait for the lock, by route.'),
+            ('retries', 'Retries taking the write lock, by route.'),
+            ('failures', 'Write transactions that gave up waiting for the lock, by route.'),
+        )
+    ]
+    extra.append(('tournament_write_wait_seconds_total', 'counter', 'Time spent waiting for the write lock, by route.',
+                  [({'route': route}, float(counters['wait_seconds'])) for route, counters in write_routes]))
+    return Response(metrics.registry.render(extra), mimetype='text/plain; version=0.0.4')
+
 @app.route('/admin/recalculate_tournaments_played', methods=['GET'])
 def recalculate_tournaments_played():
     """Recalculate tournaments_played for all members based only on finalized tournaments."""
     conn = get_db_connection()
     try:
-        conn.execute('''
-            UPDATE members
-            SET tournaments_played = (
-                SELECT COUNT(DISTINCT ts.tournament_id)
-                FROM tournament_scores ts
-                JOIN tournaments t ON t.id = ts.tournament_id
-                WHERE ts.member_id = members.id AND t.finalized = 1
-            )
-        ''')
-        conn.commit()
+        with write_transaction(conn):
+            conn.execute('''
+                UPDATE members
+                SET tournaments_played = (
+                    SELECT COUNT(DISTINCT ts.tournament_id)
+                    FROM tournament_scores ts
+                    JOIN tournaments t ON t.id = ts.tournament_id
+                    WHERE ts.member_id = members.id AND t.finalized = 1
+                )
+            ''')
         flash('Recalculated tournaments played from finalized tournaments.', 'success')
     except sqlite3.Error as e:
         flash(f'Error recalculating: {e}', 'error')
@@ -1569,27 +2875,31 @@ def edit_score(score_id):
         
         # Calculate total score
         total_score = sum(hole_scores)
+
+        # Get tournament_id and the previous member (the card may be reassigned)
+        with write_transaction(conn):
+            existing = conn.execute(
+                'SELECT tournament_id, member_id FROM tournament_scores WHERE id = ?',
+                (score_id,)
+            ).fetchone()
+            tournament_id = existing['tournament_id']
         
-        conn.execute('''
-            UPDATE tournament_scores SET 
-                member_id = ?, 
-                hole1 = ?, hole2 = ?, hole3 = ?, hole4 = ?, hole5 = ?, hole6 = ?, hole7 = ?, hole8 = ?, hole9 = ?,
-                hole10 = ?, hole11 = ?, hole12 = ?, hole13 = ?, hole14 = ?, hole15 = ?, hole16 = ?, hole17 = ?, hole18 = ?,
-                total_score = ?
-            WHERE id = ?
-        ''', [member_id] + hole_scores + [total_score, score_id])
-        
-        conn.commit()
-        
-        # Get tournament_id for redirect
-        tournament_id = conn.execute(
-            'SELECT tournament_id FROM tournament_scores WHERE id = ?',
-            (score_id,)
-        ).fetchone()['tournament_id']
+            conn.execute('''
+                UPDATE tournament_scores SET 
+                    member_id = ?, 
+                    hole1 = ?, hole2 = ?, hole3 = ?, hole4 = ?, hole5 = ?, hole6 = ?, hole7 = ?, hole8 = ?, hole9 = ?,
+                    hole10 = ?, hole11 = ?, hole12 = ?, hole13 = ?, hole14 = ?, hole15 = ?, hole16 = ?, hole17 = ?, hole18 = ?,
+                    total_score = ?, holes_completed = 18, last_hole_played = 18
+                WHERE id = ?
+            ''', [member_id] + hole_scores + [total_score, score_id])
+            update_scorecard_points(conn, tournament_id, [member_id])
+            bump_scores_version(conn, tournament_id)
         
+        update_live_ranking(conn, tournament_id, {existing['member_id'], member_id})
+        update_side_games(conn, tournament_id, {existing['member_id'], member_id})
         conn.close()
         flash('Score updated successfully.', 'success')
-        return redirect(url_for('view_tournament', tournament_id=tournament_id))
+        return tournament_page_redirect(tournament_id)
     
     # Get score data for the form
     score_data = conn.execute(
@@ -1601,28 +2911,32 @@ def edit_score(score_id):
         conn.close()
         return redirect(url_for('tournaments'))
     
-    members = conn.execute('SELECT * FROM members ORDER BY name').fetchall()
+    member = conn.execute('SELECT id, name, handicap FROM members WHERE id = ?', (score_data['member_id'],)).fetchone()
     conn.close()
     
-    return render_template('edit_score.html', score=score_data, members=members)
+    return render_template('edit_score.html', score=score_data, member=member)
 
 @app.route('/delete_score/<int:score_id>', methods=['GET'])
 def delete_score(score_id):
     conn = get_db_connection()
     
-    # Get tournament_id before deleting
-    tournament_id = conn.execute(
-        'SELECT tournament_id FROM tournament_scores WHERE id = ?',
-        (score_id,)
-    ).fetchone()['tournament_id']
+    # Get tournament_id and member before deleting
+    with write_transaction(conn):
+        score = conn.execute(
+            'SELECT tournament_id, member_id FROM tournament_scores WHERE id = ?',
+            (score_id,)
+        ).fetchone()
+        tournament_id = score['tournament_id']
     
-    # Delete the score
-    conn.execute('DELETE FROM tournament_scores WHERE id = ?', (score_id,))
-    conn.commit()
+        # Delete the score
+        conn.execute('DELETE FROM tournament_scores WHERE id = ?', (score_id,))
+        bump_scores_version(conn, tournament_id)
+    update_live_ranking(conn, tournament_id, [score['member_id']])
+    update_side_games(conn, tournament_id, [score['member_id']])
     conn.close()
     
     flash('Score deleted.', 'success')
-    return redirect(url_for('view_tournament', tournament_id=tournament_id))
+    return tournament_page_redirect(tournament_id)
 
 def natural_sort_key(s):
     return [int(text) if text.isdigit() else text.lower() for text in re.split('([0-9]+)', s)]
@@ -1684,11 +2998,11 @@ def add_group(tournament_id):
     secure_token = str(uuid.uuid4())
     
     conn = get_db_connection()
-    conn.execute(
-        'INSERT INTO groups (tournament_id, name, secure_token) VALUES (?, ?, ?)',
-        (tournament_id, group_name, secure_token)
-    )
-    conn.commit()
+    with write_transaction(conn):
+        conn.execute(
+            'INSERT INTO groups (tournament_id, name, secure_token) VALUES (?, ?, ?)',
+            (tournament_id, group_name, secure_token)
+        )
     conn.close()
     
     flash('Group added.', 'success')
@@ -1704,28 +3018,101 @@ def set_staggered_tee_times(tournament_id):
     
     conn = get_db_connection()
     
-    groups_query = conn.execute(
-        'SELECT id, name FROM groups WHERE tournament_id = ?',
-        (tournament_id,)
-    ).fetchall()
+    with write_transaction(conn):
+        groups_query = conn.execute(
+            'SELECT id, name FROM groups WHERE tournament_id = ?',
+            (tournament_id,)
+        ).fetchall()
     
-    groups = [dict(row) for row in groups_query]
-    groups.sort(key=lambda x: natural_sort_key(x['name']))
+        groups = [dict(row) for row in groups_query]
+        groups.sort(key=lambda x: natural_sort_key(x['name']))
     
-    current_tee_time = start_time
-    for group in groups:
-        conn.execute(
-            'UPDATE groups SET tee_time = ? WHERE id = ?',
-            (current_tee_time.strftime('%H:%M'), group['id'])
-        )
-        current_tee_time += timedelta(minutes=stagger_minutes)
+        current_tee_time = start_time
+        for group in groups:
+            conn.execute(
+                'UPDATE groups SET tee_time = ? WHERE id = ?',
+                (current_tee_time.strftime('%H:%M'), group['id'])
+            )
+            current_tee_time += timedelta(minutes=stagger_minutes)
         
-    conn.commit()
     conn.close()
     
     flash('Staggered tee times set.', 'success')
     return redirect(url_for('manage_groups', tournament_id=tournament_id))
 
+@app.route('/tournament/<int:tournament_id>/pace')
+def pace_of_play(tournament_id):
+    """Organizer dashboard with one row per group showing how far each group has played."""
+    conn = get_db_connection()
+
+    tournament = conn.execute(
+        'SELECT * FROM tournaments WHERE id = ?',
+        (tournament_id,)
+    ).fetchone()
+
+    if tournament is None:
+        conn.close()
+        return redirect(url_for('tournaments'))
+
+    # Single grouped query over the indexed progress counters - no hole columns are read
+    groups_query = conn.execute('''
+        SELECT g.id, g.name, g.tee_time,
+               COUNT(gm.member_id) AS players,
+               COUNT(ts.id) AS players_started,
+               MIN(COALESCE(ts.holes_completed, 0)) AS min_thru,
+               MAX(COALESCE(ts.holes_completed, 0)) AS max_thru,
+               MAX(ts.last_hole_played) AS last_hole_played,
+               SUM(CASE WHEN ts.holes_completed = 18 THEN 1 ELSE 0 END) AS players_finished
+        FROM groups g
+        LEFT JOIN group_members gm ON gm.group_id = g.id
+        LEFT JOIN tournament_scores ts ON ts.tournament_id = g.tournament_id AND ts.member_id = gm.member_id
+        WHERE g.tournament_id = ?
+        GROUP BY g.id
+    ''', (tournament_id,)).fetchall()
+    conn.close()
+
+    groups = []
+    for row in groups_query:
+        group = dict(row)
+        if group['players'] and group['players_finished'] == group['players']:
+            group['status'] = 'Finished'
+        elif group['max_thru']:
+            group['status'] = 'On course'
+        else:
+            group['status'] = 'Not started'
+        groups.append(group)
+    groups.sort(key=lambda x: natural_sort_key(x['name']))
+
+    return render_template('pace_of_play.html', tournament=tournament, groups=groups)
+
+@app.route('/tournament/<int:tournament_id>/teams')
+@app.route('/tournament/<int:tournament_id>/teams.json', endpoint='team_leaderboards_json')
+def team_leaderboards(tournament_id):
+    """Best ball, aggregate and Stableford leaderboards with each group as a team."""
+    best_n = min(max(request.args.get('best_n', team_games.DEFAULT_BEST_N, type=int), 1), team_games.MAX_BEST_N)
+    conn = get_db_connection()
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()
+    if tournament is None:
+        conn.close()
+        if request.path.endswith('.json'):
+            return jsonify({'error': 'Tournament not found'}), 404
+        return redirect(url_for('tournaments'))
+
+    result = get_team_leaderboards(conn, tournament, best_n)
+    course = conn.execute('SELECT * FROM courses WHERE id = ?', (tournament['course_id'],)).fetchone() if tournament['course_id'] else None
+    conn.close()
+
+    if request.path.endswith('.json'):
+        return jsonify(dict(result, tournament_id=tournament_id, scores_version=tournament['scores_version'] or 0))
+
+    teams_by_id = {team['group_id']: team for team in result['teams']}
+    leaderboards = {
+        board: [teams_by_id[group_id] for group_id in group_ids]
+        for board, group_ids in result['leaderboards'].items()
+    }
+    return render_template('teams.html', tournament=tournament, course=course,
+                           best_n=best_n, max_best_n=team_games.MAX_BEST_N, leaderboards=leaderboards)
+
 @app.route('/group/<int:group_id>')
 def view_group(group_id):
     conn = get_db_connection()
@@ -1788,30 +3175,26 @@ def add_member_to_group(group_id):
         (group_id,)
     ).fetchone()['tournament_id']
     
-    try:
-        # Check if member is already in another group for this tournament
+    # Check if member is already in another group for this tournament
+    with write_transaction(conn):
         existing = conn.execute(
             'SELECT group_id FROM group_members WHERE member_id = ? AND tournament_id = ?',
             (member_id, tournament_id)
         ).fetchone()
-        
+    
         if existing:
             # Remove from existing group first
             conn.execute(
                 'DELETE FROM group_members WHERE member_id = ? AND tournament_id = ?',
                 (member_id, tournament_id)
             )
-        
+    
         # Add to new group
         conn.execute(
             'INSERT INTO group_members (group_id, member_id, tournament_id) VALUES (?, ?, ?)',
             (group_id, member_id, tournament_id)
         )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-    finally:
-        conn.close()
+    conn.close()
     
     flash('Member added to group.', 'success')
     return redirect(url_for('view_group', group_id=group_id))
@@ -1821,13 +3204,13 @@ def remove_member_from_group(group_member_id):
     conn = get_db_connection()
     
     # Get group_id before deleting
-    group_id = conn.execute(
-        'SELECT group_id FROM group_members WHERE id = ?',
-        (group_member_id,)
-    ).fetchone()['group_id']
+    with write_transaction(conn):
+        group_id = conn.execute(
+            'SELECT group_id FROM group_members WHERE id = ?',
+            (group_member_id,)
+        ).fetchone()['group_id']
     
-    conn.execute('DELETE FROM group_members WHERE id = ?', (group_member_id,))
-    conn.commit()
+        conn.execute('DELETE FROM group_members WHERE id = ?', (group_member_id,))
     conn.close()
     
     flash('Member removed from group.', 'success')
@@ -1838,16 +3221,16 @@ def delete_group(group_id):
     conn = get_db_connection()
     
     # Get tournament_id before deleting
-    tournament_id = conn.execute(
-        'SELECT tournament_id FROM groups WHERE id = ?',
-        (group_id,)
-    ).fetchone()['tournament_id']
+    with write_transaction(conn):
+        tournament_id = conn.execute(
+            'SELECT tournament_id FROM groups WHERE id = ?',
+            (group_id,)
+        ).fetchone()['tournament_id']
     
-    # Delete group members first
-    conn.execute('DELETE FROM group_members WHERE group_id = ?', (group_id,))
-    # Delete the group
-    conn.execute('DELETE FROM groups WHERE id = ?', (group_id,))
-    conn.commit()
+        # Delete group members first
+        conn.execute('DELETE FROM group_members WHERE group_id = ?', (group_id,))
+        # Delete the group
+        conn.execute('DELETE FROM groups WHERE id = ?', (group_id,))
     conn.close()
     
     flash('Group deleted.', 'success')
@@ -1905,45 +3288,7 @@ def group_score_entry(group_id):
 @app.route('/group/<int:group_id>/add_score', methods=['POST'])
 def add_group_score(group_id):
     """Add score for a group member - restricted to group members only"""
-    conn = get_db_connection()
-    
-    # Get group info to verify tournament
-    group = conn.execute('''
-        SELECT g.*, t.finalized
-        FROM groups g
-        JOIN tournaments t ON g.tournament_id = t.id
-        WHERE g.id = ?
-    ''', (group_id,)).fetchone()
-    
-    if group is None or group['finalized']:
-        conn.close()
-        flash('Invalid group or tournament is finalized.', 'error')
-        return redirect(url_for('view_group', group_id=group_id))
-    
     member_id = int(request.form['member_id'])
-    tournament_id = group['tournament_id']
-    
-    # Verify that the member is actually in this group
-    member_in_group = conn.execute(
-        'SELECT 1 FROM group_members WHERE group_id = ? AND member_id = ?',
-        (group_id, member_id)
-    ).fetchone()
-    
-    if not member_in_group:
-        conn.close()
-        flash('Member is not in this group.', 'error')
-        return redirect(url_for('view_group', group_id=group_id))
-    
-    # Check if member already has a score for this tournament
-    existing_score = conn.execute(
-        'SELECT 1 FROM tournament_scores WHERE tournament_id = ? AND member_id = ?',
-        (tournament_id, member_id)
-    ).fetchone()
-    
-    if existing_score:
-        conn.close()
-        flash('This member already has a score for this tournament.', 'error')
-        return redirect(url_for('view_group', group_id=group_id))
     
     # Get all hole scores
     hole_scores = []
@@ -1954,19 +3299,56 @@ def add_group_score(group_id):
     # Calculate total score
     total_score = sum(hole_scores)
     
-    # Get member's current handicap
-    member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
+    conn = get_db_connection()
+    # The checks run under the write lock, so two submissions of the same card at once
+    # (a double tap) cannot both pass them and insert two scorecards
+    with write_transaction(conn):
+        # Get group info to verify tournament
+        group = conn.execute('''
+            SELECT g.*, t.finalized
+            FROM groups g
+            JOIN tournaments t ON g.tournament_id = t.id
+            WHERE g.id = ?
+        ''', (group_id,)).fetchone()
+        
+        if group is None or group['finalized']:
+            error = 'Invalid group or tournament is finalized.'
+        # Verify that the member is actually in this group
+        elif not conn.execute(
+            'SELECT 1 FROM group_members WHERE group_id = ? AND member_id = ?',
+            (group_id, member_id)
+        ).fetchone():
+            error = 'Member is not in this group.'
+        # Check if member already has a score for this tournament
+        elif conn.execute(
+            'SELECT 1 FROM tournament_scores WHERE tournament_id = ? AND member_id = ?',
+            (group['tournament_id'], member_id)
+        ).fetchone():
+            error = 'This member already has a score for this tournament.'
+        else:
+            error = None
+            tournament_id = group['tournament_id']
+            # Get member's current handicap
+            member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
 
-    conn.execute('''
-        INSERT INTO tournament_scores (
-            tournament_id, member_id, 
-            hole1, hole2, hole3, hole4, hole5, hole6, hole7, hole8, hole9,
-            hole10, hole11, hole12, hole13, hole14, hole15, hole16, hole17, hole18,
-            total_score, net_handicap
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', [tournament_id, member_id] + hole_scores + [total_score, member_handicap])
+            conn.execute('''
+                INSERT INTO tournament_scores (
+                    tournament_id, member_id, 
+                    hole1, hole2, hole3, hole4, hole5, hole6, hole7, hole8, hole9,
+                    hole10, hole11, hole12, hole13, hole14, hole15, hole16, hole17, hole18,
+                    total_score, net_handicap, holes_completed, last_hole_played
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [tournament_id, member_id] + hole_scores + [total_score, member_handicap, 18, 18])
+            update_scorecard_points(conn, tournament_id, [member_id])
+            bump_scores_version(conn, tournament_id)
+
+    if error:
+        conn.close()
+        flash(error, 'error')
+        return redirect(url_for('view_group', group_id=group_id))
 
-    conn.commit()
+    update_live_ranking(conn, tournament_id, [member_id])
+    update_side_games(conn, tournament_id, [member_id])
     conn.close()
     
     flash('Score added for group member.', 'success')
@@ -1980,39 +3362,31 @@ def add_honorable_mention(tournament_id):
 
     conn = get_db_connection()
     
-    try:
-        # Use INSERT OR REPLACE to handle updates
+    # Use INSERT OR REPLACE to handle updates
+    with write_transaction(conn):
         conn.execute(
             'INSERT OR REPLACE INTO honorable_mentions (tournament_id, member_id, honor_type, honor_type_name) VALUES (?, ?, ?, ?)',
             (tournament_id, member_id, honor_type, honor_type_name)
         )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-    finally:
-        conn.close()
+    conn.close()
     
     flash('Honorable mention saved.', 'success')
-    return redirect(url_for('view_tournament', tournament_id=tournament_id))
+    return tournament_page_redirect(tournament_id)
 
 @app.route('/tournament/<int:tournament_id>/remove_honor', methods=['POST'])
 def remove_honorable_mention(tournament_id):
     honor_type = request.form['honor_type']
 
     conn = get_db_connection()
-    try:
+    with write_transaction(conn):
         conn.execute(
             'DELETE FROM honorable_mentions WHERE tournament_id = ? AND honor_type = ?',
             (tournament_id, honor_type)
         )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-    finally:
-        conn.close()
+    conn.close()
 
     flash('Honorable mention removed.', 'success')
-    return redirect(url_for('view_tournament', tournament_id=tournament_id))
+    return tournament_page_redirect(tournament_id)
 
 @app.route('/tournament/<int:tournament_id>/set_honor_balls', methods=['POST'])
 def set_honor_balls(tournament_id):
@@ -2025,16 +3399,12 @@ def set_honor_balls(tournament_id):
         balls = 0
 
     conn = get_db_connection()
-    try:
+    with write_transaction(conn):
         conn.execute(
             'UPDATE honorable_mentions SET balls_awarded = ? WHERE tournament_id = ? AND honor_type = ?',
             (balls, tournament_id, honor_type)
         )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-    finally:
-        conn.close()
+    conn.close()
 
     # For fetch-based inline update, return JSON-ish response
     # We won't import jsonify at top just for this; a minimal response is fine
@@ -2046,19 +3416,15 @@ def edit_honor_title(tournament_id):
     custom_name = request.form['custom_name']
 
     conn = get_db_connection()
-    try:
+    with write_transaction(conn):
         conn.execute(
             'UPDATE tournament_honor_types SET custom_name = ? WHERE id = ? AND tournament_id = ?',
             (custom_name, honor_type_id, tournament_id)
         )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Database error: {e}")
-    finally:
-        conn.close()
+    conn.close()
 
     flash('Honor title updated.', 'success')
-    return redirect(url_for('view_tournament', tournament_id=tournament_id))
+    return tournament_page_redirect(tournament_id)
 
 # NEW: Token-based secure score entry routes
 @app.route('/score/<token>')
@@ -2152,37 +3518,44 @@ def secure_group_score_entry_by_hole(token, hole_number):
         scores = request.form.getlist('scores')
         member_ids = request.form.getlist('member_ids')
 
-        for member_id, score in zip(member_ids, scores):
-            if score:  # Only process if a score was entered
-                score_id = conn.execute(
-                    'SELECT id FROM tournament_scores WHERE tournament_id = ? AND member_id = ?',
-                    (group['tournament_id'], member_id)
-                ).fetchone()
-
-                if score_id:
-                    conn.execute(
-                        f'UPDATE tournament_scores SET hole{hole_number} = ? WHERE id = ?',
-                        (score, score_id['id'])
-                    )
-                else:
-                    member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
-                    conn.execute(
-                        f'INSERT INTO tournament_scores (tournament_id, member_id, hole{hole_number}, net_handicap) VALUES (?, ?, ?, ?)',
-                        (group['tournament_id'], member_id, score, member_handicap)
-                    )
+        with write_transaction(conn):
+            for member_id, score in zip(member_ids, scores):
+                if score:  # Only process if a score was entered
+                    score_id = conn.execute(
+                        'SELECT id FROM tournament_scores WHERE tournament_id = ? AND member_id = ?',
+                        (group['tournament_id'], member_id)
+                    ).fetchone()
+
+                    if score_id:
+                        conn.execute(
+                            f'UPDATE tournament_scores SET hole{hole_number} = ? WHERE id = ?',
+                            (score, score_id['id'])
+                        )
+                    else:
+                        member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
+                        conn.execute(
+                            f'INSERT INTO tournament_scores (tournament_id, member_id, hole{hole_number}, net_handicap) VALUES (?, ?, ?, ?)',
+                            (group['tournament_id'], member_id, score, member_handicap)
+                        )
         
-        for member_id in member_ids:
+            # Recompute total and progress in the same statement; the counters are what the
+            # leaderboard and pace of play dashboard read, so they never rescan hole columns.
+            # last_hole_played is the hole just saved, not the highest one scored, so groups
+            # starting on the 10th tee (or a shotgun start) show holes 1-9 after the turn
             sum_expression = ' + '.join([f'COALESCE(hole{i}, 0)' for i in range(1, 19)])
-            total_score_query = f'SELECT {sum_expression} FROM tournament_scores WHERE tournament_id = ? AND member_id = ?'
-            total_score_result = conn.execute(total_score_query, (group['tournament_id'], member_id)).fetchone()
-            total_score = total_score_result[0] if total_score_result else 0
-            
-            conn.execute(
-                'UPDATE tournament_scores SET total_score = ? WHERE tournament_id = ? AND member_id = ?',
-                (total_score, group['tournament_id'], member_id)
-            )
-
-        conn.commit()
+            for member_id, score in zip(member_ids, scores):
+                conn.execute(f'''
+                    UPDATE tournament_scores
+                    SET total_score = {sum_expression},
+                        holes_completed = {HOLES_COMPLETED_SQL},
+                        last_hole_played = CASE WHEN ? THEN ? ELSE last_hole_played END
+                    WHERE tournament_id = ? AND member_id = ?
+                ''', (1 if score else 0, hole_number, group['tournament_id'], member_id))
+            update_scorecard_points(conn, group['tournament_id'], member_ids)
+            bump_scores_version(conn, group['tournament_id'])
+
+        update_live_ranking(conn, group['tournament_id'], member_ids)
+        update_side_games(conn, group['tournament_id'], member_ids)
 
         if action == 'next':
             flash('Hole scores saved.', 'success')
@@ -2201,6 +3574,21 @@ def secure_group_score_entry_by_hole(token, hole_number):
     running_totals = {}
     front9_totals = {}
     back9_totals = {}
+    # Projected positions within each player's gender, read from the live rankings
+    positions = {}
+    scores_version = conn.execute(
+        'SELECT scores_version FROM tournaments WHERE id = ?', (group['tournament_id'],)
+    ).fetchone()['scores_version']
+    rankings = {gender: get_live_ranking(group['tournament_id'], gender, scores_version)
+                for gender in {member['gender'] for member in group_members}}
+    for member in group_members:
+        ranking = rankings[member['gender']]
+        if member['id'] in ranking:
+            positions[member['id']] = {
+                'net': ranking.position(member['id'], 'net'),
+                'gross': ranking.position(member['id'], 'gross'),
+                'field': len(ranking)
+            }
     for member in group_members:
         score_row = conn.execute(
             "SELECT * FROM tournament_scores WHERE tournament_id = ? AND member_id = ?",
@@ -2235,57 +3623,14 @@ def secure_group_score_entry_by_hole(token, hole_number):
                          running_totals=running_totals,
                          front9_totals=front9_totals,
                          back9_totals=back9_totals,
+                         positions=positions,
                          token=token,
                          hide_nav=True)
 
 @app.route('/score/<token>/add', methods=['POST'])
 def secure_add_group_score(token):
     """Add score for a group member via secure token - restricted to group members only"""
-    conn = get_db_connection()
-    
-    # Get group info by token to verify tournament
-    group = conn.execute('''
-        SELECT g.*, t.finalized
-        FROM groups g
-        JOIN tournaments t ON g.tournament_id = t.id
-        WHERE g.secure_token = ?
-    ''', (token,)).fetchone()
-    
-    if group is None:
-        conn.close()
-        flash('Invalid or expired link.', 'error')
-        return redirect(url_for('tournaments'))
-    
-    if group['finalized']:
-        conn.close()
-        flash('Invalid group or tournament is finalized.', 'error')
-        return redirect(url_for('tournaments'))
-    
     member_id = int(request.form['member_id'])
-    tournament_id = group['tournament_id']
-    group_id = group['id']
-    
-    # Verify that the member is actually in this group
-    member_in_group = conn.execute(
-        'SELECT 1 FROM group_members WHERE group_id = ? AND member_id = ?',
-        (group_id, member_id)
-    ).fetchone()
-    
-    if not member_in_group:
-        conn.close()
-        flash('Member is not in this group.', 'error')
-        return redirect(url_for('tournaments'))
-    
-    # Check if member already has a score for this tournament
-    existing_score = conn.execute(
-        'SELECT 1 FROM tournament_scores WHERE tournament_id = ? AND member_id = ?',
-        (tournament_id, member_id)
-    ).fetchone()
-    
-    if existing_score:
-        conn.close()
-        flash('This member already has a score for this tournament.', 'error')
-        return redirect(url_for('tournaments'))
     
     # Get all hole scores
     hole_scores = []
@@ -2296,19 +3641,58 @@ def secure_add_group_score(token):
     # Calculate total score
     total_score = sum(hole_scores)
     
-    # Get member's current handicap
-    member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
+    conn = get_db_connection()
+    # The checks run under the write lock, so two submissions of the same card at once
+    # (a double tap) cannot both pass them and insert two scorecards
+    with write_transaction(conn):
+        # Get group info by token to verify tournament
+        group = conn.execute('''
+            SELECT g.*, t.finalized
+            FROM groups g
+            JOIN tournaments t ON g.tournament_id = t.id
+            WHERE g.secure_token = ?
+        ''', (token,)).fetchone()
+        
+        if group is None:
+            error = 'Invalid or expired link.'
+        elif group['finalized']:
+            error = 'Invalid group or tournament is finalized.'
+        # Verify that the member is actually in this group
+        elif not conn.execute(
+            'SELECT 1 FROM group_members WHERE group_id = ? AND member_id = ?',
+            (group['id'], member_id)
+        ).fetchone():
+            error = 'Member is not in this group.'
+        # Check if member already has a score for this tournament
+        elif conn.execute(
+            'SELECT 1 FROM tournament_scores WHERE tournament_id = ? AND member_id = ?',
+            (group['tournament_id'], member_id)
+        ).fetchone():
+            error = 'This member already has a score for this tournament.'
+        else:
+            error = None
+            tournament_id = group['tournament_id']
+            # Get member's current handicap
+            member_handicap = conn.execute('SELECT handicap FROM members WHERE id = ?', (member_id,)).fetchone()['handicap']
 
-    conn.execute('''
-        INSERT INTO tournament_scores (
-            tournament_id, member_id, 
-            hole1, hole2, hole3, hole4, hole5, hole6, hole7, hole8, hole9,
-            hole10, hole11, hole12, hole13, hole14, hole15, hole16, hole17, hole18,
-            total_score, net_handicap
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', [tournament_id, member_id] + hole_scores + [total_score, member_handicap])
+            conn.execute('''
+                INSERT INTO tournament_scores (
+                    tournament_id, member_id, 
+                    hole1, hole2, hole3, hole4, hole5, hole6, hole7, hole8, hole9,
+                    hole10, hole11, hole12, hole13, hole14, hole15, hole16, hole17, hole18,
+                    total_score, net_handicap, holes_completed, last_hole_played
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [tournament_id, member_id] + hole_scores + [total_score, member_handicap, 18, 18])
+            update_scorecard_points(conn, tournament_id, [member_id])
+            bump_scores_version(conn, tournament_id)
+
+    if error:
+        conn.close()
+        flash(error, 'error')
+        return redirect(url_for('tournaments'))
 
-    conn.commit()
+    update_live_ranking(conn, tournament_id, [member_id])
+    update_side_games(conn, tournament_id, [member_id])
     conn.close()
     
     flash('Score submitted.', 'success')
@@ -2348,6 +3732,17 @@ def printable_group_list(tournament_id):
     conn.close()
     return jsonify(group_data)
 
+def create_app(database=None):
+    """Prepare the app in this process: pick the database, migrate it (once across
+    all workers) and load the live rankings. wsgi.py calls it in every worker."""
+    global DATABASE
+    if database:
+        DATABASE = database
+    migrate_db()
+    rebuild_live_rankings()
+    return app
+
 if __name__ == '__main__':
-    init_db()
+    # Development server; production runs wsgi.py under gunicorn (see gunicorn.conf.py) or waitress
+    create_app()
     app.run(debug=True, host='0.0.0.0', port=5004)
@@ -0,0 +1,138 @@
+"""Fingerprinted static assets.
+
+Stylesheets and scripts live under static/ (css/, js/). build() minifies each
+one, names the output after a hash of its content (css/base.3f9c2a1b.css) under
+static/dist/, writes pre-compressed .gz siblings (and .br when the brotli package
+is installed) and records the mapping in static/dist/manifest.json.
+
+Templates call asset_url('css/base.css'), which resolves through the manifest at
+render time. A hashed file never changes, so it is served with an immutable
+Cache-Control and browsers fetch each version once. Without a build, asset_url
+falls back to the plain file under /static.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_from_directory, url_for
+
+import compression
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+ASSET_TYPES = ('.css', '.js')
+HASH_LENGTH = 10
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Pre-compressed variants, in order of preference
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+_manifest = {'mtime': None, 'entries': {}}
+
+
+def minify_css(text):
+    """Strip comments and the whitespace around punctuation."""
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    text = re.sub(r':\s+', ':', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    """Drop indentation, blank lines and whole-line comments.
+
+    Line breaks are kept, so automatic semicolon insertion and strings are left
+    exactly as written.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def source_files():
+    """Asset names (relative to static/, with forward slashes) that build() processes."""
+    names = []
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != DIST_DIR]
+        for filename in files:
+            if os.path.splitext(filename)[1] in ASSET_TYPES:
+                names.append(os.path.relpath(os.path.join(root, filename), STATIC_DIR).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def build():
+    """Minify, fingerprint and pre-compress every asset; returns the new manifest.
+
+    Files from earlier builds are left in place, so pages that still reference
+    them (stored tournament snapshots, open browser tabs) keep working.
+    """
+    manifest = {}
+    for name in source_files():
+        base, extension = os.path.splitext(name)
+        with open(os.path.join(STATIC_DIR, name), encoding='utf-8') as f:
+            content = MINIFIERS[extension](f.read()).encode('utf-8')
+        hashed = f'{base}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{extension}'
+        path = os.path.join(DIST_DIR, hashed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(content, quality=11))
+        manifest[name] = hashed
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def manifest_entries():
+    """The build manifest, re-read only when the file changes."""
+    try:
+        mtime = os.stat(MANIFEST_PATH).st_mtime
+    except OSError:
+        return {}
+    if mtime != _manifest['mtime']:
+        with open(MANIFEST_PATH) as f:
+            _manifest['entries'] = json.load(f)
+        _manifest['mtime'] = mtime
+    return _manifest['entries']
+
+
+def asset_url(name):
+    """URL of the built asset for a source name like 'css/base.css'."""
+    hashed = manifest_entries().get(name)
+    if hashed is None:
+        return url_for('static', filename=name)
+    return url_for('asset', filename=hashed)
+
+
+def send_asset(filename):
+    """Serve a built asset, pre-compressed when the client accepts it, cached forever."""
+    accepted = compression.accepted_encodings(request.headers.get('Accept-Encoding'))
+    mimetype = mimetypes.guess_type(filename)[0]
+    # Highest q-value first; on a tie ENCODINGS order (brotli first) decides
+    for encoding, suffix in sorted(ENCODINGS, key=lambda entry: -accepted.get(entry[0], 0)):
+        if encoding in accepted and os.path.isfile(os.path.join(DIST_DIR, filename + suffix)):
+            response = send_from_directory(DIST_DIR, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(DIST_DIR, filename, mimetype=mimetype)
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
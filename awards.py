@@ -0,0 +1,39 @@
+"""Automatic tournament awards taken from the final leaderboards.
+
+Gross 1st goes to the top of each gender's gross board. The net awards (1st to
+5th, Lucky 7 and BB, second last) come from both net boards merged on net score.
+Rows only need name, total_score and handicap, so the same rules serve the live
+page, the finalize preview and stored results.
+"""
+import heapq
+
+NET_POSITIONS = ['1st', '2nd', '3rd', '4th', '5th']
+LUCKY_POSITION = 7
+
+AWARD_NAMES = ['Gross 1st Male', 'Gross 1st Female'] + [f'Net {position}' for position in NET_POSITIONS] + ['Lucky 7', 'BB']
+
+
+def net_score(row):
+    """Net score as the leaderboard shows it (truncated to a whole stroke)."""
+    return int(row['total_score'] - row['handicap'])
+
+
+def automatic_awards(gross_boards, net_boards):
+    """Award name -> winning row, from {gender: rows in leaderboard order} boards."""
+    awards = {}
+
+    # Gross 1st place awards (Male and Female)
+    for gender in ('Male', 'Female'):
+        if gross_boards.get(gender):
+            awards[f'Gross 1st {gender}'] = gross_boards[gender][0]
+
+    # Both net boards are ranked, so a merge gives the combined order without re-sorting
+    # (ties keep male before female)
+    combined = list(heapq.merge(net_boards.get('Male', []), net_boards.get('Female', []), key=net_score))
+    for i, position in enumerate(NET_POSITIONS[:len(combined)]):
+        awards[f'Net {position}'] = combined[i]
+    if len(combined) >= LUCKY_POSITION:
+        awards['Lucky 7'] = combined[LUCKY_POSITION - 1]
+    if len(combined) >= 2:
+        awards['BB'] = combined[-2]
+    return awards
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Backfill the handicap_history ledger from data recorded before it existed.
+
+For each member the trajectory is rebuilt from the handicap each finalized round
+was played off (tournament_scores.net_handicap) and the adjustment log, keeping
+only the points where the handicap changed. Members are streamed in chunks by
+id, each chunk read with two range queries and written in its own transaction,
+so the backfill runs in bounded memory and can be interrupted and rerun.
+
+Entries are only added before a member's first ledger entry written by the app,
+and earlier backfill entries are replaced, so running it again is safe.
+
+    python backfill_handicap_history.py [--database database.db] [--chunk-size 500]
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add the current directory to Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def member_chunks(conn, chunk_size):
+    """Yield lists of member rows, paging on id."""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            'SELECT id, handicap FROM members WHERE id > ? ORDER BY id LIMIT ?', (last_id, chunk_size)
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]['id']
+
+
+def chunk_events(conn, first_id, last_id):
+    """Handicap events for members first_id..last_id: {member_id: [(date, tournament_id, order, handicap, reason)]}."""
+    events = {}
+    for row in conn.execute('''
+        SELECT ts.member_id, t.date, t.id AS tournament_id, ts.net_handicap
+        FROM tournament_scores ts
+        JOIN tournaments t ON t.id = ts.tournament_id
+        WHERE ts.member_id BETWEEN ? AND ? AND t.finalized = 1 AND ts.net_handicap IS NOT NULL
+    ''', (first_id, last_id)):
+        events.setdefault(row['member_id'], []).append(
+            (row['date'], row['tournament_id'], 0, row['net_handicap'], 'Played off')
+        )
+    for row in conn.execute('''
+        SELECT l.member_id, t.date, l.tournament_id, l.new_handicap, l.reason
+        FROM handicap_adjustment_log l
+        JOIN tournaments t ON t.id = l.tournament_id
+        WHERE l.member_id BETWEEN ? AND ? AND l.new_handicap IS NOT NULL
+    ''', (first_id, last_id)):
+        events.setdefault(row['member_id'], []).append(
+            (row['date'], row['tournament_id'], 1, row['new_handicap'], row['reason'])
+        )
+    return events
+
+
+def backfill_chunk(conn, members, now):
+    """Write the backfill entries for one chunk of members in one transaction. Returns the entry count."""
+    first_id, last_id = members[0]['id'], members[-1]['id']
+    events = chunk_events(conn, first_id, last_id)
+    recorded_from = {
+        row['member_id']: row['first_date'] for row in conn.execute('''
+            SELECT member_id, MIN(effective_date) AS first_date FROM handicap_history
+            WHERE member_id BETWEEN ? AND ? AND source != 'backfill'
+            GROUP BY member_id
+        ''', (first_id, last_id))
+    }
+
+    entries = []
+    for member in members:
+        cutoff = recorded_from.get(member['id'])
+        previous = None
+        for date, tournament_id, _, handicap, reason in sorted(events.get(member['id'], [])):
+            if cutoff is not None and date >= cutoff:
+                break
+            if handicap != previous:
+                entries.append((member['id'], date, handicap, previous, tournament_id, reason, now))
+                previous = handicap
+        # The current handicap closes the trajectory when the ledger has nothing later
+        if cutoff is None and member['handicap'] is not None and member['handicap'] != previous:
+            entries.append((member['id'], now, member['handicap'], previous, None, 'Current handicap', now))
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.execute("DELETE FROM handicap_history WHERE source = 'backfill' AND member_id BETWEEN ? AND ?", (first_id, last_id))
+        conn.executemany('''
+            INSERT INTO handicap_history
+                (member_id, effective_date, handicap, previous_handicap, source, tournament_id, reason, created_at)
+            VALUES (?, ?, ?, ?, 'backfill', ?, ?, ?)
+        ''', entries)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=app.DATABASE, help='SQLite database file (default: %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='members per transaction (default: %(default)s)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        print(f"Database file {args.database} not found. Please run the main application first.")
+        return 1
+    app.DATABASE = args.database
+    app.init_db()
+
+    conn = app.get_db_connection()
+    conn.isolation_level = None
+    now = datetime.now().isoformat()
+    members = entries = 0
+    for chunk in member_chunks(conn, max(1, args.chunk_size)):
+        entries += backfill_chunk(conn, chunk, now)
+        members += len(chunk)
+        print(f"  ... {members} members, {entries} history entries")
+    conn.close()
+    print(f"✅ Backfilled {entries} handicap history entries for {members} members.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
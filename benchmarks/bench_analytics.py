@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark the analytics module over synthetic tournament data.
+
+Creates a temporary database with 1000 finalized tournaments in one season, then
+times per-tournament statistics (cold and cached), the season-wide pass, and a
+plain Python loop over the same rows for comparison.
+
+    python benchmarks/bench_analytics.py --tournaments 1000 --players 60
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the repository root to the Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+import analytics
+from scoring import HOLE_COLUMNS
+
+
+def build_database(path, tournaments, players, seed):
+    """Populate a fresh database with synthetic members, tournaments and full scorecards."""
+    app.DATABASE = path
+    app.init_db()
+    rng = random.Random(seed)
+    conn = app.get_db_connection()
+    members = [(f'Player {i}', rng.randint(0, 36), 'Male' if rng.random() < 0.75 else 'Female') for i in range(players * 2)]
+    conn.executemany('INSERT INTO members (name, handicap, gender) VALUES (?, ?, ?)', members)
+    conn.executemany(
+        'INSERT INTO tournaments (id, name, date, finalized) VALUES (?, ?, ?, 1)',
+        [(t, f'Tournament {t}', '2025-01-01') for t in range(1, tournaments + 1)]
+    )
+    columns = ', '.join(HOLE_COLUMNS)
+    placeholders = ', '.join('?' for _ in range(21))
+    rows = []
+    for t in range(1, tournaments + 1):
+        for member_id in rng.sample(range(1, players * 2 + 1), players):
+            holes = [max(1, int(rng.gauss(4.9, 1.1))) for _ in range(18)]
+            rows.append([t, member_id] + holes + [sum(holes)])
+    conn.executemany(
+        f'INSERT INTO tournament_scores (tournament_id, member_id, {columns}, total_score) VALUES ({placeholders})',
+        rows
+    )
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def python_loop_statistics(rows):
+    """Reference implementation: per-hole averages and score type counts with plain loops."""
+    sums = [0] * 18
+    plays = [0] * 18
+    counts = {}
+    for row in rows:
+        for i, column in enumerate(HOLE_COLUMNS):
+            value = row[column]
+            if value is None:
+                continue
+            sums[i] += value
+            plays[i] += 1
+            to_par = value - 4
+            key = (row['member_id'], max(-2, min(2, to_par)))
+            counts[key] = counts.get(key, 0) + 1
+    return [s / p if p else None for s, p in zip(sums, plays)], counts
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tournaments', type=int, default=1000)
+    parser.add_argument('--players', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        total_rows = build_database(os.path.join(tmp, 'bench.db'), args.tournaments, args.players, args.seed)
+        print(f"Built {args.tournaments} tournaments / {total_rows} rounds in {time.perf_counter() - start:.2f}s")
+
+        conn = app.get_db_connection()
+        sample_ids = list(range(1, args.tournaments + 1, max(1, args.tournaments // 50)))
+        tournaments = [conn.execute('SELECT * FROM tournaments WHERE id = ?', (t,)).fetchone() for t in sample_ids]
+
+        cold, _ = timed(lambda: [analytics.tournament_statistics(conn, t) for t in tournaments])
+        warm, _ = timed(lambda: [analytics.tournament_statistics(conn, t) for t in tournaments])
+        print(f"Tournament statistics, cold: {cold / len(tournaments) * 1000:.2f} ms per tournament")
+        print(f"Tournament statistics, cached: {warm / len(tournaments) * 1000:.2f} ms per tournament")
+
+        load_time, rows = timed(lambda: analytics.load_rounds(conn, "substr(t.date, 1, 4) = ?", ('2025',)))
+        compute_time, stats = timed(lambda: analytics.compute_statistics(rows))
+        loop_time, _ = timed(lambda: python_loop_statistics(rows))
+        print(f"Season load ({len(rows)} rounds): {load_time:.3f}s")
+        print(f"Season statistics, vectorized: {compute_time:.3f}s ({len(stats['players'])} players)")
+        print(f"Season averages + counts, Python loop: {loop_time:.3f}s")
+
+        season_cold, _ = timed(lambda: analytics.season_statistics(conn, '2025'))
+        season_warm, _ = timed(lambda: analytics.season_statistics(conn, '2025'))
+        print(f"Season statistics end to end, cold: {season_cold:.3f}s, cached: {season_warm * 1000:.2f} ms")
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark response compression: CPU cost against bytes saved.
+
+Renders the pages the app serves most (tournament page, leaderboards fragment,
+members list, live leaderboard JSON and the printable group list JSON) from a synthetic
+database, then compresses each body with every gzip level and brotli quality
+the middleware can be configured with. Also times the full request through the
+middleware with and without Accept-Encoding.
+
+    python benchmarks/bench_compression.py --players 200 --repeat 20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Add the repository root to the Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+import compression
+from bench_analytics import build_database
+
+PAGES = [
+    ('tournament page', '/tournament/1'),
+    ('leaderboards fragment', '/tournament/1/fragments/leaderboards'),
+    ('members', '/members'),
+    ('leaderboard JSON', '/tournament/1/leaderboard.json'),
+    ('group list JSON', '/tournament/1/groups/printable'),
+]
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def prepare(path, players, seed):
+    """A live tournament with a full field in groups of four."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_database(path, 1, players, seed)
+    conn = app.get_db_connection()
+    conn.execute('UPDATE tournaments SET finalized = 0')
+    conn.execute('UPDATE tournament_scores SET holes_completed = 18, net_handicap = (SELECT handicap FROM members WHERE id = member_id)')
+    conn.execute('UPDATE members SET tournaments_played = 5')
+    member_ids = [row[0] for row in conn.execute('SELECT member_id FROM tournament_scores WHERE tournament_id = 1 ORDER BY member_id')]
+    for number, start in enumerate(range(0, len(member_ids), 4), 1):
+        group_id = conn.execute(
+            "INSERT INTO groups (tournament_id, name, tee_time) VALUES (1, ?, ?)",
+            (f'Group {number}', f'{7 + number // 6:02d}:{number % 6 * 10:02d}')
+        ).lastrowid
+        conn.executemany(
+            'INSERT INTO group_members (group_id, member_id, tournament_id) VALUES (?, ?, 1)',
+            [(group_id, member_id) for member_id in member_ids[start:start + 4]]
+        )
+    conn.commit()
+    conn.close()
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def compress_whole(compressor, body):
+    return compressor.compress(body) + compressor.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    settings = [(f'gzip {level}', lambda level=level: compression.GzipCompressor(level)) for level in GZIP_LEVELS]
+    if compression.brotli is not None:
+        settings += [(f'br {quality}', lambda quality=quality: compression.BrotliCompressor(quality))
+                     for quality in BROTLI_QUALITIES]
+    else:
+        print('(brotli not installed: gzip only)')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare(os.path.join(tmp, 'bench.db'), args.players, args.seed)
+        client = app.app.test_client()
+        bodies = []
+        for label, url in PAGES:
+            client.get(url)
+            render_ms, response = time_call(lambda: client.get(url), args.repeat)
+            bodies.append((label, url, response.data, render_ms))
+
+        print(f"{args.players} players, mean of {args.repeat} runs (ms to compress / compressed bytes / ratio):")
+        for label, url, body, render_ms in bodies:
+            print(f"\n  {label} ({url}): {len(body)} bytes, rendered in {render_ms:.2f} ms")
+            for name, make in settings:
+                ms, compressed = time_call(lambda: compress_whole(make(), body), args.repeat)
+                print(f"    {name:8s} {ms:7.2f} ms  {len(compressed):8d} bytes  {len(body) / len(compressed):5.1f}x"
+                      f"  ({ms / render_ms * 100:4.1f}% of render)")
+
+        # End to end through the middleware with the app's configured levels
+        print("\n  full request through the middleware:")
+        for label, url, body, _ in bodies[:2]:
+            plain_ms, plain = time_call(lambda: client.get(url), args.repeat)
+            encoded_ms, encoded = time_call(lambda: client.get(url, headers={'Accept-Encoding': 'gzip, br'}), args.repeat)
+            print(f"    {label:22s} identity {plain_ms:7.2f} ms {len(plain.data):8d} bytes   "
+                  f"{encoded.headers.get('Content-Encoding')} {encoded_ms:7.2f} ms {len(encoded.data):8d} bytes")
+
+
+if __name__ == '__main__':
+    main()
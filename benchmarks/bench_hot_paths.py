@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the per-request hot paths, with baseline comparison.
+
+For each field size builds a live tournament (scored, grouped, every player net
+eligible) and times:
+
+    field_scores            tournament_field_scores, the tournament page's read
+    leaderboards            tournament_leaderboards, partitioning the field into the four boards
+    club_adjustments        handicaps.club_adjustments over the field
+    handicap_rules          calculate_total_handicap_adjustment for every player
+    group_sort              sorting the groups with natural_sort_key
+    adjustments_preview     get_handicap_adjustments_for_tournament
+    snapshot                save_tournament_snapshot (full page render and store)
+    apply_adjustments       the handicap adjustment writes finalize makes, rolled back
+                            after every call so each one starts from the same handicaps
+
+Each case is repeated (with enough calls per sample to make a sample at least
+--min-sample-ms long) and the median of the samples is reported. Write the
+results with --save and compare a later run with --baseline; cases slower than
+the baseline by more than --threshold are listed and the exit status is 1.
+
+    python benchmarks/bench_hot_paths.py --save baseline.json
+    python benchmarks/bench_hot_paths.py --baseline baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the repository root to the Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+import handicaps
+from bench_compression import prepare
+
+DEFAULT_SIZES = (20, 50, 100, 200, 500)
+
+# The rows apply_handicap_adjustments passes to club_adjustments
+ADJUSTMENT_SCORES_SQL = '''
+    SELECT ts.*, m.name, m.gender, m.id as member_id, m.gross_win, m.handicap, ts.total_score, ts.net_handicap, m.tournaments_played
+    FROM tournament_scores ts
+    JOIN members m ON ts.member_id = m.id
+    WHERE ts.tournament_id = 1
+    ORDER BY ts.total_score, ts.id
+'''
+
+
+def rolled_back(conn, fn):
+    """Run fn(conn) in a transaction and roll it back, leaving the database as it was."""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        return fn(conn)
+    finally:
+        conn.rollback()
+
+
+def cases(conn, players, seed):
+    """(name, callable) pairs for one prepared database, in the order they run."""
+    tournament = conn.execute('SELECT * FROM tournaments WHERE id = 1').fetchone()
+    all_scores = app.tournament_field_scores(conn, 1)
+    scores = conn.execute(ADJUSTMENT_SCORES_SQL).fetchall()
+    rules_input = [(score['handicap'], 72 - score['total_score'], position)
+                   for position, score in enumerate(scores, 1)]
+    groups = [{'id': number, 'name': f'Group {number}'} for number in range(1, players // 4 + 1)]
+    random.Random(seed).shuffle(groups)
+
+    return [
+        ('field_scores', lambda: app.tournament_field_scores(conn, 1)),
+        ('leaderboards', lambda: app.tournament_leaderboards(conn, tournament, all_scores)),
+        ('club_adjustments', lambda: handicaps.club_adjustments(scores)),
+        ('handicap_rules', lambda: [handicaps.calculate_total_handicap_adjustment(*args) for args in rules_input]),
+        ('group_sort', lambda: sorted(groups, key=lambda group: app.natural_sort_key(group['name']))),
+        ('adjustments_preview', lambda: app.get_handicap_adjustments_for_tournament(1)),
+        ('snapshot', lambda: app.save_tournament_snapshot(1)),
+        ('apply_adjustments', lambda: rolled_back(conn, lambda c: app.write_handicap_adjustments(c, 1))),
+    ]
+
+
+def measure(fn, repeat, min_sample_ms):
+    """Median and minimum milliseconds per call over `repeat` samples."""
+    # Calibrate calls per sample so that fast cases are not lost in timer noise
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if (time.perf_counter() - start) * 1000 >= min_sample_ms or number >= 10000:
+            break
+        number *= 10
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1000)
+    return {'median_ms': statistics.median(samples), 'min_ms': min(samples), 'calls': number * repeat}
+
+
+def run(sizes, repeat, min_sample_ms, seed, only):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for players in sizes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                prepare(os.path.join(tmp, f'bench{players}.db'), players, seed)
+            conn = app.get_db_connection()
+            # A version of its own per size, so no cache built for another database is reused
+            conn.execute('UPDATE tournaments SET scores_version = ?', (players,))
+            conn.commit()
+            app.rebuild_live_rankings()
+            for name, fn in cases(conn, players, seed):
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                # The app prints progress while adjusting handicaps and saving snapshots
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results.setdefault(name, {})[str(players)] = measure(fn, repeat, min_sample_ms)
+            conn.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """(case, size, baseline ms, current ms) for every case slower than the baseline by more than threshold."""
+    regressions = []
+    for name, by_size in results.items():
+        for size, current in by_size.items():
+            previous = baseline.get('results', {}).get(name, {}).get(size)
+            if previous and current['median_ms'] > previous['median_ms'] * (1 + threshold):
+                regressions.append((name, size, previous['median_ms'], current['median_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='field sizes (players)')
+    parser.add_argument('--repeat', type=int, default=7, help='samples per case')
+    parser.add_argument('--min-sample-ms', type=float, default=5.0)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--only', nargs='+', help='run only cases whose name contains one of these')
+    parser.add_argument('--save', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against results saved earlier with --save')
+    parser.add_argument('--threshold', type=float, default=0.25, help='slowdown reported as a regression (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.min_sample_ms, args.seed, args.only)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    sizes = [str(players) for players in args.sizes]
+    print(f"median ms per call ({args.repeat} samples){'; vs baseline in brackets' if baseline else ''}")
+    print(f"  {'case':20s}" + ''.join(f'{size + " players":>22s}' for size in sizes))
+    for name, by_size in results.items():
+        line = f"  {name:20s}"
+        for size in sizes:
+            current = by_size[size]['median_ms']
+            previous = (baseline or {}).get('results', {}).get(name, {}).get(size)
+            change = f" ({current / previous['median_ms'] - 1:+.0%})" if previous else ''
+            line += f"{f'{current:.3f}{change}':>22s}"
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'seed': args.seed,
+                       'repeat': args.repeat, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for name, size, previous, current in regressions:
+                print(f"  {name} at {size} players: {previous:.3f} -> {current:.3f} ms")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark rendering the tournament leaderboards for a large field.
+
+Compares the two ways of producing the four boards for the same ranked rows:
+the template computing nine-hole subtotals, thru and net scores per row (as
+view_tournament.html used to), and the leaderboard view-model computed in
+Python with a template that only iterates. Also times the full tournament page
+on a synthetic database.
+
+    python benchmarks/bench_render.py --players 200 --repeat 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the repository root to the Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+import awards
+import leaderboard
+from bench_analytics import build_database
+from scoring import HOLE_COLUMNS
+
+NINE = '{% if score.hole1 %}{{ ' + ' + '.join(f'(score.{c} or 0)' for c in HOLE_COLUMNS[:9]) + ' }}{% else %}-{% endif %}'
+BACK = '{% if score.hole10 %}{{ ' + ' + '.join(f'(score.{c} or 0)' for c in HOLE_COLUMNS[9:]) + ' }}{% else %}-{% endif %}'
+
+# The board markup as it was with the arithmetic in the template
+TEMPLATE_ARITHMETIC = '''
+{% for gender, scores in gross.items() %}<table>
+{% for score in scores %}<tr><td>{{ loop.index }}</td><td>{{ score.name }}</td>
+<td>{{ 'F' if score.holes_completed == 18 else (score.holes_completed or 0) }}</td>
+<td>''' + NINE + '''</td><td>''' + BACK + '''</td><td>{{ score.total_score or '-' }}</td></tr>
+{% endfor %}</table>{% endfor %}
+{% for gender, scores in net.items() %}<table>
+{% set calculated_net_scores = [] %}
+{% for score in scores %}{% if score.total_score is not none and score.handicap is not none %}
+{% set _ = calculated_net_scores.append((score, (score.total_score - score.handicap)|int)) %}{% endif %}{% endfor %}
+{% for score, net_score in calculated_net_scores %}<tr><td>{{ loop.index }}</td><td>{{ score.name }}</td>
+<td>{{ 'F' if score.holes_completed == 18 else (score.holes_completed or 0) }}</td>
+<td>''' + NINE + '''</td><td>''' + BACK + '''</td><td>{{ score.total_score }}</td>
+<td>{{ score.handicap|int }}</td><td>{{ net_score }}</td></tr>
+{% endfor %}</table>{% endfor %}
+'''
+
+# The same markup iterating the precomputed view-model
+TEMPLATE_VIEW_MODEL = '''
+{% for gender, rows in boards.gross.items() %}<table>
+{% for row in rows %}<tr><td>{{ row.position }}</td><td>{{ row.name }}</td><td>{{ row.thru }}</td>
+<td>{{ row.front }}</td><td>{{ row.back }}</td><td>{{ row.total_score or '-' }}</td></tr>
+{% endfor %}</table>{% endfor %}
+{% for gender, rows in boards.net.items() %}<table>
+{% for row in rows %}<tr><td>{{ row.position }}</td><td>{{ row.name }}</td><td>{{ row.thru }}</td>
+<td>{{ row.front }}</td><td>{{ row.back }}</td><td>{{ row.total_score }}</td>
+<td>{{ row.handicap }}</td><td>{{ row.net_score }}</td></tr>
+{% endfor %}</table>{% endfor %}
+'''
+
+
+def synthetic_boards(players, seed):
+    """Ranked gross and net boards per gender for a field of complete scorecards."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(players):
+        holes = [max(1, int(rng.gauss(4.9, 1.1))) for _ in range(18)]
+        row = dict(zip(HOLE_COLUMNS, holes))
+        row.update(id=i + 1, member_id=i + 1, name=f'Player {i}', gender='Male' if rng.random() < 0.75 else 'Female',
+                   total_score=sum(holes), handicap=float(rng.randint(0, 36)), holes_completed=18, stableford_points=None)
+        rows.append(row)
+    gross = {gender: sorted((r for r in rows if r['gender'] == gender), key=lambda r: (r['total_score'], r['id']))
+             for gender in ('Male', 'Female')}
+    net = {gender: sorted(scores, key=lambda r: (awards.net_score(r), r['id'])) for gender, scores in gross.items()}
+    return gross, net
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    gross, net = synthetic_boards(args.players, args.seed)
+    arithmetic = app.app.jinja_env.from_string(TEMPLATE_ARITHMETIC)
+    view_model = app.app.jinja_env.from_string(TEMPLATE_VIEW_MODEL)
+
+    def render_arithmetic():
+        return arithmetic.render(gross=gross, net=net)
+
+    def render_view_model():
+        return view_model.render(boards=leaderboard.build(gross, net, {}, {}))
+
+    build_ms = time_call(lambda: leaderboard.build(gross, net, {}, {}), args.repeat)
+    arithmetic_ms = time_call(render_arithmetic, args.repeat)
+    view_model_ms = time_call(render_view_model, args.repeat)
+    print(f"{args.players} players, 4 boards, mean of {args.repeat} renders:")
+    print(f"  template arithmetic:        {arithmetic_ms:8.2f} ms")
+    print(f"  view-model build + render:  {view_model_ms:8.2f} ms  (build alone {build_ms:.2f} ms)")
+    print(f"  speedup: {arithmetic_ms / view_model_ms:.2f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_database(os.path.join(tmp, 'bench.db'), 1, args.players, args.seed)
+        conn = app.get_db_connection()
+        conn.execute('UPDATE tournaments SET finalized = 0')
+        conn.execute('UPDATE tournament_scores SET holes_completed = 18, net_handicap = (SELECT handicap FROM members WHERE id = member_id)')
+        conn.execute('UPDATE members SET tournaments_played = 5')
+        conn.commit()
+        conn.close()
+        client = app.app.test_client()
+        client.get('/tournament/1')
+        page_ms = time_call(lambda: client.get('/tournament/1'), max(1, args.repeat // 5))
+    print(f"  full tournament page:       {page_ms:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
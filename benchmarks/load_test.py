@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Load-test a simulated tournament day against the real routes.
+
+Builds a temporary database with a live tournament and a field split into
+groups of four, serves the app in-process on a local port (werkzeug's threaded
+server, no outside services) and drives it over HTTP:
+
+    - one scorer per group enters the card hole by hole: POST
+      /score/<token>/hole/<n>, then GET the next hole's page, pausing
+      --hole-interval seconds (with jitter) between holes,
+    - --spectators clients poll the tournament page (view_tournament) every
+      --poll-interval seconds,
+    - once every group has finished, the tournament is finalized.
+
+Reports requests, error rate and p50/p95/p99 latency per route, and the write
+lock contention each route saw (transactions.metrics). Run it before and after
+a change with the same arguments and seed, and compare the tables (or the
+--json output).
+
+    python benchmarks/load_test.py --groups 36 --spectators 200 --hole-interval 2
+"""
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+
+# Add the repository root to the Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+
+import app
+import transactions
+
+TOURNAMENT_ID = 1
+
+# Client route label -> Flask endpoint, for matching the lock metrics
+ROUTES = {
+    'hole POST': 'secure_group_score_entry_by_hole',
+    'hole page': 'secure_group_score_entry_by_hole',
+    'tournament page': 'view_tournament',
+    'finalize': 'finalize_tournament',
+}
+
+
+def prepare(path, groups, seed):
+    """A live tournament with groups * 4 members, each group with a scoring link."""
+    rng = random.Random(seed)
+    app.DATABASE = path
+    app.init_db()
+    conn = app.get_db_connection()
+    players = groups * 4
+    conn.executemany(
+        'INSERT INTO members (name, handicap, gender, tournaments_played) VALUES (?, ?, ?, 5)',
+        [(f'Player {i}', rng.randint(0, 36), 'Male' if rng.random() < 0.75 else 'Female') for i in range(1, players + 1)]
+    )
+    conn.execute("INSERT INTO tournaments (id, name, date, finalized) VALUES (?, 'Load test', ?, 0)",
+                 (TOURNAMENT_ID, time.strftime('%Y-%m-%d')))
+    tokens = []
+    for number in range(1, groups + 1):
+        token = str(uuid.UUID(int=rng.getrandbits(128)))
+        group_id = conn.execute(
+            'INSERT INTO groups (tournament_id, name, tee_time, secure_token) VALUES (?, ?, ?, ?)',
+            (TOURNAMENT_ID, f'Group {number}', f'{7 + (number - 1) // 6:02d}:{(number - 1) % 6 * 10:02d}', token)
+        ).lastrowid
+        member_ids = list(range((number - 1) * 4 + 1, number * 4 + 1))
+        conn.executemany(
+            'INSERT INTO group_members (group_id, member_id, tournament_id) VALUES (?, ?, ?)',
+            [(group_id, member_id, TOURNAMENT_ID) for member_id in member_ids]
+        )
+        tokens.append((token, member_ids))
+    conn.commit()
+    conn.close()
+    app.create_app(path)
+    return tokens
+
+
+class Recorder:
+    """Latencies and errors per route label, shared by all client threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def request(self, connection, label, method, path, body=None):
+        """Send one request on a keep-alive connection; errors are counted, not raised."""
+        headers = {'Accept-Encoding': 'gzip'}
+        if body is not None:
+            body = urllib.parse.urlencode(body, doseq=True)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        started = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            failed = response.status >= 400
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            failed = True
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.latencies.setdefault(label, []).append(elapsed)
+            self.errors[label] = self.errors.get(label, 0) + failed
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def scorer(port, recorder, token, member_ids, hole_interval, seed):
+    """Enter a group's card hole by hole, as the scoring link page does."""
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    # Groups tee off over the first hole interval
+    time.sleep(rng.uniform(0, hole_interval))
+    for hole in range(1, 19):
+        scores = [max(1, int(rng.gauss(4.9, 1.1))) for _ in member_ids]
+        recorder.request(connection, 'hole POST', 'POST', f'/score/{token}/hole/{hole}', {
+            'member_ids': member_ids, 'scores': scores, 'action': 'next' if hole < 18 else 'finish',
+        })
+        if hole < 18:
+            recorder.request(connection, 'hole page', 'GET', f'/score/{token}/hole/{hole + 1}')
+            time.sleep(hole_interval * rng.uniform(0.5, 1.5))
+    connection.close()
+
+
+def spectator(port, recorder, poll_interval, stop, seed):
+    """Reload the tournament page until play is over."""
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    stop.wait(rng.uniform(0, poll_interval))
+    while not stop.is_set():
+        recorder.request(connection, 'tournament page', 'GET', f'/tournament/{TOURNAMENT_ID}')
+        stop.wait(poll_interval * rng.uniform(0.5, 1.5))
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--groups', type=int, default=36)
+    parser.add_argument('--spectators', type=int, default=200)
+    parser.add_argument('--hole-interval', type=float, default=2.0, help='seconds between a group\'s holes')
+    parser.add_argument('--poll-interval', type=float, default=10.0, help='seconds between a spectator\'s reloads')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tokens = prepare(os.path.join(tmp, 'load.db'), args.groups, args.seed)
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_port
+        transactions.metrics.reset()
+        recorder = Recorder()
+        stop = threading.Event()
+
+        print(f"{args.groups} groups ({args.groups * 4} players) scoring every ~{args.hole_interval:g}s, "
+              f"{args.spectators} spectators polling every ~{args.poll_interval:g}s")
+        started = time.perf_counter()
+        scorers = [threading.Thread(target=scorer, args=(port, recorder, token, member_ids, args.hole_interval,
+                                                          args.seed + number))
+                   for number, (token, member_ids) in enumerate(tokens)]
+        spectators = [threading.Thread(target=spectator, args=(port, recorder, args.poll_interval, stop,
+                                                                args.seed * 1000 + number))
+                      for number in range(args.spectators)]
+        # The app prints progress on writes and finalize; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in scorers + spectators:
+                thread.start()
+            for thread in scorers:
+                thread.join()
+            stop.set()
+            for thread in spectators:
+                thread.join()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+            recorder.request(connection, 'finalize', 'GET', f'/finalize_tournament/{TOURNAMENT_ID}')
+            connection.close()
+        duration = time.perf_counter() - started
+        server.shutdown()
+
+        conn = app.get_db_connection()
+        complete = conn.execute(
+            'SELECT COUNT(*) FROM tournament_scores WHERE tournament_id = ? AND holes_completed = 18', (TOURNAMENT_ID,)
+        ).fetchone()[0]
+        finalized = conn.execute('SELECT finalized FROM tournaments WHERE id = ?', (TOURNAMENT_ID,)).fetchone()[0]
+        conn.close()
+
+    lock_metrics = transactions.metrics.snapshot()
+    results = {}
+    for label, latencies in recorder.latencies.items():
+        latencies.sort()
+        # Lock counters are per endpoint; only the route that writes is credited with them
+        locks = lock_metrics.get(ROUTES[label], {}) if label != 'hole page' else {}
+        results[label] = {
+            'requests': len(latencies),
+            'errors': recorder.errors[label],
+            'error_rate': recorder.errors[label] / len(latencies),
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'lock_waits': locks.get('contended', 0),
+            'lock_retries': locks.get('retries', 0),
+            'lock_wait_ms': locks.get('wait_seconds', 0) * 1000,
+            'lock_failures': locks.get('failures', 0),
+        }
+    total = sum(route['requests'] for route in results.values())
+
+    print(f"{total} requests in {duration:.1f}s ({total / duration:.1f} req/s); "
+          f"{complete}/{args.groups * 4} cards complete, {'finalized' if finalized else 'NOT finalized'}")
+    print(f"\n  {'route':16s} {'requests':>8s} {'errors':>7s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}"
+          f" {'lock waits':>10s} {'retries':>8s} {'waited ms':>10s}")
+    for label in ROUTES:
+        if label not in results:
+            continue
+        route = results[label]
+        print(f"  {label:16s} {route['requests']:8d} {route['error_rate']:6.1%} {route['p50_ms']:8.1f}"
+              f" {route['p95_ms']:8.1f} {route['p99_ms']:8.1f} {route['lock_waits']:10d} {route['lock_retries']:8d}"
+              f" {route['lock_wait_ms']:10.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'arguments': vars(args), 'duration_seconds': duration, 'cards_complete': complete,
+                       'finalized': bool(finalized), 'routes': results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Build the fingerprinted CSS/JS bundles served from /assets.
+
+Minifies every stylesheet and script under static/, writes content-hashed copies
+with pre-compressed .gz (and .br when brotli is installed) siblings to
+static/dist/, and updates static/dist/manifest.json, which asset_url() reads at
+render time. Run it on deploy and whenever a file under static/ changes.
+
+    python build_assets.py
+"""
+import os
+import sys
+
+# Add the current directory to Python path to import assets.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import assets
+
+
+def main():
+    manifest = assets.build()
+    for name, hashed in sorted(manifest.items()):
+        source = os.path.getsize(os.path.join(assets.STATIC_DIR, name))
+        built = os.path.join(assets.DIST_DIR, hashed)
+        print(f"  {name} -> {hashed} ({source} -> {os.path.getsize(built)} bytes, gzip {os.path.getsize(built + '.gz')})")
+    compressed = 'gzip and brotli' if assets.brotli is not None else 'gzip'
+    print(f"✅ Built {len(manifest)} assets ({compressed}) into {os.path.relpath(assets.DIST_DIR)}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Check that the finalize preview shows exactly what finalizing then writes.
+
+Each unfinalized tournament (or --tournament) is previewed and then really
+finalized on a scratch copy of the database, once per handicap engine (the
+season's engine is switched on the copy). The preview's handicap adjustments
+are compared with the handicap_adjustment_log the finalize wrote, and its gross
+winners with the members finalize marked. The database itself is never written.
+
+    python check_finalize_preview.py
+    python check_finalize_preview.py --database scale.db --tournament 400 --engine whs
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+# Add the current directory to Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app
+import whs
+
+
+def finalized_adjustments(conn, tournament_id):
+    """The adjustment log finalize wrote, in the preview's entry format."""
+    rows = conn.execute('''
+        SELECT l.member_id, m.name, l.old_handicap, l.new_handicap, l.adjustment, l.reason
+        FROM handicap_adjustment_log l
+        JOIN members m ON m.id = l.member_id
+        WHERE l.tournament_id = ? AND l.source = 'finalize'
+    ''', (tournament_id,)).fetchall()
+    return [{'member_id': row['member_id'], 'name': row['name'], 'old': row['old_handicap'], 'new': row['new_handicap'],
+             'adjustment': row['adjustment'], 'reason': row['reason']} for row in rows]
+
+
+def check(source, tournament_id, engine):
+    """Preview and finalize one tournament on a copy of source; returns the differences found."""
+    scratch = tempfile.mkdtemp()
+    try:
+        path = os.path.join(scratch, 'check.db')
+        # The backup API copies a consistent snapshot even while the app is writing
+        with contextlib.closing(sqlite3.connect(source)) as src, contextlib.closing(sqlite3.connect(path)) as dst:
+            src.backup(dst)
+        client = app.app.test_client()
+        # The app prints as it migrates and finalizes
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.create_app(path)
+            conn = app.get_db_connection()
+            with app.write_transaction(conn):
+                year = str(conn.execute('SELECT date FROM tournaments WHERE id = ?', (tournament_id,)).fetchone()['date'])[:4]
+                conn.execute('INSERT INTO seasons (year, handicap_engine) VALUES (?, ?) '
+                             'ON CONFLICT(year) DO UPDATE SET handicap_engine = excluded.handicap_engine', (year, engine))
+            preview = client.get(f'/tournament/{tournament_id}/finalize_preview.json').get_json()
+            client.get(f'/finalize_tournament/{tournament_id}')
+
+        differences = []
+        key = lambda entry: (entry['member_id'], entry['reason'])
+        expected = sorted(preview['adjustments'], key=key)
+        written = sorted(finalized_adjustments(conn, tournament_id), key=key)
+        if expected != written:
+            previewed = {key(entry): entry for entry in expected}
+            logged = {key(entry): entry for entry in written}
+            for entry_key in sorted(set(previewed) | set(logged)):
+                if previewed.get(entry_key) != logged.get(entry_key):
+                    differences.append(f"adjustment {entry_key}: preview {previewed.get(entry_key)}, finalize {logged.get(entry_key)}")
+        winners = {row['gender']: row['name'] for row in conn.execute('''
+            SELECT m.gender, m.name FROM tournament_results r JOIN members m ON m.id = r.member_id
+            WHERE r.tournament_id = ? AND r.gross_win_before = 0 AND r.gross_win_after = 1
+        ''', (tournament_id,))}
+        if winners != preview['gross_winners']:
+            differences.append(f"gross winners: preview {preview['gross_winners']}, finalize {winners}")
+        conn.close()
+        return len(expected), differences
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=app.DATABASE, help='SQLite database file (default: %(default)s)')
+    parser.add_argument('--tournament', type=int, action='append',
+                        help='tournament to check (repeatable; default: every unfinalized tournament)')
+    parser.add_argument('--engine', choices=whs.ENGINES, action='append',
+                        help='handicap engine to finalize with (repeatable; default: all of them)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        print(f"Database file {args.database} not found. Please run the main application first.")
+        return 1
+    with contextlib.closing(sqlite3.connect(args.database)) as conn:
+        tournament_ids = args.tournament or [row[0] for row in conn.execute(
+            'SELECT id FROM tournaments WHERE finalized = 0 ORDER BY date, id')]
+    if not tournament_ids:
+        print("No unfinalized tournaments to check.")
+        return 0
+
+    failures = 0
+    for tournament_id in tournament_ids:
+        for engine in args.engine or whs.ENGINES:
+            count, differences = check(args.database, tournament_id, engine)
+            if differences:
+                failures += 1
+                print(f"❌ Tournament {tournament_id} ({engine}): preview and finalize differ")
+                for difference in differences:
+                    print(f"   {difference}")
+            else:
+                print(f"✅ Tournament {tournament_id} ({engine}): {count} adjustments match")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""WSGI middleware compressing text responses.
+
+Rendered pages (a large tournament page is several hundred KB of repetitive
+table markup) and JSON endpoints are sent gzip- or brotli-encoded when the
+client accepts it. The encoding is chosen from Accept-Encoding (brotli first
+when the brotli package is installed) and the body is compressed chunk by chunk
+as the application yields it, so streamed responses stay streamed.
+
+Responses are left alone when they are:
+    - not text (HTML, CSS, JavaScript, JSON, CSV, plain text, SVG, XML),
+    - smaller than minimum_size (when the length is known up front),
+    - already encoded, such as the pre-compressed builds served from /assets,
+    - partial (206), bodyless (HEAD, 204, 304) or marked Cache-Control: no-transform.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+)
+
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+
+def accepted_encodings(header):
+    """{coding: q} from an Accept-Encoding header, dropping codings refused with q=0."""
+    encodings = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            encodings[coding] = q
+    return encodings
+
+
+class GzipCompressor:
+    """Streaming gzip (RFC 1952) encoder."""
+    encoding = 'gzip'
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    """Streaming brotli encoder (needs the optional brotli package)."""
+    encoding = 'br'
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """Wrap a WSGI application so its text responses are compressed.
+
+        app.wsgi_app = CompressionMiddleware(app.wsgi_app, minimum_size=1024, gzip_level=6)
+
+    gzip_level is zlib's 1-9 and brotli_quality brotli's 0-11; the defaults trade a
+    little ratio for much less CPU than the maximum settings, which suits pages
+    rendered per request (static builds are compressed at maximum ahead of time).
+    """
+
+    def __init__(self, app, minimum_size=DEFAULT_MINIMUM_SIZE, gzip_level=DEFAULT_GZIP_LEVEL,
+                 brotli_quality=DEFAULT_BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_compressor(self, accept_encoding):
+        """A new compressor for the best encoding the client accepts, or None."""
+        encodings = accepted_encodings(accept_encoding)
+        if brotli is not None and encodings.get('br', 0) >= encodings.get('gzip', 0) and 'br' in encodings:
+            return BrotliCompressor(self.brotli_quality)
+        if 'gzip' in encodings:
+            return GzipCompressor(self.gzip_level)
+        return None
+
+    def should_compress(self, status, headers):
+        """Whether a response with this status and headers is worth compressing for any client."""
+        if status[:3] in ('204', '206', '304'):
+            return False
+        content_type = headers.get('content-type', '').lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        if headers.get('content-encoding', 'identity').lower() != 'identity':
+            return False
+        if 'no-transform' in headers.get('cache-control', '').lower():
+            return False
+        length = headers.get('content-length')
+        if length is not None and length.isdigit() and int(length) < self.minimum_size:
+            return False
+        return True
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+        accept_encoding = environ.get('HTTP_ACCEPT_ENCODING', '')
+        state = {'started': False, 'compressor': None}
+
+        def compressing_start_response(status, response_headers, exc_info=None):
+            state['started'] = True
+            headers = {name.lower(): value for name, value in response_headers}
+            if not self.should_compress(status, headers):
+                return start_response(status, response_headers, exc_info)
+            vary = headers.get('vary', '')
+            if 'accept-encoding' not in vary.lower() and vary != '*':
+                response_headers = [(n, v) for n, v in response_headers if n.lower() != 'vary']
+                response_headers.append(('Vary', f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'))
+            compressor = self.choose_compressor(accept_encoding)
+            if compressor is None:
+                return start_response(status, response_headers, exc_info)
+            state['compressor'] = compressor
+            # The compressed length is unknown until the body is done, and a strong
+            # ETag no longer matches the bytes sent
+            response_headers = [(n, v) for n, v in response_headers if n.lower() != 'content-length']
+            response_headers = [(n, f'W/{v}' if n.lower() == 'etag' and not v.startswith('W/') else v)
+                                for n, v in response_headers]
+            response_headers.append(('Content-Encoding', compressor.encoding))
+            write = start_response(status, response_headers, exc_info)
+            return lambda data: write(compressor.compress(data))
+
+        app_iter = self.app(environ, compressing_start_response)
+        if state['started'] and state['compressor'] is None:
+            # Passed through untouched (keeps wsgi.file_wrapper for static files)
+            return app_iter
+        return self.compress_body(app_iter, state)
+
+    @staticmethod
+    def compress_body(app_iter, state):
+        """Yield the body compressed chunk by chunk. The compressor is looked up per
+        chunk because an application may call start_response on its first iteration."""
+        try:
+            for chunk in app_iter:
+                compressor = state['compressor']
+                if compressor is None:
+                    yield chunk
+                    continue
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+            if state['compressor'] is not None:
+                yield state['compressor'].flush()
+        finally:
+            close = getattr(app_iter, 'close', None)
+            if close is not None:
+                close()
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Generate a synthetic club history for scale testing.
+
+Creates a new database with --years seasons of --tournaments-per-year
+tournaments, each played by a --players field drawn from --members members:
+
+    - members with realistic handicaps (men around 16, women around 24) and a
+      75/25 gender split; handicaps drift from season to season,
+    - courses with pars, stroke indexes and ratings,
+    - per tournament: groups of four with tee times and scoring links, hole by
+      hole scorecards (with Stableford points, birdies and eagles), the default
+      honor types with Long Drive/KP/Eagle winners, and the field's signups,
+    - every tournament but the last finalized; the last one is in progress, each
+      group part way round.
+
+The bulk load uses executemany in one transaction per season. Final standings
+(tournament_results, season order of merit, member_stats) are then written the
+way finalize writes them, tournament by tournament in date order, and the
+pages of the latest --snapshots finalized tournaments are rendered and stored.
+Handicap adjustments are not replayed (run replay_handicaps.py for that).
+
+The same arguments and --seed always produce the same database.
+
+    python generate_dataset.py scale.db --years 10 --tournaments-per-year 40 --players 200
+    python generate_dataset.py million.db --years 10 --tournaments-per-year 100 --players 1000 --members 1500 --no-results
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Add the current directory to Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app
+import member_stats
+from scoring import HOLE_COLUMNS, score_field
+
+FIRST_NAMES = {
+    'Male': ('James', 'John', 'Robert', 'Michael', 'David', 'William', 'Richard', 'Thomas', 'Daniel', 'Paul',
+             'Mark', 'Steven', 'Andrew', 'Kevin', 'Brian', 'George', 'Edward', 'Peter', 'Hiroshi', 'Wei',
+             'Carlos', 'Luis', 'Ahmed', 'Raj', 'Sean', 'Liam', 'Noah', 'Oliver', 'Lucas', 'Mateo'),
+    'Female': ('Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth', 'Susan', 'Jessica', 'Sarah', 'Karen', 'Nancy',
+               'Lisa', 'Margaret', 'Sandra', 'Ashley', 'Emily', 'Donna', 'Michelle', 'Yuki', 'Mei', 'Sofia',
+               'Isabel', 'Priya', 'Aisha', 'Olivia', 'Emma', 'Chloe'),
+}
+LAST_NAMES = ('Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+              'Wilson', 'Anderson', 'Taylor', 'Thomas', 'Moore', 'Jackson', 'Martin', 'Lee', 'Thompson', 'White',
+              'Harris', 'Clark', 'Lewis', 'Robinson', 'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott',
+              'Nguyen', 'Tanaka', 'Chen', 'Patel', 'Kim', 'Murphy', "O'Brien", 'Kelly', 'Rossi', 'Muller')
+EVENT_NAMES = ('Monthly Medal', 'Stableford', 'Club Championship', 'Captain\'s Day', 'Spring Cup', 'Summer Open',
+               'Autumn Trophy', 'Winter Series', 'Charity Day', 'President\'s Prize')
+
+# Season of the last tournament unless --end-year is given; fixed rather than the
+# current year so the same arguments and seed give the same database in any year
+DEFAULT_END_YEAR = 2025
+
+# The honor types tournament_honors creates for every tournament
+HONOR_TYPES = ['Long Drive', 'KP 1', 'KP 2', 'KP 3', 'KP 4', 'KP 5', 'KP 6', 'Eagle']
+
+# (name, course rating, slope, pars); stroke indexes are drawn per course
+COURSES = [
+    ('Lakeside', 72.1, 128, (4, 4, 3, 5, 4, 4, 3, 4, 5, 4, 3, 4, 5, 4, 4, 3, 4, 5)),
+    ('Hillcrest', 70.4, 121, (4, 3, 4, 4, 5, 4, 3, 4, 4, 5, 4, 3, 4, 4, 4, 3, 5, 4)),
+    ('Old Course', 73.6, 135, (5, 4, 4, 3, 4, 4, 5, 3, 4, 4, 4, 3, 5, 4, 4, 3, 4, 5)),
+]
+
+SCORE_COLUMNS = ['tournament_id', 'member_id'] + HOLE_COLUMNS + [
+    'total_score', 'net_handicap', 'holes_completed', 'last_hole_played', 'stableford_points', 'birdies', 'eagles'
+]
+
+
+def generate_members(rng, count):
+    """(name, handicap, gender) tuples."""
+    members = []
+    for _ in range(count):
+        gender = 'Male' if rng.random() < 0.75 else 'Female'
+        mean = 16 if gender == 'Male' else 24
+        handicap = int(min(36, max(0, round(rng.gauss(mean, 7)))))
+        members.append((f'{rng.choice(FIRST_NAMES[gender])} {rng.choice(LAST_NAMES)}', handicap, gender))
+    return members
+
+
+def insert_courses(conn, rng):
+    """Insert COURSES; returns [(course_id, pars, stroke_index)]."""
+    layouts = []
+    for name, course_rating, slope_rating, pars in COURSES:
+        course_id = conn.execute(
+            'INSERT INTO courses (name, course_rating, slope_rating) VALUES (?, ?, ?)', (name, course_rating, slope_rating)
+        ).lastrowid
+        # Odd stroke indexes on the front nine and even on the back, as most cards have
+        stroke_index = rng.sample(range(1, 19, 2), 9) + rng.sample(range(2, 19, 2), 9)
+        app.save_course_holes(conn, course_id, [(hole, par, si) for hole, par, si in zip(range(1, 19), pars, stroke_index)])
+        layouts.append((course_id, np.array(pars), np.array(stroke_index)))
+    return layouts
+
+
+def play_round(nprng, handicaps, pars, holes_played):
+    """(players x 18) strokes; NaN after each player's holes_played."""
+    handicaps = np.asarray(handicaps, dtype=float)
+    over_par = handicaps[:, None] / 18 * 0.95 + 0.15 + nprng.normal(0, 0.85 + handicaps[:, None] / 60, (len(handicaps), 18))
+    strokes = np.clip(np.rint(pars[None, :] + over_par), 1, pars[None, :] + 5)
+    strokes[np.arange(18)[None, :] >= np.asarray(holes_played)[:, None]] = np.nan
+    return strokes
+
+
+def load_tournament(conn, rng, nprng, tournament, field, handicaps, layout, live):
+    """Insert one tournament's groups, scorecards, honors and signups; returns the score row count."""
+    tournament_id, played_on = tournament['id'], tournament['date']
+    course_id, pars, stroke_index = layout
+    member_ids = [member_id for member_id, _, _ in field]
+    players = len(member_ids)
+
+    # Groups of four in a random draw, teeing off every 10 minutes from 07:00
+    group_sizes = [min(4, players - start) for start in range(0, players, 4)]
+    group_of = []
+    group_rows = []
+    for number, size in enumerate(group_sizes, 1):
+        minutes = 7 * 60 + (number - 1) * 10
+        group_rows.append((tournament_id, f'Group {number}', str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                           f'{minutes // 60 % 24:02d}:{minutes % 60:02d}'))
+        group_of += [number - 1] * size
+    first_group_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM groups').fetchone()[0]
+    conn.executemany('INSERT INTO groups (tournament_id, name, secure_token, tee_time) VALUES (?, ?, ?, ?)', group_rows)
+    conn.executemany(
+        'INSERT INTO group_members (group_id, member_id, tournament_id) VALUES (?, ?, ?)',
+        [(first_group_id + group, member_id, tournament_id) for group, member_id in zip(group_of, member_ids)]
+    )
+
+    # A live round has each group part way round; a finalized one is complete
+    if live:
+        progress = nprng.integers(0, 19, len(group_sizes))
+        holes_played = progress[group_of]
+    else:
+        holes_played = np.full(players, 18)
+    net_handicaps = [handicaps[member_id] for member_id in member_ids]
+    holes = play_round(nprng, net_handicaps, pars, holes_played)
+    scored = score_field(holes, net_handicaps, pars, stroke_index)
+    totals = np.nansum(holes, axis=1).astype(int).tolist()
+    cards = np.where(np.isnan(holes), 0, holes).astype(int).tolist()
+    played = holes_played.tolist()
+    if live:
+        cards = [[strokes if hole < done else None for hole, strokes in enumerate(card)] for card, done in zip(cards, played)]
+    rows = [
+        (tournament_id, member_id, *card,
+         total if done else None, net_handicap, done, done or None, points, birdies, eagles)
+        for member_id, card, total, net_handicap, done, points, birdies, eagles in zip(
+            member_ids, cards, totals, net_handicaps, played, scored['stableford_points'].tolist(),
+            scored['birdie_count'].tolist(), scored['eagle_count'].tolist())
+    ]
+    conn.executemany(
+        f"INSERT INTO tournament_scores ({', '.join(SCORE_COLUMNS)}) VALUES ({', '.join('?' for _ in SCORE_COLUMNS)})",
+        rows
+    )
+
+    conn.executemany(
+        'INSERT INTO tournament_honor_types (tournament_id, original_honor_type, custom_name, display_order) VALUES (?, ?, ?, ?)',
+        [(tournament_id, honor_type, honor_type, order) for order, honor_type in enumerate(HONOR_TYPES)]
+    )
+    if not live:
+        eagles = scored['eagle_count']
+        honors = []
+        for gender in ('Male', 'Female'):
+            candidates = [i for i, (_, _, member_gender) in enumerate(field) if member_gender == gender]
+            if not candidates:
+                continue
+            for honor_type in HONOR_TYPES[:-1]:
+                winner = rng.choice(candidates)
+                honors.append((tournament_id, member_ids[winner], f'{honor_type} {gender}', honor_type, rng.randint(1, 3)))
+            eagle_makers = [i for i in candidates if eagles[i]]
+            if eagle_makers:
+                honors.append((tournament_id, member_ids[eagle_makers[0]], f'Eagle {gender}', 'Eagle', rng.randint(1, 3)))
+        conn.executemany(
+            'INSERT INTO honorable_mentions (tournament_id, member_id, honor_type, honor_type_name, balls_awarded) VALUES (?, ?, ?, ?, ?)',
+            honors
+        )
+
+    # Everyone in the field signed up in the fortnight before
+    day = datetime.fromisoformat(played_on)
+    signup_times = [(day - timedelta(minutes=minutes)).isoformat() for minutes in range(60, 14 * 24 * 60, 7)]
+    conn.executemany(
+        'INSERT INTO tournament_signups (tournament_id, name, need_powercart, notes, created_at) VALUES (?, ?, ?, ?, ?)',
+        [(tournament_id, name, powercart, None, signup_times[when]) for (_, name, _), powercart, when in zip(
+            field, (nprng.random(players) < 0.3).astype(int).tolist(), nprng.integers(0, len(signup_times), players).tolist())]
+    )
+    return len(rows)
+
+
+def load(conn, args, rng, nprng):
+    """Bulk-load members, courses and every tournament; returns (tournament rows, score count)."""
+    conn.execute('BEGIN IMMEDIATE')
+    members = generate_members(rng, args.members)
+    conn.executemany('INSERT INTO members (name, handicap, gender) VALUES (?, ?, ?)', members)
+    member_rows = [(member_id, name, gender) for member_id, (name, _, gender) in enumerate(members, 1)]
+    handicaps = {member_id: handicap for member_id, (_, handicap, _) in enumerate(members, 1)}
+    layouts = insert_courses(conn, rng)
+    conn.commit()
+
+    first_year = args.end_year - args.years + 1
+    total = args.years * args.tournaments_per_year
+    tournaments = []
+    scores = 0
+    for year in range(first_year, args.end_year + 1):
+        conn.execute('BEGIN IMMEDIATE')
+        # Handicaps drift by about a stroke and a half from one season to the next
+        if year != first_year:
+            handicaps = {member_id: int(min(36, max(0, handicap + round(rng.gauss(0, 1.5)))))
+                         for member_id, handicap in handicaps.items()}
+        for number in range(args.tournaments_per_year):
+            played_on = (date(year, 1, 1) + timedelta(days=number * 365 // args.tournaments_per_year)).isoformat()
+            live = len(tournaments) == total - 1
+            tournament_id = conn.execute(
+                'INSERT INTO tournaments (name, date, finalized, course_id, signup_token) VALUES (?, ?, ?, ?, ?)',
+                (f'{year} {EVENT_NAMES[number % len(EVENT_NAMES)]} {number // len(EVENT_NAMES) + 1}', played_on,
+                 0 if live else 1, layouts[number % len(layouts)][0], str(uuid.UUID(int=rng.getrandbits(128), version=4)))
+            ).lastrowid
+            tournament = {'id': tournament_id, 'date': played_on, 'live': live}
+            field = rng.sample(member_rows, min(args.players, len(member_rows)))
+            scores += load_tournament(conn, rng, nprng, tournament, field, handicaps,
+                                      layouts[number % len(layouts)], live)
+            tournaments.append(tournament)
+        conn.commit()
+        print(f"  {year}: {len(tournaments)} tournaments, {scores} scores")
+    return tournaments, scores
+
+
+def write_results(conn, tournaments):
+    """Finalize's bookkeeping for each finalized tournament in date order: tournaments
+    played and gross wins as they stood, stored results and season standings."""
+    gross_win = {}
+    for tournament in tournaments:
+        if tournament['live']:
+            continue
+        participants = [row[0] for row in conn.execute(
+            'SELECT member_id FROM tournament_scores WHERE tournament_id = ?', (tournament['id'],))]
+        with app.write_transaction(conn, 'generate_dataset'):
+            conn.executemany('UPDATE members SET tournaments_played = tournaments_played + 1 WHERE id = ?',
+                             [(member_id,) for member_id in participants])
+        results = app.save_tournament_results(tournament['id'], gross_win, update_stats=False)
+        winners = [member_id for member_id, result in results.items() if result['gross_win_after'] and not gross_win.get(member_id)]
+        gross_win.update({member_id: 1 for member_id in winners})
+        if winners:
+            with app.write_transaction(conn, 'generate_dataset'):
+                conn.executemany('UPDATE members SET gross_win = 1 WHERE id = ?', [(member_id,) for member_id in winners])
+    with app.write_transaction(conn, 'generate_dataset'):
+        member_stats.rebuild(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('database', help='SQLite database file to create')
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--tournaments-per-year', type=int, default=40)
+    parser.add_argument('--players', type=int, default=200, help='field size of each tournament')
+    parser.add_argument('--members', type=int, default=300)
+    parser.add_argument('--end-year', type=int, default=DEFAULT_END_YEAR, help='season of the last tournament')
+    parser.add_argument('--snapshots', type=int, default=40, help='render and store the pages of this many of the latest finalized tournaments')
+    parser.add_argument('--no-results', dest='results', action='store_false',
+                        help='skip final standings (and snapshots); the raw data loads much faster')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--force', action='store_true', help='replace the database file if it exists')
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        if not args.force:
+            print(f"Database file {args.database} already exists. Pass --force to replace it.")
+            return 1
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.database + suffix):
+                os.remove(args.database + suffix)
+
+    rng = random.Random(args.seed)
+    nprng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.create_app(args.database)
+
+    conn = app.get_db_connection()
+    conn.isolation_level = None
+    # Throwaway test data: skip the fsyncs
+    conn.execute('PRAGMA synchronous = OFF')
+    print(f"Generating {args.years} seasons x {args.tournaments_per_year} tournaments x {args.players} players "
+          f"from {args.members} members (seed {args.seed})")
+    try:
+        load_start = time.perf_counter()
+        tournaments, scores = load(conn, args, rng, nprng)
+        loaded = time.perf_counter()
+        print(f"Loaded {scores} scores in {loaded - load_start:.1f}s ({scores / (loaded - load_start):,.0f} rows/s)")
+        if args.results:
+            conn.isolation_level = ''
+            # The app prints as it saves results and renders pages
+            with contextlib.redirect_stdout(io.StringIO()):
+                write_results(conn, tournaments)
+            finished = time.perf_counter()
+            print(f"Wrote final standings in {finished - loaded:.1f}s")
+            finalized = [tournament['id'] for tournament in tournaments if not tournament['live']]
+            with contextlib.redirect_stdout(io.StringIO()):
+                for tournament_id in finalized[-args.snapshots:] if args.snapshots > 0 else []:
+                    app.save_tournament_snapshot(tournament_id)
+            print(f"Rendered {min(args.snapshots, len(finalized)) if args.snapshots > 0 else 0} snapshots "
+                  f"in {time.perf_counter() - finished:.1f}s")
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"✅ Generated {args.database}: {args.members} members, {len(tournaments)} tournaments, {scores} scores "
+          f"in {time.perf_counter() - start:.1f}s.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,418 @@
+"""Club handicap rules as pure functions, plus an in-memory replay of the whole history.
+
+The rules here are exactly what finalizing a tournament applies: the top three net
+finishers per gender get a position adjustment, and every eligible player with a
+net score under 72 gets a strokes adjustment on top. Nothing here touches the
+database, so the same code drives finalize, previews and season replays.
+"""
+from collections import namedtuple
+
+import awards
+from scoring import hole_matrix, leaderboard_order, order_rows
+import whs
+
+GENDERS = ('Male', 'Female')
+
+# Members need more than this many finalized tournaments to play for net prizes
+NET_ELIGIBILITY_TOURNAMENTS = 3
+
+NET_PAR = 72
+
+# What finalizing one tournament did: the adjustments log, WHS rounds posted
+# ({score id: (differential, index)}), gross winners by gender and the handicap
+# recorded on each top-three score row
+FinalizeResult = namedtuple('FinalizeResult', ['adjustments', 'posted', 'gross_winners', 'net_handicaps'])
+
+POSITION_ADJUSTMENTS = {
+    1: {"0-9": -1, "10-15": -2, "16-21": -3, "22-26": -4, "27-32": -5, "33-38": -6},
+    2: {"0-9": 0, "10-15": -1, "16-21": -2, "22-26": -3, "27-32": -4, "33-38": -5},
+    3: {"0-9": 0, "10-15": 0, "16-21": -1, "22-26": -2, "27-32": -3, "33-38": -4},
+}
+
+# Strokes under 72 (capped at 12) -> handicap reduction, by handicap range
+STROKES_ADJUSTMENTS = {
+    "0-9": {
+        1: 0, 2: 1, 3: 1, 4: 1, 5: 1, 6: 2,
+        7: 2, 8: 2, 9: 2, 10: 3, 11: 3, 12: 3
+    },
+    "10-15": {
+        1: 0, 2: 1, 3: 1, 4: 1, 5: 2, 6: 2,
+        7: 2, 8: 3, 9: 3, 10: 3, 11: 4, 12: 4
+    },
+    "16-21": {
+        1: 1, 2: 1, 3: 2, 4: 2, 5: 3, 6: 3,
+        7: 4, 8: 4, 9: 5, 10: 5, 11: 6, 12: 6
+    },
+    "22-26": {
+        1: 1, 2: 2, 3: 2, 4: 3, 5: 4, 6: 4,
+        7: 5, 8: 6, 9: 6, 10: 7, 11: 8, 12: 8
+    },
+    "27-32": {
+        1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6,
+        7: 7, 8: 8, 9: 9, 10: 10, 11: 11, 12: 12
+    }
+}
+
+
+def get_handicap_range(handicap):
+    """Get the handicap range string based on current handicap"""
+    if handicap <= 9:
+        return "0-9"
+    elif handicap <= 15:
+        return "10-15"
+    elif handicap <= 21:
+        return "16-21"
+    elif handicap <= 26:
+        return "22-26"
+    elif handicap <= 32:
+        return "27-32"
+    else:
+        return "33-38"
+
+
+def calculate_position_adjustment(current_handicap, position):
+    """
+    Calculate position-based handicap adjustment for top 3 finishers.
+
+    Args:
+        current_handicap: Current handicap of the player
+        position: 1 for 1st place, 2 for 2nd place, 3 for 3rd place
+
+    Returns:
+        handicap_adjustment: Negative number (decrease in handicap)
+    """
+    return POSITION_ADJUSTMENTS.get(position, {}).get(get_handicap_range(current_handicap), 0)
+
+
+def calculate_strokes_adjustment(current_handicap, strokes_under_72):
+    """
+    Calculate strokes-under-72 based handicap adjustment.
+
+    Args:
+        current_handicap: Current handicap of the player
+        strokes_under_72: Number of strokes under 72 (negative for over 72)
+
+    Returns:
+        handicap_adjustment: Negative number (decrease in handicap)
+    """
+    handicap_range = get_handicap_range(current_handicap)
+    # No strokes-based adjustment for 33-38, or for scores of 72 or higher
+    if handicap_range == "33-38" or strokes_under_72 <= 0:
+        return 0
+    # Cap strokes under at 12 for the lookup
+    return -STROKES_ADJUSTMENTS[handicap_range].get(min(strokes_under_72, 12), 0)
+
+
+def calculate_total_handicap_adjustment(current_handicap, strokes_under_72, position):
+    """
+    Calculate total handicap adjustment combining position and strokes under 72.
+
+    Args:
+        current_handicap: Current handicap of the player
+        strokes_under_72: Number of strokes under 72 (negative for over 72)
+        position: 1 for 1st place, 2 for 2nd place, 3 for 3rd place
+
+    Returns:
+        total_adjustment: Combined adjustment from both position and strokes
+    """
+    return calculate_position_adjustment(current_handicap, position) + calculate_strokes_adjustment(current_handicap, strokes_under_72)
+
+
+def _ordinal(position):
+    return f"{position}{'st' if position == 1 else 'nd' if position == 2 else 'rd'}"
+
+
+def _database_order(scores):
+    """Indexes in ORDER BY total_score, id order (NULL totals first, as SQLite sorts them)."""
+    return sorted(range(len(scores)), key=lambda i: (scores[i]['total_score'] is not None, scores[i]['total_score'] or 0, scores[i]['id']))
+
+
+def _ranked(scores, holes, indexes, handicap_field=None):
+    """Indexes in leaderboard order with countback; full ties keep their input order."""
+    if not indexes:
+        return []
+    handicaps = [scores[i][handicap_field] for i in indexes] if handicap_field else None
+    order = leaderboard_order([scores[i]['total_score'] for i in indexes], holes[indexes], handicaps)
+    return [indexes[j] for j in order]
+
+
+def gross_leaders(scores, holes=None, exclude_gross_winners=False):
+    """Member id of the gross leader per gender.
+
+    Finalize marks gross_win on the leader among members without a previous gross
+    win (exclude_gross_winners=True); the net boards exclude the overall leader.
+    """
+    holes = hole_matrix(scores) if holes is None else holes
+    indexes = _database_order(scores)
+    leaders = {}
+    for gender in GENDERS:
+        candidates = [i for i in indexes if scores[i]['gender'] == gender
+                      and not (exclude_gross_winners and scores[i]['gross_win'])]
+        ranked = _ranked(scores, holes, candidates)
+        if ranked:
+            leaders[gender] = scores[ranked[0]]['member_id']
+    return leaders
+
+
+def club_adjustments(scores, holes=None):
+    """Handicap changes the club rules make for one finalized tournament.
+
+    scores are score rows (or dicts) with id, member_id, name, gender, total_score,
+    handicap (the member's handicap when the tournament is finalized),
+    tournaments_played (already counting this tournament) and the hole columns.
+
+    Returns (new_handicaps, adjustments_log, net_handicaps): the final handicap per
+    adjusted member, log entries in the order they were made, and the handicap to
+    record on each top-three score row.
+    """
+    holes = hole_matrix(scores) if holes is None else holes
+    indexes = _database_order(scores)
+
+    # The overall gross leaders of THIS tournament are excluded from position adjustments
+    gross_winners = set(gross_leaders(scores, holes).values())
+
+    def eligible(i):
+        played = scores[i]['tournaments_played']
+        return (played if played is not None else 0) > NET_ELIGIBILITY_TOURNAMENTS
+
+    def has_net(i):
+        return scores[i]['total_score'] is not None and scores[i]['handicap'] is not None
+
+    new_handicaps = {}
+    net_handicaps = {}
+    adjustments_log = []
+
+    # Position-based adjustments for the top 3 on each net leaderboard
+    for gender in GENDERS:
+        candidates = [i for i in indexes if scores[i]['gender'] == gender and eligible(i)
+                      and scores[i]['member_id'] not in gross_winners and has_net(i)]
+        for position, i in enumerate(_ranked(scores, holes, candidates, 'handicap')[:3], 1):
+            score = scores[i]
+            original_handicap = score['handicap']
+            new_handicap = max(0, original_handicap + calculate_position_adjustment(original_handicap, position))
+            new_handicaps[score['member_id']] = new_handicap
+            net_handicaps[score['id']] = original_handicap
+            adjustments_log.append({
+                "member_id": score['member_id'],
+                "name": score['name'],
+                "old": original_handicap,
+                "new": new_handicap,
+                "adjustment": new_handicap - original_handicap,
+                "reason": f"Net {_ordinal(position)} place"
+            })
+
+    # Strokes-under-72 adjustments for every eligible player, gross winners included
+    for gender in GENDERS:
+        for i in indexes:
+            score = scores[i]
+            if score['gender'] != gender or not eligible(i) or not has_net(i):
+                continue
+            strokes_under_72 = NET_PAR - int(score['total_score'] - score['handicap'])
+            if strokes_under_72 <= 0:
+                continue
+            original_handicap = score['handicap']
+            strokes_adjustment = calculate_strokes_adjustment(original_handicap, strokes_under_72)
+            if strokes_adjustment == 0:
+                continue
+            # Applied on top of any position adjustment
+            current_handicap = new_handicaps.get(score['member_id'], original_handicap)
+            new_handicap = max(0, current_handicap + strokes_adjustment)
+            new_handicaps[score['member_id']] = new_handicap
+
+            # Log entries are matched by name, as the adjustments summary shows them
+            existing_log = next((log for log in adjustments_log if log['name'] == score['name']), None)
+            if existing_log:
+                existing_log['new'] = new_handicap
+                existing_log['adjustment'] = new_handicap - original_handicap
+                existing_log['reason'] = existing_log['reason'] + f" + {strokes_under_72} strokes under 72"
+            else:
+                adjustments_log.append({
+                    "member_id": score['member_id'],
+                    "name": score['name'],
+                    "old": original_handicap,
+                    "new": new_handicap,
+                    "adjustment": new_handicap - original_handicap,
+                    "reason": f"{strokes_under_72} strokes under 72"
+                })
+
+    return new_handicaps, adjustments_log, net_handicaps
+
+
+class MemberState:
+    """A member's handicap, finalized tournament count, gross win flag and WHS record."""
+
+    __slots__ = ('member_id', 'name', 'gender', 'handicap', 'tournaments_played', 'gross_win', 'whs_record')
+
+    def __init__(self, member_id, name, gender, handicap, tournaments_played=0, gross_win=False):
+        self.member_id = member_id
+        self.name = name
+        self.gender = gender
+        self.handicap = handicap
+        self.tournaments_played = tournaments_played
+        self.gross_win = gross_win
+        self.whs_record = whs.HandicapRecord()
+
+
+def replay_tournament(tournament, rows, states, engine, course=None, layout=None):
+    """Finalize one tournament against in-memory member states.
+
+    Mirrors finalize_tournament: gross_win is marked on the leader among members
+    without a gross win, every participant's tournaments_played is incremented,
+    then the season's handicap engine runs. WHS records are kept for both engines.
+    rows are the tournament's score rows (with net_handicap, the handicap the card
+    was entered off); states maps member_id to MemberState.
+
+    Returns a FinalizeResult.
+    """
+    if not rows:
+        return FinalizeResult([], {}, {}, {})
+    holes = hole_matrix(rows)
+
+    # Finalize: gross_win and tournaments_played
+    # The hole columns are only needed as the matrix, so the working rows stay small
+    scores = []
+    for row in rows:
+        state = states[row['member_id']]
+        scores.append({'id': row['id'], 'member_id': row['member_id'], 'total_score': row['total_score'],
+                       'holes_completed': row['holes_completed'], 'net_handicap': row['net_handicap'],
+                       'name': state.name, 'gender': state.gender, 'gross_win': state.gross_win})
+    gross_winners = gross_leaders(scores, holes, exclude_gross_winners=True)
+    for member_id in gross_winners.values():
+        states[member_id].gross_win = True
+    for member_id in {score['member_id'] for score in scores}:
+        states[member_id].tournaments_played += 1
+    for score in scores:
+        state = states[score['member_id']]
+        score.update(handicap=state.handicap, tournaments_played=state.tournaments_played, gross_win=state.gross_win)
+
+    adjustments_log = []
+    net_handicaps = {}
+    if engine != 'whs':
+        new_handicaps, adjustments_log, net_handicaps = club_adjustments(scores, holes)
+        for member_id, handicap in new_handicaps.items():
+            states[member_id].handicap = handicap
+
+    # WHS: post complete rounds, capped at net double bogey when the course has pars.
+    # The cap uses the card's net_handicap as finalize leaves it (the club rules
+    # rewrite it on the top three), or the member's handicap when the card has none
+    course_rating = course['course_rating'] if course else None
+    slope_rating = course['slope_rating'] if course else None
+    complete = [i for i, score in enumerate(scores) if score['total_score'] is not None and score['holes_completed'] == 18]
+    if layout is not None and complete:
+        pars, stroke_index = layout
+        par = int(pars.sum())
+        playing_handicaps = []
+        for i in complete:
+            score = scores[i]
+            playing = net_handicaps.get(score['id'], score['net_handicap'])
+            playing_handicaps.append(playing if playing is not None else states[score['member_id']].handicap)
+        adjusted = whs.adjusted_gross_scores(holes[complete], playing_handicaps, pars, stroke_index).tolist()
+    else:
+        par = NET_PAR
+        adjusted = [scores[i]['total_score'] for i in complete]
+    posted = {}
+    for i, adjusted_gross in zip(complete, adjusted):
+        score = scores[i]
+        state = states[score['member_id']]
+        differential = whs.score_differential(adjusted_gross, course_rating, slope_rating)
+        state.whs_record.post(differential)
+        index = state.whs_record.handicap_index()
+        posted[score['id']] = (differential, index)
+        if engine == 'whs' and index is not None:
+            old_handicap = state.handicap
+            state.handicap = whs.course_handicap(index, course_rating, slope_rating, par)
+            if state.handicap != old_handicap:
+                adjustments_log.append({
+                    "member_id": score['member_id'],
+                    "name": state.name,
+                    "old": old_handicap,
+                    "new": state.handicap,
+                    "adjustment": state.handicap - old_handicap,
+                    "reason": f"WHS index {index} (differential {differential})"
+                })
+    return FinalizeResult(adjustments_log, posted, gross_winners, net_handicaps)
+
+
+def final_boards(rows, gross_win_before):
+    """Gross and net boards per gender as they stand once a tournament is finalized.
+
+    rows carry gender, total_score, handicap (what the score is netted with),
+    tournaments_played (counting this tournament) and the hole columns, in
+    ORDER BY total_score, id order. The gross board leaves out members who already
+    had a gross win before this tournament; the net boards leave out this
+    tournament's gross winners and members not yet eligible.
+    """
+    gross_boards = {}
+    net_boards = {}
+    for gender in GENDERS:
+        field = [row for row in rows if row['gender'] == gender]
+        gross_boards[gender] = order_rows([row for row in field if not gross_win_before[row['member_id']]])
+    winners = {board[0]['member_id'] for board in gross_boards.values() if board}
+    for gender in GENDERS:
+        net_boards[gender] = order_rows([
+            row for row in rows
+            if row['gender'] == gender and row['member_id'] not in winners
+            and (row['tournaments_played'] or 0) > NET_ELIGIBILITY_TOURNAMENTS
+            and row['total_score'] is not None and row['handicap'] is not None
+        ], 'handicap')
+    return gross_boards, net_boards
+
+
+def final_results(rows, gross_win_before):
+    """One result per player of a finalized tournament, from final_boards.
+
+    Returns {member_id: dict} with gross and net position (None when not on that
+    board), net score, eligibility flags, gross_win before and after, and the
+    automatic awards won.
+    """
+    gross_boards, net_boards = final_boards(rows, gross_win_before)
+    gross_positions = {row['member_id']: position for board in gross_boards.values() for position, row in enumerate(board, 1)}
+    net_positions = {row['member_id']: position for board in net_boards.values() for position, row in enumerate(board, 1)}
+    winners = {board[0]['member_id'] for board in gross_boards.values() if board}
+    won = {}
+    for award, row in awards.automatic_awards(gross_boards, net_boards).items():
+        won.setdefault(row['member_id'], []).append(award)
+
+    results = {}
+    for row in rows:
+        member_id = row['member_id']
+        has_net = row['total_score'] is not None and row['handicap'] is not None
+        results[member_id] = {
+            'member_id': member_id,
+            'score_id': row['id'],
+            'gender': row['gender'],
+            'total_score': row['total_score'],
+            'net_handicap': row['handicap'],
+            'net_score': awards.net_score(row) if has_net else None,
+            'gross_position': gross_positions.get(member_id),
+            'net_position': net_positions.get(member_id),
+            'gross_eligible': not gross_win_before[member_id],
+            'net_eligible': member_id not in winners and (row['tournaments_played'] or 0) > NET_ELIGIBILITY_TOURNAMENTS,
+            'gross_win_before': bool(gross_win_before[member_id]),
+            'gross_win_after': bool(gross_win_before[member_id]) or member_id in winners,
+            'awards': won.get(member_id, []),
+        }
+    return results
+
+
+def preview_finalize(rows, states, engine, course=None, layout=None):
+    """Run the whole finalize pipeline for one tournament in memory.
+
+    rows are the tournament's score rows with name and gender; states holds the
+    participants' current MemberStates (with their WHS records) and is updated in
+    place. Returns the FinalizeResult, the final boards and the automatic awards.
+    """
+    gross_win_before = {member_id: state.gross_win for member_id, state in states.items()}
+    result = replay_tournament(None, rows, states, engine, course, layout)
+    entries = [
+        dict(row, handicap=result.net_handicaps.get(row['id'], row['net_handicap']),
+             tournaments_played=states[row['member_id']].tournaments_played)
+        for row in rows
+    ]
+    gross_boards, net_boards = final_boards(entries, gross_win_before)
+    return {
+        'result': result,
+        'gross_boards': gross_boards,
+        'net_boards': net_boards,
+        'awards': awards.automatic_awards(gross_boards, net_boards),
+    }
@@ -0,0 +1,90 @@
+"""View-model for the tournament page leaderboards and award cards.
+
+The boards arrive already ranked and split by gender; this module turns each
+row into the values the page prints (position, thru, nine-hole subtotals, the
+truncated net score) and each automatic award into a card with its winner and
+prize, so view_tournament.html only iterates and does no arithmetic or lookups.
+"""
+from awards import net_score
+from scoring import HOLE_COLUMNS
+
+FRONT_NINE = HOLE_COLUMNS[:9]
+BACK_NINE = HOLE_COLUMNS[9:]
+
+# Award cards in page order: (award, title, gender or None, (background, border, text colour), prize placeholder)
+AWARD_CARDS = [
+    ('Gross 1st Male', '🏆 Gross 1st - Male', 'Male', ('#fff3cd', '#ffc107', '#856404'), 'e.g. $100'),
+    ('Gross 1st Female', '🏆 Gross 1st - Female', 'Female', ('#fff3cd', '#ffc107', '#856404'), 'e.g. $100'),
+    ('Net 1st', '🥇 Net 1st Place', None, ('#d1ecf1', '#17a2b8', '#0c5460'), 'e.g. $80'),
+    ('Net 2nd', '🥈 Net 2nd Place', None, ('#d1ecf1', '#17a2b8', '#0c5460'), 'e.g. $60'),
+    ('Net 3rd', '🥉 Net 3rd Place', None, ('#d1ecf1', '#17a2b8', '#0c5460'), 'e.g. $40'),
+    ('Net 4th', '4️⃣ Net 4th Place', None, ('#e2e3e5', '#6c757d', '#495057'), 'e.g. $20'),
+    ('Net 5th', '5️⃣ Net 5th Place', None, ('#e2e3e5', '#6c757d', '#495057'), 'e.g. $10'),
+    ('Lucky 7', '🍀 Lucky 7', None, ('#d4edda', '#28a745', '#155724'), 'e.g. $10'),
+    ('BB', '🤦 BB (Booby Prize)', None, ('#f8d7da', '#dc3545', '#721c24'), 'e.g. sleeve of balls'),
+]
+
+
+def nine_total(score, columns):
+    """Subtotal for a nine, or '-' until its first hole has a score."""
+    if not score[columns[0]]:
+        return '-'
+    return sum(score[column] or 0 for column in columns)
+
+
+def board_row(position, score):
+    """Display values shared by the gross and net boards."""
+    holes_completed = score['holes_completed']
+    return {
+        'position': position,
+        'score_id': score['id'],
+        'member_id': score['member_id'],
+        'name': score['name'],
+        'thru': 'F' if holes_completed == 18 else (holes_completed or 0),
+        'front': nine_total(score, FRONT_NINE),
+        'back': nine_total(score, BACK_NINE),
+        'total_score': score['total_score'],
+    }
+
+
+def gross_board(scores):
+    """Rows for a ranked gross board."""
+    return [board_row(position, score) for position, score in enumerate(scores, 1)]
+
+
+def net_board(scores):
+    """Rows for a ranked net board; rows without a net score cannot be placed and are dropped."""
+    rows = []
+    for score in scores:
+        if score['total_score'] is None or score['handicap'] is None:
+            continue
+        row = board_row(len(rows) + 1, score)
+        row['handicap'] = int(score['handicap'])
+        row['net_score'] = net_score(score)
+        row['stableford_points'] = score['stableford_points'] if score['stableford_points'] is not None else '-'
+        rows.append(row)
+    return rows
+
+
+def award_cards(automatic_awards, award_prizes):
+    """Cards for the awards that have a winner, from {award: winner name} and {award: prize}."""
+    cards = []
+    for award, title, gender, (background, border, colour), placeholder in AWARD_CARDS:
+        winner = automatic_awards.get(award)
+        if not winner:
+            continue
+        cards.append({
+            'award': award, 'title': title, 'winner': winner, 'prize': award_prizes.get(award, ''),
+            'gender_class': f'gender-{gender.lower()}' if gender else '',
+            'background': background, 'border': border, 'colour': colour, 'placeholder': placeholder,
+        })
+    return cards
+
+
+def build(gross_boards, net_boards, automatic_awards, award_prizes):
+    """Everything the leaderboards and awards sections render, from ranked {gender: rows} boards."""
+    return {
+        'gross': {gender: gross_board(scores) for gender, scores in gross_boards.items()},
+        'net': {gender: net_board(scores) for gender, scores in net_boards.items()},
+        'awards': award_cards(automatic_awards, award_prizes),
+    }
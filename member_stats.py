@@ -0,0 +1,107 @@
+"""Running performance aggregates per member, for profiles.
+
+member_stats keeps, for each member's complete rounds in finalized tournaments,
+the running sums, counts and best/worst scores plus an exponentially weighted
+moving average of net scores as recent form, so a profile is one primary-key
+read. rebuild() recomputes them in one streaming pass over the rounds in date
+order; finalize runs it for the tournament's players, so the form does not
+depend on the order tournaments were finalized in.
+"""
+from datetime import datetime
+from itertools import groupby
+
+# Weight of the newest round in the recent form average
+FORM_ALPHA = 0.3
+
+STAT_COLUMNS = ['rounds', 'gross_sum', 'gross_sq_sum', 'best_gross', 'worst_gross',
+                'net_rounds', 'net_sum', 'best_net', 'form', 'last_tournament_id', 'last_date']
+
+UPSERT_SQL = f'''
+    INSERT INTO member_stats (member_id, {', '.join(STAT_COLUMNS)}, updated_at)
+    VALUES ({', '.join('?' for _ in range(len(STAT_COLUMNS) + 2))})
+    ON CONFLICT(member_id) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in STAT_COLUMNS)},
+        updated_at = excluded.updated_at
+'''
+
+# Complete rounds in finalized tournaments, oldest first
+ROUNDS_SQL = '''
+    SELECT ts.member_id, ts.total_score, ts.net_handicap, t.id AS tournament_id, t.date
+    FROM tournament_scores ts
+    JOIN tournaments t ON t.id = ts.tournament_id
+    WHERE t.finalized = 1 AND ts.total_score IS NOT NULL AND ts.holes_completed = 18
+'''
+
+
+class MemberStats:
+    """One member's aggregates; add() folds in a round."""
+
+    __slots__ = STAT_COLUMNS
+
+    def __init__(self, row=None):
+        for column in STAT_COLUMNS:
+            setattr(self, column, row[column] if row is not None else None)
+        if row is None:
+            self.rounds = self.gross_sum = self.gross_sq_sum = self.net_rounds = self.net_sum = 0
+
+    def add(self, total_score, net_handicap, tournament_id=None, date=None):
+        self.rounds += 1
+        self.gross_sum += total_score
+        self.gross_sq_sum += total_score * total_score
+        self.best_gross = total_score if self.best_gross is None else min(self.best_gross, total_score)
+        self.worst_gross = total_score if self.worst_gross is None else max(self.worst_gross, total_score)
+        if net_handicap is not None:
+            net = total_score - net_handicap
+            self.net_rounds += 1
+            self.net_sum += net
+            self.best_net = net if self.best_net is None else min(self.best_net, net)
+            self.form = net if self.form is None else round(FORM_ALPHA * net + (1 - FORM_ALPHA) * self.form, 4)
+        self.last_tournament_id = tournament_id
+        self.last_date = date
+
+    def values(self):
+        return [getattr(self, column) for column in STAT_COLUMNS]
+
+
+def rebuild(conn, member_ids=None, batch_size=1000):
+    """Recompute aggregates in one streaming pass, for every member or just member_ids.
+    Call inside a write transaction."""
+    if member_ids is None:
+        conn.execute('DELETE FROM member_stats')
+        rows = conn.execute(ROUNDS_SQL + ' ORDER BY ts.member_id, t.date, t.id')
+    else:
+        member_ids = list(member_ids)
+        if not member_ids:
+            return 0
+        placeholders = ', '.join('?' for _ in member_ids)
+        conn.execute(f'DELETE FROM member_stats WHERE member_id IN ({placeholders})', member_ids)
+        rows = conn.execute(ROUNDS_SQL + f' AND ts.member_id IN ({placeholders}) ORDER BY ts.member_id, t.date, t.id', member_ids)
+    now = datetime.now().isoformat()
+    batch = []
+    members = 0
+    for member_id, member_rounds in groupby(rows, key=lambda row: row['member_id']):
+        member = MemberStats()
+        for row in member_rounds:
+            member.add(row['total_score'], row['net_handicap'], row['tournament_id'], row['date'])
+        batch.append((member_id, *member.values(), now))
+        members += 1
+        if len(batch) >= batch_size:
+            conn.executemany(UPSERT_SQL, batch)
+            batch = []
+    conn.executemany(UPSERT_SQL, batch)
+    return members
+
+
+def profile(conn, member_id):
+    """A member's aggregates with averages derived, or None before their first counted round."""
+    row = conn.execute('SELECT * FROM member_stats WHERE member_id = ?', (member_id,)).fetchone()
+    if row is None or not row['rounds']:
+        return None
+    stats = dict(row)
+    rounds = stats['rounds']
+    stats['scoring_average'] = round(stats['gross_sum'] / rounds, 2)
+    variance = max(stats['gross_sq_sum'] / rounds - (stats['gross_sum'] / rounds) ** 2, 0.0)
+    stats['scoring_stddev'] = round(variance ** 0.5, 2)
+    stats['net_average'] = round(stats['net_sum'] / stats['net_rounds'], 2) if stats['net_rounds'] else None
+    stats['form'] = round(stats['form'], 2) if stats['form'] is not None else None
+    return stats
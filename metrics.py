@@ -0,0 +1,251 @@
+"""Per-request latency and SQL statement metrics in Prometheus text format.
+
+get_db_connection() opens connections with TimedConnection, which times every
+execute, executemany and executescript, and the fetchone/fetchmany/fetchall
+that read the results. The app's request hooks call begin_request() and
+end_request(). Statements run in between, on any connection the request opens,
+are counted against its route (the Flask endpoint), which shows N+1 loops as
+routes with a high query count per request.
+
+A statement slower than SLOW_QUERY_SECONDS is printed with its route and SQL.
+
+Counting happens in a thread-local record per request, and the shared
+histograms are locked once per request and once per statement. Each costs
+about a microsecond, against the tens of microseconds of even the cheapest
+query.
+
+Rows read by iterating a cursor (for row in conn.execute(...)) are not timed
+as statement time; that time still shows in the request's latency.
+
+Metrics are kept per process. Under gunicorn each scrape of /admin/metrics
+reports the worker that answered it.
+"""
+import bisect
+import sqlite3
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERIES_PER_REQUEST_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+SLOW_QUERY_SECONDS = 0.1
+
+# Statements run outside a request (startup, CLI scripts) are counted under this route
+BACKGROUND = 'background'
+
+
+class Histogram:
+    """Cumulative Prometheus histogram: counts per upper bound plus sum and count."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(le label, observations <= le) pairs ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else f'{bound:g}'), total
+
+
+class _Request:
+    __slots__ = ('route', 'method', 'started', 'queries', 'query_seconds')
+
+    def __init__(self, route, method):
+        self.route = route
+        self.method = method
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+class Registry:
+    """Every metric this process has recorded."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}            # (route, method, status) -> count
+            self.latency = {}             # (route, method) -> Histogram
+            self.queries_per_request = {}  # route -> Histogram
+            self.queries = {}             # route -> statement count
+            self.query_seconds = {}       # route -> seconds in statements
+            self.slow_queries = {}        # route -> count
+            self.query_duration = Histogram(QUERY_BUCKETS)
+
+    def begin_request(self, route, method):
+        self._local.request = _Request(route or 'unmatched', method)
+
+    def end_request(self, status):
+        """Close the current thread's request; status is the response code (500 if it raised)."""
+        current = getattr(self._local, 'request', None)
+        if current is None:
+            return
+        self._local.request = None
+        elapsed = time.perf_counter() - current.started
+        with self._lock:
+            key = (current.route, current.method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.setdefault((current.route, current.method), Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self.queries_per_request.setdefault(current.route, Histogram(QUERIES_PER_REQUEST_BUCKETS)).observe(current.queries)
+            self.queries[current.route] = self.queries.get(current.route, 0) + current.queries
+            self.query_seconds[current.route] = self.query_seconds.get(current.route, 0.0) + current.query_seconds
+
+    def record_query(self, seconds, statement=True):
+        """Count a statement (or, with statement=False, more time reading its rows)."""
+        current = getattr(self._local, 'request', None)
+        if current is not None:
+            current.queries += statement
+            current.query_seconds += seconds
+            route = current.route
+        else:
+            route = BACKGROUND
+        with self._lock:
+            if statement:
+                self.query_duration.observe(seconds)
+            if current is None:
+                self.queries[route] = self.queries.get(route, 0) + statement
+                self.query_seconds[route] = self.query_seconds.get(route, 0.0) + seconds
+
+    def record_slow_query(self, sql, seconds):
+        current = getattr(self._local, 'request', None)
+        route = current.route if current is not None else BACKGROUND
+        with self._lock:
+            self.slow_queries[route] = self.slow_queries.get(route, 0) + 1
+        print(f"Slow query ({seconds * 1000:.1f} ms) in {route}: {' '.join(sql.split())}")
+
+    def render(self, extra=()):
+        """Prometheus text exposition of everything recorded, followed by `extra`
+        metrics given as (name, type, help, [(labels dict, value)])."""
+        with self._lock:
+            lines = []
+            family(lines, 'tournament_http_requests_total', 'counter', 'Requests handled, by route, method and status.',
+                   [({'route': route, 'method': method, 'status': status}, count)
+                    for (route, method, status), count in sorted(self.requests.items())])
+            histogram_family(lines, 'tournament_http_request_duration_seconds', 'Request latency by route.',
+                             [({'route': route, 'method': method}, histogram)
+                              for (route, method), histogram in sorted(self.latency.items())])
+            histogram_family(lines, 'tournament_sql_queries_per_request', 'SQL statements run per request, by route.',
+                             [({'route': route}, histogram) for route, histogram in sorted(self.queries_per_request.items())])
+            family(lines, 'tournament_sql_queries_total', 'counter', 'SQL statements run, by route.',
+                   [({'route': route}, count) for route, count in sorted(self.queries.items())])
+            family(lines, 'tournament_sql_query_seconds_total', 'counter', 'Time spent in SQL statements, by route.',
+                   [({'route': route}, seconds) for route, seconds in sorted(self.query_seconds.items())])
+            family(lines, 'tournament_sql_slow_queries_total', 'counter',
+                   f'SQL statements slower than {SLOW_QUERY_SECONDS:g}s, by route.',
+                   [({'route': route}, count) for route, count in sorted(self.slow_queries.items())])
+            histogram_family(lines, 'tournament_sql_query_duration_seconds', 'SQL statement duration.',
+                             [({}, self.query_duration)])
+        for name, kind, help_text, samples in extra:
+            family(lines, name, kind, help_text, samples)
+        return '\n'.join(lines) + '\n'
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def family(lines, name, kind, help_text, samples):
+    """Append a counter or gauge family: (labels dict, value) samples."""
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {kind}')
+    for labels, value in samples:
+        lines.append(f'{name}{format_labels(labels)} {value:g}' if isinstance(value, float)
+                     else f'{name}{format_labels(labels)} {value}')
+
+
+def histogram_family(lines, name, help_text, samples):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for labels, histogram in samples:
+        for le, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{format_labels(dict(labels, le=le))} {count}')
+        lines.append(f'{name}_sum{format_labels(labels)} {histogram.sum:g}')
+        lines.append(f'{name}_count{format_labels(labels)} {histogram.count}')
+
+
+registry = Registry()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor recording each statement, and the time its fetch calls take, in `registry`."""
+
+    def _timed(self, method, sql, *args):
+        started = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            self._sql = sql
+            self._seconds = time.perf_counter() - started
+            registry.record_query(self._seconds)
+            if self._seconds >= SLOW_QUERY_SECONDS:
+                registry.record_slow_query(sql, self._seconds)
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._timed(super().executescript, sql_script)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            seconds = time.perf_counter() - started
+            registry.record_query(seconds, statement=False)
+            previous = getattr(self, '_seconds', 0.0)
+            self._seconds = previous + seconds
+            # Logged once, when the statement and its reads together cross the threshold
+            if previous < SLOW_QUERY_SECONDS <= self._seconds:
+                registry.record_slow_query(getattr(self, '_sql', '?'), self._seconds)
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements go through TimedCursor:
+
+        sqlite3.connect(path, factory=TimedConnection)
+    """
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
@@ -0,0 +1,89 @@
+"""In-memory live rankings for a tournament field.
+
+Each LiveRanking keeps the gross and net boards of one tournament and gender as
+sorted key lists, so a hole save repositions a single player with a binary search
+instead of re-sorting the whole field on every leaderboard render.
+"""
+from bisect import bisect_left, insort
+
+
+def gross_sort_key(score_id, total_score, countback=()):
+    """Ranking key for the gross board. Players without a total sort last.
+
+    countback holds the back 9/6/3/last-hole totals used to break ties.
+    """
+    return (total_score is None, total_score or 0) + tuple(countback) + (score_id,)
+
+
+def net_sort_key(score_id, total_score, net_handicap, countback=()):
+    """Ranking key for the net board, using the int-truncated net shown on the leaderboard.
+
+    countback holds the handicap-prorated back 9/6/3/last-hole totals.
+    """
+    if total_score is None or net_handicap is None:
+        return (True, 0) + tuple(0 for _ in countback) + (score_id,)
+    return (False, int(total_score - net_handicap)) + tuple(countback) + (score_id,)
+
+
+class LiveRanking:
+    """Ordered gross and net boards for one tournament and gender."""
+
+    BOARDS = ('gross', 'net')
+
+    def __init__(self):
+        self._keys = {board: [] for board in self.BOARDS}
+        self._members = {board: {} for board in self.BOARDS}
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, member_id):
+        return member_id in self._entries
+
+    def update(self, member_id, gross_key, net_key):
+        """Insert or reposition a player on both boards."""
+        self.remove(member_id)
+        for board, key in (('gross', gross_key), ('net', net_key)):
+            insort(self._keys[board], key)
+            self._members[board][key] = member_id
+        self._entries[member_id] = {'gross': gross_key, 'net': net_key}
+
+    def remove(self, member_id):
+        entry = self._entries.pop(member_id, None)
+        if entry is None:
+            return
+        for board in self.BOARDS:
+            keys = self._keys[board]
+            index = bisect_left(keys, entry[board])
+            if index < len(keys) and keys[index] == entry[board]:
+                del keys[index]
+            self._members[board].pop(entry[board], None)
+
+    def copy(self):
+        """An independent copy to read from while this ranking keeps being updated."""
+        ranking = LiveRanking()
+        ranking._keys = {board: list(keys) for board, keys in self._keys.items()}
+        ranking._members = {board: dict(members) for board, members in self._members.items()}
+        # Entries are replaced on update, never changed in place, so a shallow copy is enough
+        ranking._entries = dict(self._entries)
+        return ranking
+
+    def key_of(self, member_id, board='net'):
+        entry = self._entries.get(member_id)
+        return entry[board] if entry else None
+
+    def position(self, member_id, board='net'):
+        """1-based position of a player on a board, or None if they have no score."""
+        entry = self._entries.get(member_id)
+        if entry is None:
+            return None
+        return bisect_left(self._keys[board], entry[board]) + 1
+
+    def top(self, k, board='net'):
+        """Member ids of the first k players on a board."""
+        return [self._members[board][key] for key in self._keys[board][:k]]
+
+    def ordered(self, board='net'):
+        """All member ids on a board in leaderboard order."""
+        return self.top(len(self._keys[board]), board)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Recompute every member's performance aggregates (member_stats) from scratch.
+
+Finalize recomputes the stats of its tournament's players; run this after editing
+scores in finalized tournaments or replaying history. All complete rounds in
+finalized tournaments are streamed once, ordered by member and date, and the
+table is rewritten in one transaction.
+
+    python rebuild_member_stats.py [--database database.db]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the current directory to Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app
+import member_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=app.DATABASE, help='SQLite database file (default: %(default)s)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        print(f"Database file {args.database} not found. Please run the main application first.")
+        return 1
+    app.DATABASE = args.database
+    app.init_db()
+
+    conn = app.get_db_connection()
+    conn.isolation_level = None
+    start = time.perf_counter()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        members = member_stats.rebuild(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    print(f"✅ Rebuilt performance stats for {members} members in {time.perf_counter() - start:.2f}s.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
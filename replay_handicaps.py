@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Replay every finalized tournament in date order and rebuild members' handicaps.
+
+Each tournament is re-finalized in memory with the rules its season used (club
+adjustments or WHS), starting from the handicap each member brought to their
+first finalized round. The result is compared with the stored handicaps; with
+--write the corrected handicaps, the adjustment log, the handicap history and the
+WHS records are saved in one transaction.
+
+    python replay_handicaps.py            # report differences only
+    python replay_handicaps.py --write    # apply them
+
+Everything is read with a handful of bulk queries; no query is issued per member
+or per tournament. Manual handicap edits made between tournaments are not part of
+the history and are replaced by the replayed values.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add the current directory to Python path to import from app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app
+import whs
+from handicaps import MemberState, replay_tournament
+from scoring import HOLE_COLUMNS, load_course_layouts
+
+
+def load_history(conn):
+    """Bulk-load members, finalized tournaments, season engines and courses."""
+    members = conn.execute('SELECT id, name, gender, handicap, tournaments_played, gross_win FROM members').fetchall()
+    tournaments = conn.execute('SELECT * FROM tournaments WHERE finalized = 1 ORDER BY date, id').fetchall()
+    engines = {row['year']: row['handicap_engine'] for row in conn.execute('SELECT year, handicap_engine FROM seasons')}
+    courses = {row['id']: row for row in conn.execute('SELECT * FROM courses')}
+    layouts = load_course_layouts(conn)
+
+    # Handicap each member brought to their first finalized round, and how many they played
+    first_rounds = {row['member_id']: row for row in conn.execute('''
+        SELECT member_id, net_handicap, rounds FROM (
+            SELECT ts.member_id, ts.net_handicap,
+                   COUNT(*) OVER (PARTITION BY ts.member_id) AS rounds,
+                   ROW_NUMBER() OVER (PARTITION BY ts.member_id ORDER BY t.date, t.id) AS round_number
+            FROM tournament_scores ts
+            JOIN tournaments t ON t.id = ts.tournament_id
+            WHERE t.finalized = 1
+        ) WHERE round_number = 1
+    ''')}
+    return members, tournaments, engines, courses, layouts, first_rounds
+
+
+def initial_states(members, first_rounds):
+    """Member state before the first finalized tournament.
+
+    tournaments_played keeps any count from before the recorded history; gross win
+    flags are recomputed from the history alone.
+    """
+    states = {}
+    for member in members:
+        first = first_rounds.get(member['id'])
+        handicap = member['handicap']
+        played_before = member['tournaments_played'] or 0
+        if first is not None:
+            if first['net_handicap'] is not None:
+                handicap = first['net_handicap']
+            played_before = max(0, played_before - first['rounds'])
+        states[member['id']] = MemberState(member['id'], member['name'], member['gender'], handicap, played_before)
+    return states
+
+
+def replay(conn):
+    """Replay the full history.
+
+    Returns (states, adjustments, posted, tournament count, stored member rows by id).
+    """
+    members, tournaments, engines, courses, layouts, first_rounds = load_history(conn)
+    states = initial_states(members, first_rounds)
+    tournaments_by_id = {t['id']: t for t in tournaments}
+
+    # Stream every finalized score row once, already in replay order
+    rows = conn.execute(f'''
+        SELECT ts.id, ts.tournament_id, ts.member_id, ts.total_score, ts.holes_completed, ts.net_handicap,
+               {', '.join(f'ts.{column}' for column in HOLE_COLUMNS)}
+        FROM tournament_scores ts
+        JOIN tournaments t ON t.id = ts.tournament_id
+        JOIN members m ON m.id = ts.member_id
+        WHERE t.finalized = 1
+        ORDER BY t.date, t.id, ts.total_score, ts.id
+    ''')
+    adjustments = []
+    posted = {}
+    for tournament_id, tournament_rows in itertools.groupby(rows, key=lambda row: row['tournament_id']):
+        tournament = tournaments_by_id[tournament_id]
+        engine = engines.get(str(tournament['date'])[:4], whs.DEFAULT_ENGINE)
+        result = replay_tournament(
+            tournament, list(tournament_rows), states, engine,
+            courses.get(tournament['course_id']), layouts.get(tournament['course_id'])
+        )
+        adjustments.extend(dict(entry, tournament_id=tournament_id, effective_date=tournament['date']) for entry in result.adjustments)
+        posted.update(result.posted)
+    return states, adjustments, posted, len(tournaments), {member['id']: member for member in members}
+
+
+def write_results(conn, states, adjustments, posted, stored):
+    """Save replayed handicaps, adjustment log, handicap history and WHS records in one transaction.
+
+    The tournament entries of the handicap history are replaced by the replayed ones;
+    members whose stored handicap was wrong also get a correction entry dated today.
+    """
+    now = datetime.now().isoformat()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.executemany('UPDATE members SET handicap = ? WHERE id = ?',
+                         [(state.handicap, member_id) for member_id, state in states.items()])
+        conn.execute('DELETE FROM handicap_adjustment_log')
+        conn.executemany(
+            '''INSERT INTO handicap_adjustment_log
+               (tournament_id, member_id, old_handicap, new_handicap, adjustment, reason, source, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, 'replay', ?)''',
+            [(entry['tournament_id'], entry['member_id'], entry['old'], entry['new'], entry['adjustment'], entry['reason'], now)
+             for entry in adjustments]
+        )
+        conn.execute("DELETE FROM handicap_history WHERE source IN ('finalize', 'replay', 'backfill')")
+        conn.executemany(
+            '''INSERT INTO handicap_history
+               (member_id, effective_date, handicap, previous_handicap, source, tournament_id, reason, created_at)
+               VALUES (?, ?, ?, ?, 'replay', ?, ?, ?)''',
+            [(entry['member_id'], entry['effective_date'], entry['new'], entry['old'], entry['tournament_id'], entry['reason'], now)
+             for entry in adjustments if entry['new'] != entry['old']]
+            + [(member_id, now, state.handicap, stored[member_id]['handicap'], None, 'Season replay correction', now)
+               for member_id, state in states.items() if state.handicap != stored[member_id]['handicap']]
+        )
+        conn.execute('DELETE FROM whs_records')
+        conn.executemany(
+            'INSERT INTO whs_records (member_id, differentials, handicap_index, updated_at) VALUES (?, ?, ?, ?)',
+            [(member_id, state.whs_record.to_json(), state.whs_record.handicap_index(), now)
+             for member_id, state in states.items() if len(state.whs_record)]
+        )
+        conn.execute('UPDATE tournament_scores SET score_differential = NULL, handicap_index = NULL')
+        conn.executemany('UPDATE tournament_scores SET score_differential = ?, handicap_index = ? WHERE id = ?',
+                         [(differential, index, score_id) for score_id, (differential, index) in posted.items()])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=app.DATABASE, help='SQLite database file (default: %(default)s)')
+    parser.add_argument('--write', action='store_true', help='save the replayed handicaps and adjustment log')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.database):
+        print(f"Database file {args.database} not found. Please run the main application first.")
+        return 1
+    app.DATABASE = args.database
+    app.init_db()
+
+    conn = app.get_db_connection()
+    conn.isolation_level = None
+    start = time.perf_counter()
+    states, adjustments, posted, tournament_count, stored = replay(conn)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {tournament_count} finalized tournaments ({len(adjustments)} adjustments, "
+          f"{len(posted)} WHS rounds) in {elapsed:.2f}s")
+
+    changed = [(member_id, state) for member_id, state in states.items() if state.handicap != stored[member_id]['handicap']]
+    flag_differences = sum(
+        1 for member_id, state in states.items()
+        if bool(state.gross_win) != bool(stored[member_id]['gross_win'])
+        or state.tournaments_played != (stored[member_id]['tournaments_played'] or 0)
+    )
+    if changed:
+        print(f"\n{len(changed)} members' handicaps differ from the stored values:")
+        for member_id, state in sorted(changed, key=lambda item: item[1].name or ''):
+            print(f"  - {state.name} (ID: {member_id}): stored {stored[member_id]['handicap']} → replayed {state.handicap}")
+    else:
+        print("\nAll stored handicaps match the replay.")
+    if flag_differences:
+        print(f"Note: {flag_differences} members' gross win / tournaments played differ from the replay (not written).")
+
+    if args.write:
+        write_results(conn, states, adjustments, posted, stored)
+        print(f"\n✅ Wrote {len(states)} handicaps and {len(adjustments)} adjustment log entries.")
+    elif changed:
+        print("\nRun again with --write to apply these handicaps.")
+    conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Vectorized scoring helpers over the hole1..hole18 columns of tournament_scores.
+
+Everything here works on a whole field at once: score rows are loaded into an
+(n_players x 18) matrix and each statistic is a handful of array operations.
+"""
+import sqlite3
+
+import numpy as np
+
+HOLE_COLUMNS = [f'hole{i}' for i in range(1, 19)]
+
+# Countback segments, compared in order: back 9, back 6, back 3, last hole
+COUNTBACK_SEGMENTS = (9, 6, 3, 1)
+
+
+def hole_matrix(rows):
+    """Load the hole columns of score rows into a float matrix (missing holes are NaN)."""
+    if not rows:
+        return np.empty((0, 18))
+    keys = list(rows[0].keys()) if hasattr(rows[0], 'keys') else []
+    if isinstance(rows[0], sqlite3.Row) and keys[keys.index('hole1'):keys.index('hole1') + 18] == HOLE_COLUMNS:
+        # sqlite3.Row supports slicing, which is much faster than 18 lookups by name
+        start = keys.index('hole1')
+        return np.array([row[start:start + 18] for row in rows], dtype=float)
+    return np.array([[row[column] for column in HOLE_COLUMNS] for row in rows], dtype=float)
+
+
+def _as_float_array(values):
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+
+def countback_segments(holes, handicaps=None):
+    """Back 9, back 6, back 3 and last-hole totals for every row.
+
+    With handicaps each segment is prorated (half, a third, a sixth and an
+    eighteenth of the handicap), as used for net countback. Unplayed holes count
+    as zero, matching how running totals are kept. Values are rounded so that
+    equal prorated totals compare equal.
+    """
+    filled = np.nan_to_num(holes, nan=0.0)
+    suffix = filled[:, ::-1].cumsum(axis=1)
+    segments = suffix[:, [length - 1 for length in COUNTBACK_SEGMENTS]]
+    if handicaps is not None:
+        handicap_values = np.nan_to_num(_as_float_array(handicaps), nan=0.0)
+        segments = segments - handicap_values[:, None] * (np.array(COUNTBACK_SEGMENTS) / 18.0)
+    return np.round(segments, 6)
+
+
+def leaderboard_order(totals, holes, handicaps=None):
+    """Indices of the field in leaderboard order, ties broken by countback.
+
+    Without handicaps the field is ranked on gross total. With handicaps it is ranked
+    on the int-truncated net shown on the leaderboard, and the countback is prorated.
+    Players without a score go last; full ties keep their input order.
+    """
+    primary = _as_float_array(totals)
+    if handicaps is not None:
+        primary = np.trunc(primary - _as_float_array(handicaps))
+    missing = np.isnan(primary)
+    primary = np.where(missing, 0.0, primary)
+    segments = countback_segments(holes, handicaps)
+    # np.lexsort sorts by the last key first
+    keys = [segments[:, i] for i in range(len(COUNTBACK_SEGMENTS) - 1, -1, -1)] + [primary, missing]
+    return np.lexsort(keys)
+
+
+def order_rows(rows, handicap_field=None):
+    """Return score rows in leaderboard order, breaking ties by countback."""
+    if not rows:
+        return []
+    handicaps = [row[handicap_field] for row in rows] if handicap_field else None
+    order = leaderboard_order([row['total_score'] for row in rows], hole_matrix(rows), handicaps)
+    return [rows[i] for i in order]
+
+
+def load_course_layouts(conn, course_ids=None):
+    """Par and stroke index arrays per course, for courses with all 18 holes set up."""
+    query = 'SELECT course_id, hole_number, par, stroke_index FROM course_holes'
+    params = ()
+    if course_ids is not None:
+        course_ids = [course_id for course_id in course_ids if course_id is not None]
+        if not course_ids:
+            return {}
+        query += f" WHERE course_id IN ({', '.join('?' for _ in course_ids)})"
+        params = tuple(course_ids)
+    layouts = {}
+    for row in conn.execute(query, params).fetchall():
+        pars, stroke_index = layouts.setdefault(row['course_id'], (np.full(18, np.nan), np.full(18, np.nan)))
+        if 1 <= row['hole_number'] <= 18:
+            pars[row['hole_number'] - 1] = row['par']
+            stroke_index[row['hole_number'] - 1] = row['stroke_index']
+    return {
+        course_id: (pars, stroke_index)
+        for course_id, (pars, stroke_index) in layouts.items()
+        if not np.isnan(pars).any() and not np.isnan(stroke_index).any()
+    }
+
+
+def strokes_received(handicaps, stroke_index):
+    """Handicap strokes received on each hole, for every player.
+
+    A playing handicap of h gives h // 18 strokes on every hole plus one more on
+    the holes whose stroke index is at most h % 18.
+    """
+    playing = np.floor(np.nan_to_num(_as_float_array(handicaps), nan=0.0) + 0.5).clip(min=0)
+    base, extra = np.divmod(playing, 18)
+    return base[:, None] + (np.asarray(stroke_index)[None, :] <= extra[:, None])
+
+
+def score_field(holes, handicaps, pars, stroke_index):
+    """Net strokes, Stableford points and eagle/birdie flags for a whole field.
+
+    Returns a dict of (n_players x 18) arrays plus per-player totals. Unplayed
+    holes score no points and are never flagged.
+    """
+    played = ~np.isnan(holes)
+    received = strokes_received(handicaps, stroke_index)
+    net = holes - received
+    to_par = holes - pars
+    points = np.where(played, np.clip(2 + pars - net, 0, None), 0)
+    eagles = played & (to_par <= -2)
+    birdies = played & (to_par == -1)
+    return {
+        'strokes_received': received,
+        'net': net,
+        'points': points,
+        'eagles': eagles,
+        'birdies': birdies,
+        'stableford_points': points.sum(axis=1).astype(int),
+        'eagle_count': eagles.sum(axis=1),
+        'birdie_count': birdies.sum(axis=1),
+    }
+
+
+def flagged_holes(flags):
+    """(row index, hole number) pairs where a per-hole flag matrix is set."""
+    rows, holes = np.nonzero(flags)
+    return list(zip(rows.tolist(), (holes + 1).tolist()))
@@ -0,0 +1,200 @@
+"""Skins and match-play side games computed from the hole matrix.
+
+Skins are played across the whole field, gross and net, with tied holes carrying
+over to the next hole won outright. Match play is pairwise within each group,
+with the higher handicap receiving the difference in strokes by stroke index.
+Both are array passes over the (n_players x 18) hole matrix; SideGames keeps that
+matrix in memory so a hole save only replaces the rows that changed.
+"""
+import numpy as np
+
+from scoring import strokes_received
+
+# Without a course, handicap strokes fall on holes in order (hole 1 is stroke index 1)
+DEFAULT_STROKE_INDEX = np.arange(1, 19)
+
+MATCH_HOLES = 18
+
+
+def skins(holes, handicaps=None, stroke_index=None, final=False):
+    """Skins won for a field, in hole order, with carryovers.
+
+    A hole is settled once every player with a card has played it (or, when final,
+    once anyone has). Holes are resolved in order up to the first unsettled hole, so
+    a carryover is never paid out past a hole still in play. With handicaps the net
+    score per hole is used.
+
+    Returns a dict with the skins won (row index, hole, value, score), the holes
+    settled so far, the pending carryover and the skins total per row.
+    """
+    n_players = len(holes)
+    if n_players == 0:
+        return {'skins': [], 'settled_through': 0, 'carryover': 0, 'totals': np.zeros(0, dtype=int)}
+
+    scores = holes
+    if handicaps is not None:
+        index = DEFAULT_STROKE_INDEX if stroke_index is None else stroke_index
+        scores = holes - strokes_received(handicaps, index)
+    played = ~np.isnan(scores)
+    settled = played.any(axis=0) if final else played.all(axis=0)
+    settled_through = MATCH_HOLES if settled.all() else int(np.argmin(settled))
+
+    best = np.where(played, scores, np.inf).min(axis=0)
+    winners = played & (scores == best)
+    hole_numbers = np.arange(MATCH_HOLES)
+    won = (winners.sum(axis=0) == 1) & (hole_numbers < settled_through)
+
+    # Each skin is worth one plus the tied holes since the previous skin
+    last_won = np.maximum.accumulate(np.where(won, hole_numbers, -1))
+    previous_won = np.concatenate(([-1], last_won[:-1]))
+    values = hole_numbers - previous_won
+    winner_rows = winners.argmax(axis=0)
+
+    won_holes = np.nonzero(won)[0]
+    totals = np.bincount(winner_rows[won_holes], weights=values[won_holes], minlength=n_players).astype(int)
+    carryover = settled_through - (int(last_won[settled_through - 1]) + 1) if settled_through else 0
+    return {
+        'skins': [
+            {'row': int(winner_rows[h]), 'hole': int(h) + 1, 'value': int(values[h]), 'score': float(scores[winner_rows[h], h])}
+            for h in won_holes
+        ],
+        'settled_through': settled_through,
+        'carryover': carryover,
+        'totals': totals,
+    }
+
+
+def match_play(holes, handicaps=None, stroke_index=None):
+    """Pairwise match-play state for a group, as (k x k) arrays.
+
+    up[i, j] is how many holes player i is up on player j (negative when down),
+    played[i, j] the holes both have played, and closed_at[i, j] the hole number on
+    which the match was decided (0 while it is still live). Matches use the
+    handicap difference, allocated by stroke index, when handicaps are given.
+    """
+    k = len(holes)
+    scores = np.broadcast_to(holes[:, None, :], (k, k, MATCH_HOLES))
+    if handicaps is not None and k:
+        index = DEFAULT_STROKE_INDEX if stroke_index is None else stroke_index
+        playing = np.floor(np.nan_to_num(np.array(handicaps, dtype=float), nan=0.0) + 0.5)
+        difference = (playing[:, None] - playing[None, :]).clip(min=0)
+        # strokes[i, j] is what player i receives against player j on each hole
+        strokes = strokes_received(difference.ravel(), index).reshape(k, k, MATCH_HOLES)
+        scores = scores - strokes
+
+    both_played = ~np.isnan(scores) & ~np.isnan(scores.transpose(1, 0, 2))
+    results = np.where(both_played, np.sign(scores.transpose(1, 0, 2) - scores), 0)
+    running = results.cumsum(axis=2)
+    played_so_far = both_played.cumsum(axis=2)
+    decided = both_played & (np.abs(running) > MATCH_HOLES - played_so_far)
+    closed = decided.any(axis=2)
+    closing_hole = decided.argmax(axis=2)
+
+    # A decided match keeps the margin it was won by
+    up = np.where(closed, np.take_along_axis(running, closing_hole[..., None], axis=2)[..., 0], running[..., -1] if k else 0)
+    remaining_at_close = MATCH_HOLES - np.take_along_axis(played_so_far, closing_hole[..., None], axis=2)[..., 0]
+    return {
+        'up': up.astype(int),
+        'played': played_so_far[..., -1].astype(int) if k else np.zeros((0, 0), dtype=int),
+        'closed_at': np.where(closed, closing_hole + 1, 0).astype(int),
+        'remaining_at_close': np.where(closed, remaining_at_close, 0).astype(int),
+    }
+
+
+def match_status(up, played, closed_at, remaining_at_close):
+    """Match-play status text from one player's point of view."""
+    if closed_at:
+        return f'Won {abs(up)}&{remaining_at_close}' if up > 0 else f'Lost {abs(up)}&{remaining_at_close}'
+    if played == 0:
+        return 'Not started'
+    if played == MATCH_HOLES:
+        return 'Halved' if up == 0 else ('Won 1 UP' if up > 0 else 'Lost 1 DOWN')
+    remaining = MATCH_HOLES - played
+    if up == 0:
+        return f'AS thru {played}'
+    state = f'{abs(up)} UP' if up > 0 else f'{abs(up)} DOWN'
+    if abs(up) == remaining:
+        state += ' (dormie)'
+    return f'{state} thru {played}'
+
+
+class SideGames:
+    """Skins and group matches for one tournament, kept current row by row."""
+
+    def __init__(self, stroke_index=None, final=False):
+        self.stroke_index = stroke_index
+        self.final = final
+        self._rows = {}
+        self._groups = {}
+        self._group_of = {}
+        self._matches = {}
+        self._skins = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def update(self, member_id, holes, handicap):
+        """Insert or replace a player's card (holes is a sequence of 18, None for unplayed)."""
+        self._rows[member_id] = (np.array([np.nan if h is None else h for h in holes], dtype=float), handicap)
+        self._invalidate(member_id)
+
+    def remove(self, member_id):
+        if self._rows.pop(member_id, None) is not None:
+            self._invalidate(member_id)
+
+    def set_groups(self, groups):
+        """Replace group membership ({group_id: [member_id, ...]}); changed groups are recomputed."""
+        for group_id in set(self._groups) | set(groups):
+            if self._groups.get(group_id) != groups.get(group_id):
+                self._matches.pop(group_id, None)
+        self._groups = {group_id: list(member_ids) for group_id, member_ids in groups.items()}
+        self._group_of = {member_id: group_id for group_id, member_ids in self._groups.items() for member_id in member_ids}
+
+    def _invalidate(self, member_id):
+        self._skins = None
+        self._matches.pop(self._group_of.get(member_id), None)
+
+    def _matrix(self, member_ids):
+        if not member_ids:
+            return np.empty((0, MATCH_HOLES)), []
+        return np.array([self._rows[m][0] for m in member_ids]), [self._rows[m][1] for m in member_ids]
+
+    def skins(self):
+        """{'gross': ..., 'net': ...} skins results with member ids in place of row indexes."""
+        if self._skins is None:
+            member_ids = list(self._rows)
+            holes, handicaps = self._matrix(member_ids)
+            self._skins = {}
+            for board, board_handicaps in (('gross', None), ('net', handicaps)):
+                result = skins(holes, board_handicaps, self.stroke_index, self.final)
+                self._skins[board] = {
+                    'skins': [
+                        {'member_id': member_ids[skin['row']], 'hole': skin['hole'], 'value': skin['value'], 'score': skin['score']}
+                        for skin in result['skins']
+                    ],
+                    'settled_through': result['settled_through'],
+                    'carryover': result['carryover'],
+                    'totals': {member_ids[i]: int(total) for i, total in enumerate(result['totals']) if total},
+                }
+        return self._skins
+
+    def matches(self, group_id):
+        """Pairwise matches in a group: list of (member_a, member_b, status from a's side)."""
+        if group_id not in self._matches:
+            member_ids = [m for m in self._groups.get(group_id, []) if m in self._rows]
+            holes, handicaps = self._matrix(member_ids)
+            state = match_play(holes, handicaps, self.stroke_index)
+            pairs = []
+            for i in range(len(member_ids)):
+                for j in range(i + 1, len(member_ids)):
+                    pairs.append({
+                        'member_id': member_ids[i],
+                        'opponent_id': member_ids[j],
+                        'up': int(state['up'][i, j]),
+                        'played': int(state['played'][i, j]),
+                        'closed_at': int(state['closed_at'][i, j]),
+                        'status': match_status(state['up'][i, j], state['played'][i, j],
+                                               state['closed_at'][i, j], state['remaining_at_close'][i, j]),
+                    })
+            self._matches[group_id] = pairs
+        return self._matches[group_id]
@@ -0,0 +1,127 @@
+"""Season order of merit.
+
+Each finalized result earns points from a configurable table: per finishing
+position on the gross and net boards, and per automatic award. season_standings
+keeps each member's running total for the season (calendar year). Finalize adds
+a tournament's points to it incrementally, so the standings page is a single read
+however many seasons and members there are.
+"""
+import json
+from datetime import datetime
+
+CATEGORIES = ('net', 'gross', 'award')
+
+# Points for a finishing position on each gender's board; awards earn nothing by default
+DEFAULT_POINTS = {
+    ('net', '1'): 25, ('net', '2'): 18, ('net', '3'): 15, ('net', '4'): 12, ('net', '5'): 10,
+    ('net', '6'): 8, ('net', '7'): 6, ('net', '8'): 4, ('net', '9'): 2, ('net', '10'): 1,
+    ('gross', '1'): 10, ('gross', '2'): 6, ('gross', '3'): 4,
+}
+
+# Positions shown on the points table form
+NET_POSITIONS_SCORED = 10
+GROSS_POSITIONS_SCORED = 5
+
+WIN_AWARDS = ('Net 1st', 'Gross 1st Male', 'Gross 1st Female')
+
+UPSERT_SQL = '''
+    INSERT INTO season_standings (season, member_id, points, events, wins, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(season, member_id) DO UPDATE SET
+        points = points + excluded.points,
+        events = events + excluded.events,
+        wins = wins + excluded.wins,
+        updated_at = excluded.updated_at
+'''
+
+STANDINGS_SQL = '''
+    SELECT s.member_id, m.name, m.gender, s.points, s.events, s.wins,
+           RANK() OVER (ORDER BY s.points DESC) AS position
+    FROM season_standings s
+    JOIN members m ON m.id = s.member_id
+    WHERE s.season = ? AND s.events > 0
+    ORDER BY s.points DESC, s.wins DESC, m.name
+'''
+
+
+def load_points_table(conn):
+    """{(category, key): points} from the points_table table."""
+    return {(row['category'], row['rank_key']): row['points']
+            for row in conn.execute('SELECT category, rank_key, points FROM points_table')}
+
+
+def seed_points_table(conn):
+    """Fill an empty points table with the defaults."""
+    if conn.execute('SELECT COUNT(*) FROM points_table').fetchone()[0] == 0:
+        conn.executemany('INSERT INTO points_table (category, rank_key, points) VALUES (?, ?, ?)',
+                         [(category, key, points) for (category, key), points in DEFAULT_POINTS.items()])
+
+
+def result_points(result, points_table):
+    """Points one stored result earns: gross and net position plus every award won."""
+    points = 0
+    if result['gross_position'] is not None:
+        points += points_table.get(('gross', str(result['gross_position'])), 0)
+    if result['net_position'] is not None:
+        points += points_table.get(('net', str(result['net_position'])), 0)
+    for award in result['awards']:
+        points += points_table.get(('award', award), 0)
+    return points
+
+
+def is_win(awards):
+    return any(award in WIN_AWARDS for award in awards)
+
+
+def _awards(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def apply_results(conn, season, results, previous=()):
+    """Add a tournament's results to the season standings. Call inside the write transaction.
+
+    results are the new result dicts (with points and awards); previous are result
+    rows already counted for the same tournament, which are taken back out first so
+    finalizing again never double counts.
+    """
+    now = datetime.now().isoformat()
+    deltas = {}
+    for sign, rows in ((-1, previous), (1, results)):
+        for row in rows:
+            points, events, wins = deltas.get(row['member_id'], (0, 0, 0))
+            deltas[row['member_id']] = (points + sign * (row['points'] or 0), events + sign,
+                                        wins + sign * is_win(_awards(row['awards'])))
+    conn.executemany(UPSERT_SQL, [(season, member_id, points, events, wins, now)
+                                  for member_id, (points, events, wins) in deltas.items()])
+
+
+def rebuild(conn):
+    """Re-score every stored result with the current points table and rebuild all standings."""
+    points_table = load_points_table(conn)
+    rows = conn.execute('''
+        SELECT r.id, r.member_id, r.gross_position, r.net_position, r.awards, substr(t.date, 1, 4) AS season
+        FROM tournament_results r
+        JOIN tournaments t ON t.id = r.tournament_id
+    ''').fetchall()
+    now = datetime.now().isoformat()
+    updates = []
+    totals = {}
+    for row in rows:
+        awards = json.loads(row['awards'])
+        points = result_points(dict(row, awards=awards), points_table)
+        updates.append((points, row['id']))
+        key = (row['season'], row['member_id'])
+        total_points, events, wins = totals.get(key, (0, 0, 0))
+        totals[key] = (total_points + points, events + 1, wins + is_win(awards))
+    conn.executemany('UPDATE tournament_results SET points = ? WHERE id = ?', updates)
+    conn.execute('DELETE FROM season_standings')
+    conn.executemany(
+        'INSERT INTO season_standings (season, member_id, points, events, wins, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+        [(season, member_id, points, events, wins, now) for (season, member_id), (points, events, wins) in totals.items()]
+    )
+    return len(rows)
+
+
+def season_standings(conn, season):
+    """Ranked standings for a season, read straight from season_standings."""
+    return [dict(row) for row in conn.execute(STANDINGS_SQL, (season,))]
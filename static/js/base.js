@@ -0,0 +1,106 @@
+(function () {
+    // Key per page + query to keep position distinct per filtered view
+    var key = 'scroll-pos:' + location.pathname + location.search;
+
+    // Restore after load so layout is settled; prefer saved position even if hash exists
+    window.addEventListener('load', function () {
+        try {
+            var pos = sessionStorage.getItem(key);
+            if (pos !== null) {
+                // Use a micro-delay to ensure any flash messages/layout shifts are applied first
+                setTimeout(function(){ window.scrollTo(0, parseInt(pos, 10) || 0); }, 0);
+            }
+        } catch (e) { /* ignore */ }
+    });
+
+    // Save on navigation
+    var save = function () {
+        try { sessionStorage.setItem(key, String(window.scrollY || window.pageYOffset || 0)); } catch (e) { }
+    };
+    window.addEventListener('beforeunload', save);
+
+    // Also save proactively on form submit and internal link clicks
+    document.addEventListener('submit', save, true);
+    document.addEventListener('click', function (e) {
+        var a = e.target.closest('a');
+        if (!a) return;
+        // Only same-origin navigations
+        var url;
+        try { url = new URL(a.href, location.href); } catch (err) { return; }
+        if (url.origin === location.origin) save();
+    }, true);
+})();
+
+// Member pickers: an input.member-search fills the member_id select in its form with
+// matches from /members/search.json (data-gender, data-group-id and data-label="handicap"
+// narrow and format them), so pages never embed the whole roster
+(function () {
+    var timers = new WeakMap();
+
+    function pickerSelect(input) {
+        var scope = input.form || input.parentElement;
+        return scope ? scope.querySelector("select[name='member_id']") : null;
+    }
+
+    function optionLabel(input, member) {
+        return input.dataset.label === 'handicap'
+            ? member.name + ' (Handicap: ' + Math.trunc(member.handicap || 0) + ')'
+            : member.name;
+    }
+
+    function loadMatches(input) {
+        var select = pickerSelect(input);
+        if (!select) return;
+        var params = new URLSearchParams({ q: input.value.trim() });
+        if (input.dataset.gender) params.set('gender', input.dataset.gender);
+        if (input.dataset.groupId) params.set('group_id', input.dataset.groupId);
+        fetch('/members/search.json?' + params.toString(), { credentials: 'same-origin' })
+            .then(function (res) { return res.json(); })
+            .then(function (data) {
+                var current = select.value;
+                var currentOption = current ? select.options[select.selectedIndex] : null;
+                var placeholder = select.querySelector("option[value='']");
+                select.innerHTML = '';
+                if (placeholder) select.appendChild(placeholder);
+                // The chosen member stays selectable even when the search no longer matches
+                // them, so a form without a placeholder never silently switches member
+                var matched = data.members.some(function (member) { return String(member.id) === current; });
+                if (currentOption && !matched) select.appendChild(currentOption);
+                data.members.forEach(function (member) {
+                    var opt = document.createElement('option');
+                    opt.value = member.id;
+                    opt.textContent = optionLabel(input, member);
+                    opt.setAttribute('data-gender', member.gender || '');
+                    select.appendChild(opt);
+                });
+                select.value = current;
+                input.dataset.loaded = '1';
+            })
+            .catch(function () { /* ignore */ });
+    }
+
+    window.refreshMemberPicker = function (input) {
+        input.dataset.loaded = '';
+        loadMatches(input);
+    };
+
+    document.addEventListener('input', function (e) {
+        var input = e.target;
+        if (!input.classList || !input.classList.contains('member-search')) return;
+        clearTimeout(timers.get(input));
+        timers.set(input, setTimeout(function () { loadMatches(input); }, 150));
+    });
+
+    // First matches load when a picker is first used
+    document.addEventListener('focusin', function (e) {
+        var el = e.target;
+        var input = el.classList && el.classList.contains('member-search') ? el : null;
+        if (!input && el.name === 'member_id' && el.form) input = el.form.querySelector('input.member-search');
+        if (input && !input.dataset.loaded) loadMatches(input);
+    });
+
+    // Enter in a search box must not submit the form it sits in
+    document.addEventListener('keydown', function (e) {
+        if (e.key === 'Enter' && e.target.classList && e.target.classList.contains('member-search')) e.preventDefault();
+    });
+})();
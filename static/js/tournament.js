@@ -0,0 +1,457 @@
+// Tournament page: gender tabs, leaderboard tabs, honors, prizes and seamless score entry.
+// The page passes its tournament and group filter on the script tag.
+var TOURNAMENT_ID = document.currentScript.dataset.tournamentId;
+var GROUP_ID = document.currentScript.dataset.groupId || '';
+
+function copyToClipboard(text) {
+    if (!navigator.clipboard) {
+        var textArea = document.createElement('textarea');
+        textArea.value = text; document.body.appendChild(textArea);
+        textArea.select(); document.execCommand('copy');
+        document.body.removeChild(textArea);
+        alert('Link copied to clipboard!');
+        return;
+    }
+    navigator.clipboard.writeText(text).then(function(){
+        alert('Link copied to clipboard!');
+    }).catch(function(){
+        alert('Failed to copy link. Please copy manually.');
+    });
+}
+
+// Maintain separate gender state (page-wide)
+function selectGender(gender) {
+    try { localStorage.setItem('selectedGender', gender); } catch(e) {}
+    // Toggle active state on gender buttons
+    var genderBtns = document.getElementsByClassName('gender-tablink');
+    for (var i = 0; i < genderBtns.length; i++) {
+        genderBtns[i].className = genderBtns[i].className.replace(' active', '');
+        genderBtns[i].setAttribute('aria-pressed', 'false');
+    }
+    // Find the clicked button by text content (simpler than passing event)
+    // Better: set active by checking requested gender
+    for (var i = 0; i < genderBtns.length; i++) {
+        if ((gender === 'Male' && genderBtns[i].textContent.trim() === 'Male') || (gender === 'Female' && genderBtns[i].textContent.trim() === 'Female')) {
+            genderBtns[i].className += ' active';
+            genderBtns[i].setAttribute('aria-pressed', 'true');
+        }
+    }
+
+    // Show/hide leaderboard tab buttons based on gender
+    var allTabLinks = document.getElementsByClassName('tablinks');
+    for (var j = 0; j < allTabLinks.length; j++) {
+        var isMale = allTabLinks[j].className.indexOf('gender-male') !== -1;
+        var isFemale = allTabLinks[j].className.indexOf('gender-female') !== -1;
+        if ((gender === 'Male' && isMale) || (gender === 'Female' && isFemale)) {
+            allTabLinks[j].style.display = 'inline-block';
+        } else {
+            allTabLinks[j].style.display = 'none';
+            // Also remove active class if previously active
+            allTabLinks[j].className = allTabLinks[j].className.replace(' active', '');
+        }
+    }
+
+    // Hide all tab contents, then open default for this gender
+    var allContents = document.getElementsByClassName('tabcontent');
+    for (var k = 0; k < allContents.length; k++) {
+        allContents[k].style.display = 'none';
+    }
+
+    // Show/hide any gender-flagged sections across the page (e.g., honors rows, awards cards)
+    showGenderSections(document, gender);
+
+    // Filter member dropdown by gender for Add Score form
+    filterMemberDropdownByGender(gender);
+
+    // Click default tab for selected gender
+    if (gender === 'Male') {
+        var btn = document.getElementById('defaultOpenMale');
+        if (btn) btn.click();
+    } else {
+        var btnF = document.getElementById('defaultOpenFemale');
+        if (btnF) btnF.click();
+    }
+}
+
+function showGenderSections(root, gender) {
+    var genderElems = root.querySelectorAll('.gender-male, .gender-female');
+    for (var z = 0; z < genderElems.length; z++) {
+        var el = genderElems[z];
+        // Skip tabcontent here; selectGender opens the default tab
+        if (el.classList.contains('tabcontent')) continue;
+        var show = (gender === 'Male' && el.classList.contains('gender-male')) || (gender === 'Female' && el.classList.contains('gender-female'));
+        el.style.display = show ? '' : 'none';
+    }
+}
+
+function savedGender() {
+    var saved = 'Male';
+    try { var v = localStorage.getItem('selectedGender'); if (v === 'Male' || v === 'Female') saved = v; } catch(e) {}
+    return saved;
+}
+
+function filterMemberDropdownByGender(gender) {
+    // The Add Score picker searches only the selected gender
+    var input = document.querySelector("#add-score-form input.member-search");
+    if (!input || input.dataset.gender === gender) return;
+    input.dataset.gender = gender;
+    if (input.dataset.loaded) refreshMemberPicker(input);
+}
+
+function calculateTotals() {
+    var front9Total = 0;
+    var back9Total = 0;
+
+    // Calculate front 9 total
+    for (var i = 1; i <= 9; i++) {
+        var holeInput = parseInt(document.querySelector(`input[name='hole${i}']`).value) || 0;
+        front9Total += holeInput;
+    }
+    document.getElementById('front9-total').innerText = front9Total;
+
+    // Calculate back 9 total
+    for (var i = 10; i <= 18; i++) {
+        var holeInput = parseInt(document.querySelector(`input[name='hole${i}']`).value) || 0;
+        back9Total += holeInput;
+    }
+    document.getElementById('back9-total').innerText = back9Total;
+
+    // Calculate and display total score
+    var totalScore = front9Total + back9Total;
+    document.getElementById('total-score').innerText = totalScore;
+}
+
+function showLeaderboard(evt, leaderboardName) {
+    var i, tabcontent, tablinks;
+    tabcontent = document.getElementsByClassName("tabcontent");
+    for (i = 0; i < tabcontent.length; i++) {
+        tabcontent[i].style.display = "none";
+    }
+    tablinks = document.getElementsByClassName("tablinks");
+    for (i = 0; i < tablinks.length; i++) {
+        tablinks[i].className = tablinks[i].className.replace(" active", "");
+    }
+    document.getElementById(leaderboardName).style.display = "block";
+    evt.currentTarget.className += " active";
+}
+
+// Initialize default view: restore saved gender or default to Male
+(function(){
+    var saved = 'Male';
+    try {
+        var val = localStorage.getItem('selectedGender');
+        if (val === 'Male' || val === 'Female') saved = val;
+    } catch(e) {}
+    selectGender(saved);
+})();
+
+function toggleHonorEdit(honorTypeId) {
+    const viewDiv = document.getElementById('honor-view-' + honorTypeId);
+    const editForm = document.getElementById('honor-edit-' + honorTypeId);
+
+    if (viewDiv.style.display === 'none') {
+        viewDiv.style.display = 'flex';
+        editForm.style.display = 'none';
+    } else {
+        viewDiv.style.display = 'none';
+        editForm.style.display = 'flex';
+    }
+}
+
+// toggleHonorChange no longer used
+
+function filterHonorMemberOptions(honorTypeId, query) {
+    var select = document.querySelector("select[data-honor-id='" + honorTypeId + "']");
+    if (!select) return;
+    var q = (query || '').toLowerCase();
+    for (var i = 0; i < select.options.length; i++) {
+        var opt = select.options[i];
+        if (!opt.value) { // placeholder
+            opt.hidden = false;
+            opt.disabled = false;
+            continue;
+        }
+        var text = opt.text.toLowerCase();
+        var match = text.indexOf(q) !== -1;
+        opt.hidden = !match;
+        opt.disabled = !match;
+    }
+    // If current selection is filtered out, reset to placeholder
+    if (select.selectedIndex >= 0 && (select.options[select.selectedIndex].disabled || select.options[select.selectedIndex].hidden)) {
+        select.selectedIndex = 0;
+    }
+}
+
+// Prevent page jump on honor rename: save via fetch and swap in the re-rendered honors table
+function attachHonorEditHandlers(root) {
+    var forms = (root || document).querySelectorAll("form[id^='honor-edit-']");
+    forms.forEach(function(form) {
+        var input = form.querySelector("input[name='custom_name']");
+        if (input) {
+            // Remove any inline onblur and handle ourselves
+            input.removeAttribute('onblur');
+            input.addEventListener('keydown', function(e){
+                if (e.key === 'Enter') {
+                    e.preventDefault();
+                    input.blur();
+                }
+            });
+            input.addEventListener('blur', function(){
+                saveHonorTitle(form);
+            });
+        }
+        // Fallback: if form is submitted by other means, intercept
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+            saveHonorTitle(form);
+        });
+    });
+}
+
+function saveHonorTitle(form) {
+    submitForRegion(form.action, new FormData(form), 'honors')
+        .catch(function(){ /* ignore errors for now */ });
+}
+
+// Attach handlers after DOM is ready
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function(){ attachHonorEditHandlers(); });
+} else {
+    attachHonorEditHandlers();
+}
+
+// Inline save for balls input
+function attachHonorBallsHandlers(root) {
+    var inputs = (root || document).querySelectorAll('input.honor-balls-input');
+    inputs.forEach(function(input){
+        var handler = function(){
+            var y = window.scrollY;
+            var honorType = input.getAttribute('data-honor-type');
+            var balls = parseInt(input.value || '0', 10);
+            if (isNaN(balls) || balls < 0) balls = 0;
+            var fd = new FormData();
+            fd.append('honor_type', honorType);
+            fd.append('balls', String(balls));
+            fetch('/tournament/' + TOURNAMENT_ID + '/set_honor_balls', { method: 'POST', body: fd, credentials: 'same-origin' })
+                .then(function(){ updateBallsCounters(); window.scrollTo(0, y); })
+                .catch(function(){});
+        };
+        input.addEventListener('change', handler);
+        input.addEventListener('blur', handler);
+    });
+}
+
+function updateBallsCounters() {
+    var inputs = document.querySelectorAll('input.honor-balls-input');
+    var total = 0, male = 0, female = 0;
+    inputs.forEach(function(inp){
+        var v = parseInt(inp.value || '0', 10);
+        if (isNaN(v) || v < 0) v = 0;
+        total += v;
+        var ht = inp.getAttribute('data-honor-type') || '';
+        if (ht.endsWith(' Male')) male += v;
+        else if (ht.endsWith(' Female')) female += v;
+    });
+    var t = document.getElementById('total-balls-count'); if (t) t.textContent = total;
+    var m = document.getElementById('male-balls-count'); if (m) m.textContent = male;
+    var f = document.getElementById('female-balls-count'); if (f) f.textContent = female;
+}
+
+// Handle honorable mention assignment/remove without page jump: the write's response is
+// the re-rendered honors table, which replaces the current one
+function attachHonorAssignHandlers(root) {
+    var assignForms = (root || document).querySelectorAll("form[id^='honor-assign-']");
+    assignForms.forEach(function(form){
+        var select = form.querySelector("select[name='member_id']");
+        if (!select) return;
+        select.addEventListener('change', function(){
+            if (!select.value) return;
+            submitForRegion(form.action, new FormData(form), 'honors')
+                .catch(function(){ /* ignore */ });
+        });
+    });
+}
+
+function attachHonorRemoveHandlers(root) {
+    var removeForms = (root || document).querySelectorAll("form[id^='honor-remove-']");
+    removeForms.forEach(function(form){
+        form.addEventListener('submit', function(e){
+            e.preventDefault();
+            submitForRegion(form.action, new FormData(form), 'honors')
+                .catch(function(){ /* ignore */ });
+        });
+    });
+}
+
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function(){ attachHonorAssignHandlers(); attachHonorRemoveHandlers(); });
+} else {
+    attachHonorAssignHandlers();
+    attachHonorRemoveHandlers();
+}
+
+// Attach balls handlers on load
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function(){ attachHonorBallsHandlers(); });
+} else {
+    attachHonorBallsHandlers();
+}
+
+// Seamless Add Score via fetch (avoid full-page reload)
+function attachAddScoreAjax() {
+    var form = document.getElementById('add-score-form');
+    if (!form) return;
+    form.addEventListener('submit', function(e){
+        e.preventDefault();
+        var y = window.scrollY;
+        var submitBtn = form.querySelector('button[type="submit"]');
+        var oldText = submitBtn ? submitBtn.textContent : '';
+        if (submitBtn) { submitBtn.disabled = true; submitBtn.textContent = 'Saving...'; }
+        var fd = new FormData(form);
+        submitForRegion(form.action, fd, 'leaderboards')
+            .then(function(){
+                // Reset form inputs and totals
+                try { form.reset(); } catch(e) {}
+                var f9 = document.getElementById('front9-total'); if (f9) f9.textContent = '0';
+                var b9 = document.getElementById('back9-total'); if (b9) b9.textContent = '0';
+                var tt = document.getElementById('total-score'); if (tt) tt.textContent = '0';
+
+                // Preserve scroll position
+                window.scrollTo(0, y);
+            })
+            .catch(function(err){
+                console.error('Add score failed', err);
+            })
+            .finally(function(){
+                if (submitBtn) { submitBtn.disabled = false; submitBtn.textContent = oldText; }
+            });
+    });
+}
+
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', attachAddScoreAjax);
+} else {
+    attachAddScoreAjax();
+}
+
+// Regions of the page the server renders on their own (/tournament/<id>/fragments/<region>),
+// each with the element its fragment replaces
+var PAGE_REGIONS = { leaderboards: '.printable-area', honors: '#honors-table' };
+
+function withGroup(url) {
+    if (!GROUP_ID) return url;
+    return url + (url.indexOf('?') === -1 ? '?' : '&') + 'group_id=' + encodeURIComponent(GROUP_ID);
+}
+
+// Swap a fragment response (flash messages plus one region) into the page
+function applyFragment(region, html) {
+    var tpl = document.createElement('template');
+    tpl.innerHTML = html;
+    var newFlash = tpl.content.querySelector('.flash-container');
+    var curFlash = document.querySelector('.flash-container');
+    if (newFlash && curFlash) curFlash.innerHTML = newFlash.innerHTML;
+    var newArea = tpl.content.querySelector(PAGE_REGIONS[region]);
+    var curArea = document.querySelector(PAGE_REGIONS[region]);
+    if (!newArea || !curArea) return;
+    curArea.innerHTML = newArea.innerHTML;
+    if (region === 'honors') {
+        // Reattach the honors handlers on the new table and keep the gender filter
+        attachHonorEditHandlers(curArea);
+        attachHonorAssignHandlers(curArea);
+        attachHonorRemoveHandlers(curArea);
+        attachHonorBallsHandlers(curArea);
+        showGenderSections(curArea, savedGender());
+        updateBallsCounters();
+    } else {
+        // Re-apply saved gender selection so the same boards stay visible
+        selectGender(savedGender());
+    }
+}
+
+// Send a write and swap in the region it changes. The X-Fragment header makes the server
+// redirect to that region's fragment rather than the whole page.
+function submitForRegion(url, body, region) {
+    var y = window.scrollY;
+    var options = { method: body ? 'POST' : 'GET', body: body, credentials: 'same-origin', headers: { 'X-Fragment': region } };
+    return fetch(withGroup(url), options)
+        .then(function(res){ return res.text(); })
+        .then(function(html){ applyFragment(region, html); window.scrollTo(0, y); });
+}
+
+// Utility: refresh one region (the leaderboards by default) of the current filtered page
+function refreshPageSections(preserveScrollY, region) {
+    var y = preserveScrollY != null ? preserveScrollY : window.scrollY;
+    region = region || 'leaderboards';
+    return fetch(withGroup('/tournament/' + TOURNAMENT_ID + '/fragments/' + region), { credentials: 'same-origin' })
+        .then(function(res){ return res.text(); })
+        .then(function(html){
+            applyFragment(region, html);
+            window.scrollTo(0, y);
+        });
+}
+
+// Seamless Delete Score via fetch (event delegation)
+document.addEventListener('click', function(e){
+    var a = e.target.closest('a');
+    if (!a) return;
+    var href = a.getAttribute('href') || '';
+    if (!href.startsWith('/delete_score/')) return;
+    e.preventDefault();
+    var ok = confirm('Are you sure you want to delete this score?');
+    if (!ok) return;
+    var y = window.scrollY;
+    submitForRegion(href, null, 'leaderboards')
+        .then(function(){ window.scrollTo(0, y); })
+        .catch(function(err){ console.error('Delete failed', err); });
+}, true);
+
+// Modal utilities
+function openModalWithNode(node) {
+    var overlay = document.getElementById('modal-overlay');
+    var body = document.getElementById('modal-body');
+    body.innerHTML = '';
+    body.appendChild(node);
+    overlay.style.display = 'flex';
+}
+function closeModal() {
+    var overlay = document.getElementById('modal-overlay');
+    overlay.style.display = 'none';
+    document.getElementById('modal-body').innerHTML = '';
+}
+document.getElementById('modal-close').addEventListener('click', function(){ closeModal(); });
+document.getElementById('modal-overlay').addEventListener('click', function(e){
+    if (e.target.id === 'modal-overlay' || e.target.id === 'modal-click-capture') closeModal();
+});
+
+// Seamless Edit Score via modal + fetch (event delegation)
+document.addEventListener('click', function(e){
+    var a = e.target.closest('a');
+    if (!a) return;
+    var href = a.getAttribute('href') || '';
+    if (!href.startsWith('/edit_score/')) return;
+    e.preventDefault();
+    var y = window.scrollY;
+    fetch(href, { method: 'GET', credentials: 'same-origin' })
+        .then(function(res){ return res.text(); })
+        .then(function(html){
+            var doc = new DOMParser().parseFromString(html, 'text/html');
+            // Grab the edit form from the returned page
+            var form = doc.querySelector('form');
+            if (!form) return;
+            // Ensure form posts via fetch and preserves current group view
+            var node = document.importNode(form, true);
+            // Attach submit handler on the imported form
+            node.addEventListener('submit', function(ev){
+                ev.preventDefault();
+                var fd = new FormData(node);
+                // Submit edit
+                submitForRegion(node.action, fd, 'leaderboards')
+                    .then(function(){ closeModal(); window.scrollTo(0, y); })
+                    .catch(function(err){ console.error('Edit failed', err); });
+            });
+            openModalWithNode(node);
+            // Keep scroll position
+            window.scrollTo(0, y);
+        })
+        .catch(function(err){ console.error('Load edit form failed', err); });
+}, true);
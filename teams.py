@@ -0,0 +1,121 @@
+"""Team leaderboards for groups played as teams (best ball, aggregate, Stableford).
+
+The whole computation runs inside SQLite: a CTE unpivots the hole columns into
+one row per player-hole, window functions rank players within each team and
+hole, and a single GROUP BY produces every team format. Python only receives one
+row per team.
+"""
+from scoring import HOLE_COLUMNS
+
+DEFAULT_BEST_N = 2
+MAX_BEST_N = 4
+
+FORMATS = ('best_ball', 'aggregate', 'stableford')
+
+_GROSS_BY_HOLE = 'CASE l.hole_number ' + ' '.join(
+    f'WHEN {i} THEN c.{column}' for i, column in enumerate(HOLE_COLUMNS, start=1)
+) + ' END'
+
+TEAM_LEADERBOARD_SQL = f'''
+    WITH RECURSIVE hole_numbers(hole_number) AS (
+        SELECT 1 UNION ALL SELECT hole_number + 1 FROM hole_numbers WHERE hole_number < 18
+    ),
+    -- Course pars and stroke indexes when the tournament has a complete course,
+    -- otherwise par 4 with strokes given in hole order
+    layout AS (
+        SELECT h.hole_number, COALESCE(ch.par, 4) AS par, COALESCE(ch.stroke_index, h.hole_number) AS stroke_index
+        FROM hole_numbers h
+        LEFT JOIN course_holes ch ON ch.hole_number = h.hole_number AND ch.course_id = (
+            SELECT t.course_id FROM tournaments t
+            WHERE t.id = :tournament_id
+              AND (SELECT COUNT(*) FROM course_holes WHERE course_id = t.course_id) = 18
+        )
+    ),
+    team_cards AS (
+        SELECT gm.group_id, ts.member_id,
+               {', '.join(f'ts.{column}' for column in HOLE_COLUMNS)},
+               CAST(MAX(COALESCE(ts.net_handicap, 0), 0) + 0.5 AS INTEGER) AS playing_handicap,
+               (SELECT COUNT(*) FROM group_members WHERE group_id = g.id) AS team_size
+        FROM groups g
+        JOIN group_members gm ON gm.group_id = g.id
+        JOIN tournament_scores ts ON ts.tournament_id = g.tournament_id AND ts.member_id = gm.member_id
+        WHERE g.tournament_id = :tournament_id
+    ),
+    -- One row per player and hole played
+    hole_scores AS (
+        SELECT c.group_id, c.member_id, c.team_size, l.hole_number, l.par,
+               {_GROSS_BY_HOLE} AS gross,
+               c.playing_handicap / 18 + (l.stroke_index <= c.playing_handicap % 18) AS strokes
+        FROM team_cards c
+        CROSS JOIN layout l
+    ),
+    scored AS (
+        SELECT group_id, member_id, team_size, hole_number, par, gross,
+               gross - strokes AS net,
+               MAX(0, 2 + par - (gross - strokes)) AS points,
+               ROW_NUMBER() OVER (PARTITION BY group_id, hole_number ORDER BY gross - strokes, member_id) AS net_rank,
+               COUNT(*) OVER (PARTITION BY group_id, hole_number) AS hole_players
+        FROM hole_scores
+        WHERE gross IS NOT NULL
+    ),
+    team_totals AS (
+        SELECT group_id,
+               COUNT(DISTINCT member_id) AS players_started,
+               COUNT(DISTINCT CASE WHEN hole_players >= team_size THEN hole_number END) AS holes_completed,
+               SUM(CASE WHEN net_rank <= :best_n THEN net END) AS best_ball_net,
+               SUM(CASE WHEN net_rank <= :best_n THEN net - par END) AS best_ball_to_par,
+               SUM(gross) AS aggregate_gross,
+               SUM(net) AS aggregate_net,
+               SUM(net - par) AS aggregate_to_par,
+               SUM(points) AS stableford_points
+        FROM scored
+        GROUP BY group_id
+    )
+    SELECT g.id AS group_id, g.name,
+           (SELECT COUNT(*) FROM group_members WHERE group_id = g.id) AS team_size,
+           COALESCE(tt.players_started, 0) AS players_started,
+           COALESCE(tt.holes_completed, 0) AS holes_completed,
+           tt.best_ball_net, tt.best_ball_to_par,
+           tt.aggregate_gross, tt.aggregate_net, tt.aggregate_to_par,
+           tt.stableford_points,
+           RANK() OVER (ORDER BY tt.best_ball_to_par IS NULL, tt.best_ball_to_par) AS best_ball_position,
+           RANK() OVER (ORDER BY tt.aggregate_to_par IS NULL, tt.aggregate_to_par) AS aggregate_position,
+           RANK() OVER (ORDER BY tt.stableford_points IS NULL, tt.stableford_points DESC) AS stableford_position
+    FROM groups g
+    LEFT JOIN team_totals tt ON tt.group_id = g.id
+    WHERE g.tournament_id = :tournament_id
+'''
+
+MEMBERSHIP_SQL = '''
+    SELECT group_concat(pair, ',') FROM (
+        SELECT gm.group_id || ':' || gm.member_id AS pair
+        FROM group_members gm
+        JOIN groups g ON g.id = gm.group_id
+        WHERE g.tournament_id = ?
+        ORDER BY gm.group_id, gm.member_id
+    )
+'''
+
+
+def team_membership(conn, tournament_id):
+    """Fingerprint of the tournament's team rosters, for cache keys."""
+    return conn.execute(MEMBERSHIP_SQL, (tournament_id,)).fetchone()[0] or ''
+
+
+def team_leaderboards(conn, tournament_id, best_n=DEFAULT_BEST_N):
+    """Every team format for a tournament, one dict per team.
+
+    Best ball counts the best best_n net scores on each hole. Best ball and
+    aggregate are compared to par so teams part way round can be ranked together;
+    Stableford ranks on total points (higher is better).
+    """
+    rows = conn.execute(TEAM_LEADERBOARD_SQL, {'tournament_id': tournament_id, 'best_n': best_n}).fetchall()
+    teams = [dict(row) for row in rows]
+    return {
+        'best_n': best_n,
+        'teams': teams,
+        'leaderboards': {
+            board: [team['group_id'] for team in sorted(teams, key=lambda t: (t[f'{board}_position'], t['name']))]
+            for board in FORMATS
+        },
+    }
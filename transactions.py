@@ -0,0 +1,134 @@
+"""Write transactions that queue under contention instead of failing.
+
+SQLite lets one connection write at a time. Python's sqlite3 opens a deferred
+transaction at the first INSERT/UPDATE/DELETE, so under a burst of score
+submissions a route could fail with "database is locked" partway through,
+after some of its reads and checks had already run.
+
+write_transaction() takes the write lock up front with BEGIN IMMEDIATE. When
+another connection holds it, SQLite waits BUSY_TIMEOUT_MS and then this module
+backs off with jitter and tries again, so concurrent writers queue until
+MAX_WAIT seconds have passed. After that it raises WriteBusyError, which the
+app answers with 503 and Retry-After.
+
+    with write_transaction(conn):
+        conn.execute('UPDATE ...')
+        conn.execute('INSERT ...')
+    # committed here; rolled back if the block raised
+
+Each transaction's wait is recorded per route (the Flask endpoint unless a
+name is given) in `metrics`.
+"""
+import contextlib
+import random
+import sqlite3
+import threading
+import time
+
+from flask import has_request_context, request
+
+BUSY_TIMEOUT_MS = 250
+MAX_WAIT = 15.0
+BACKOFF_BASE = 0.01
+BACKOFF_CAP = 0.5
+
+
+class WriteBusyError(Exception):
+    """The write lock could not be taken within MAX_WAIT seconds."""
+
+
+class WriteMetrics:
+    """Per-route write transaction counts and time spent waiting for the lock."""
+    FIELDS = ('transactions', 'contended', 'retries', 'failures', 'wait_seconds', 'max_wait_seconds')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, name, retries, wait, failed=False):
+        with self._lock:
+            route = self._routes.setdefault(name, dict.fromkeys(self.FIELDS, 0))
+            route['transactions'] += 1
+            route['contended'] += 1 if retries else 0
+            route['retries'] += retries
+            route['failures'] += 1 if failed else 0
+            route['wait_seconds'] += wait
+            route['max_wait_seconds'] = max(route['max_wait_seconds'], wait)
+
+    def snapshot(self):
+        """{route: counters} copied under the lock."""
+        with self._lock:
+            return {name: dict(route) for name, route in self._routes.items()}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+metrics = WriteMetrics()
+
+
+def is_busy(error):
+    """Whether an sqlite3 error means another connection holds the lock."""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+
+def backoff(attempt):
+    """Seconds to sleep before retry `attempt`: exponential, capped, with full jitter."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def retry_busy(statement, started):
+    """Run statement() until it stops failing with busy or MAX_WAIT passes; returns the retry count."""
+    retries = 0
+    while True:
+        try:
+            statement()
+            return retries
+        except sqlite3.OperationalError as e:
+            if not is_busy(e) or time.monotonic() - started >= MAX_WAIT:
+                raise
+        time.sleep(backoff(retries))
+        retries += 1
+
+
+@contextlib.contextmanager
+def write_transaction(conn, name=None):
+    """BEGIN IMMEDIATE on conn, yield it, then COMMIT (or ROLLBACK if the block raised).
+
+    Inside a transaction that is already open the block simply joins it, so
+    helpers can use write_transaction whether or not their caller did.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+    if name is None:
+        name = request.endpoint if has_request_context() else 'unknown'
+    previous_isolation = conn.isolation_level
+    # Autocommit mode: this function issues BEGIN and COMMIT itself
+    conn.isolation_level = None
+    conn.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+    started = time.monotonic()
+    try:
+        try:
+            retries = retry_busy(lambda: conn.execute('BEGIN IMMEDIATE'), started)
+        except sqlite3.OperationalError as e:
+            if not is_busy(e):
+                raise
+            metrics.record(name, 0, time.monotonic() - started, failed=True)
+            raise WriteBusyError(f'{name}: database busy for {MAX_WAIT:g}s') from e
+        waited = time.monotonic() - started
+        try:
+            yield conn
+            if conn.in_transaction:
+                # Only waits in rollback-journal mode, for readers to finish
+                retries += retry_busy(lambda: conn.execute('COMMIT'), time.monotonic())
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            metrics.record(name, retries, waited)
+    finally:
+        conn.isolation_level = previous_isolation
@@ -0,0 +1,49 @@
+"""Per-tournament in-memory state tagged with the scores_version it was built from.
+
+Workers share nothing but the database, and every score write bumps the
+tournament's scores_version. A worker compares that version with the one its
+cached entry was built from: an entry that is behind is rebuilt on the next
+read, and a worker's own write is applied in place when the entry is exactly one
+version behind it.
+
+Entries are only changed or read under the cache's lock, so a reader never sees
+an update half applied:
+
+    cache.read(tournament_id, version, load, lambda value: value.ordered())
+    cache.apply(tournament_id, new_version, lambda value: value.update(...))
+"""
+import threading
+
+
+class VersionedCache:
+    """Values keyed by tournament id, each with the version it is current for."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._versions = {}
+
+    def store(self, key, version, value):
+        with self._lock:
+            self._values[key] = value
+            self._versions[key] = version
+
+    def read(self, key, version, load, reader):
+        """reader(value) under the lock, storing load() first if the entry is missing or
+        not at `version`. load runs outside the lock."""
+        if self._versions.get(key) != version:
+            self.store(key, version, load())
+        with self._lock:
+            return reader(self._values[key])
+
+    def apply(self, key, version, change):
+        """After a write that moved `key` to `version`, run change(value) under the lock
+        if the entry was one version behind; otherwise drop it so the next read rebuilds.
+        Returns whether the change was applied."""
+        with self._lock:
+            if key not in self._values or self._versions.get(key) != version - 1:
+                self._versions.pop(key, None)
+                return False
+            change(self._values[key])
+            self._versions[key] = version
+            return True
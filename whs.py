@@ -0,0 +1,82 @@
+"""World Handicap System style handicap engine.
+
+Each posted round becomes a score differential against the course rating and
+slope. A member's Handicap Index is the average of the best differentials among
+their most recent 20 (best 8 of 20 once 20 rounds are on record). HandicapRecord
+keeps only those 20 differentials, so posting a round never re-reads a member's
+history.
+"""
+import json
+from collections import deque
+
+import numpy as np
+
+from scoring import strokes_received
+
+RECORD_SIZE = 20
+
+# Without course ratings a course plays to its par with the neutral slope
+STANDARD_SLOPE = 113
+DEFAULT_COURSE_RATING = 72.0
+
+MAX_HANDICAP_INDEX = 54.0
+
+ENGINES = ('club', 'whs')
+DEFAULT_ENGINE = 'club'
+
+# Number of differentials on record -> (how many of the lowest are averaged, adjustment)
+DIFFERENTIALS_USED = {
+    3: (1, -2.0), 4: (1, -1.0), 5: (1, 0.0), 6: (2, -1.0), 7: (2, 0.0), 8: (2, 0.0),
+    9: (3, 0.0), 10: (3, 0.0), 11: (3, 0.0), 12: (4, 0.0), 13: (4, 0.0), 14: (4, 0.0),
+    15: (5, 0.0), 16: (5, 0.0), 17: (6, 0.0), 18: (6, 0.0), 19: (7, 0.0), 20: (8, 0.0),
+}
+
+
+def score_differential(adjusted_gross, course_rating=None, slope_rating=None):
+    """(113 / slope) x (adjusted gross score - course rating), to one decimal."""
+    course_rating = DEFAULT_COURSE_RATING if course_rating is None else course_rating
+    slope_rating = slope_rating or STANDARD_SLOPE
+    return round(STANDARD_SLOPE / slope_rating * (adjusted_gross - course_rating), 1)
+
+
+def course_handicap(handicap_index, course_rating=None, slope_rating=None, par=72):
+    """Strokes a Handicap Index receives on a course, rounded to a whole number."""
+    course_rating = DEFAULT_COURSE_RATING if course_rating is None else course_rating
+    slope_rating = slope_rating or STANDARD_SLOPE
+    return int(np.floor(handicap_index * slope_rating / STANDARD_SLOPE + (course_rating - par) + 0.5))
+
+
+def adjusted_gross_scores(holes, handicaps, pars, stroke_index):
+    """Gross totals with every hole capped at net double bogey (par + 2 + strokes received)."""
+    caps = pars + 2 + strokes_received(handicaps, stroke_index)
+    return np.minimum(holes, caps).sum(axis=1)
+
+
+class HandicapRecord:
+    """A member's most recent differentials and the index they produce."""
+
+    def __init__(self, differentials=()):
+        self.differentials = deque(differentials, maxlen=RECORD_SIZE)
+
+    def __len__(self):
+        return len(self.differentials)
+
+    def post(self, differential):
+        """Add a round; the oldest differential drops off once 20 are on record."""
+        self.differentials.append(float(differential))
+
+    def handicap_index(self):
+        """Current Handicap Index, or None with fewer than three rounds on record."""
+        used = DIFFERENTIALS_USED.get(len(self.differentials))
+        if used is None:
+            return None
+        count, adjustment = used
+        best = sorted(self.differentials)[:count]
+        return min(round(sum(best) / count + adjustment, 1), MAX_HANDICAP_INDEX)
+
+    def to_json(self):
+        return json.dumps(list(self.differentials))
+
+    @classmethod
+    def from_json(cls, payload):
+        return cls(json.loads(payload) if payload else ())
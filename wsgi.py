@@ -0,0 +1,18 @@
+"""Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+    waitress-serve --listen=0.0.0.0:5004 --threads=8 wsgi:app
+
+Each worker process imports this module, so each one migrates the database
+(only the first actually does the work, under a file lock) and loads its own
+live rankings. TOURNAMENT_DATABASE overrides the database path.
+"""
+import os
+import sys
+
+# Add the current directory to Python path to import app.py
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+
+app = create_app(os.environ.get('TOURNAMENT_DATABASE'))